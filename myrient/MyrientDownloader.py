@@ -0,0 +1,502 @@
+import errno
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from MyrientSettings import Settings
+
+
+PART_SUFFIX = '.part'
+SEGMENTS_SUFFIX = '.segments'  # progress of a segmented .part file, for resuming
+CHUNK_SIZE = 256 * 1024  # bytes per read; at most this much is lost when a connection drops
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+STATE_SAVE_BYTES = 8 * 1024 * 1024  # per segment, between writes of the .segments file
+
+
+class DownloadError(Exception):
+    """A download failed in a way retrying won't fix (e.g. 404)."""
+
+
+class SourceChanged(requests.RequestException):
+    """The file on the server changed while its segments were being fetched."""
+
+
+class DownloadProgress:
+    """
+    Aggregate progress of all downloads in flight, shown as a single status line.
+    """
+
+    def __init__(self, total_files: int, enabled: bool = True, interval: float = 0.5):
+        """
+        Initialize the progress display.
+
+        Args:
+            total_files (int): Number of files queued
+            enabled (bool): Whether to draw the status line at all
+            interval (float): Minimum seconds between redraws
+        """
+        self.total_files = total_files
+        self.enabled = enabled
+        self.interval = interval
+        self.files_done = 0
+        self.files_failed = 0
+        self.bytes_total = 0  # sum of the sizes learned so far
+        self.bytes_done = 0
+        self.bytes_session = 0  # bytes received by this run (not resumed from disk)
+        self.started = time.monotonic()
+        self._last_draw = 0.0
+        self._lock = threading.Lock()
+
+    def add_size(self, total: int, already: int = 0) -> None:
+        """Register a file's size and the bytes already on disk for it."""
+        with self._lock:
+            self.bytes_total += total
+            self.bytes_done += already
+
+    def advance(self, nbytes: int) -> None:
+        with self._lock:
+            self.bytes_done += nbytes
+            self.bytes_session += nbytes
+        self.draw()
+
+    def file_finished(self, success: bool) -> None:
+        with self._lock:
+            if success:
+                self.files_done += 1
+            else:
+                self.files_failed += 1
+        self.draw(force=True)
+
+    def message(self, text: str) -> None:
+        """Print a line without tearing the status line."""
+        with self._lock:
+            if self.enabled:
+                sys.stdout.write('\r\033[K')
+            print(text, flush=True)
+        self.draw(force=True)
+
+    def draw(self, force: bool = False) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_draw < self.interval:
+                return
+            self._last_draw = now
+            elapsed = max(now - self.started, 1e-6)
+            rate = self.bytes_session / elapsed
+            line = (f"[{self.files_done + self.files_failed}/{self.total_files} files"
+                    f"{f', {self.files_failed} failed' if self.files_failed else ''}] "
+                    f"{self.bytes_done / 1e6:,.1f}/{self.bytes_total / 1e6:,.1f} MB  "
+                    f"{rate / 1e6:,.2f} MB/s")
+            sys.stdout.write('\r\033[K' + line)
+            sys.stdout.flush()
+
+    def finish(self) -> None:
+        if self.enabled:
+            self.draw(force=True)
+            print(flush=True)
+
+
+class SegmentState:
+    """
+    Byte ranges of a segmented download and how much of each is on disk.
+
+    Saved next to the .part file as '<name>.part.segments' so a later run
+    resumes every segment where it stopped.
+    """
+
+    def __init__(self, path: str, total: int, validator: str, segments: List[List[int]]):
+        """
+        Args:
+            path (str): Where the state is saved
+            total (int): File size in bytes
+            validator (str): ETag or Last-Modified the segments must match ('' if none)
+            segments (List[List[int]]): [start, end (exclusive), bytes done] per segment
+        """
+        self.path = path
+        self.total = total
+        self.validator = validator
+        self.segments = segments
+        self._lock = threading.Lock()
+
+    @classmethod
+    def plan(cls, path: str, total: int, have: int, connections: int, validator: str) -> 'SegmentState':
+        """Split total bytes into `connections` segments; the first `have` bytes are already done."""
+        segments = [[0, have, have]] if have else []
+        remaining = total - have
+        size = -(-remaining // connections)
+        for start in range(have, total, size):
+            segments.append([start, min(start + size, total), 0])
+        return cls(path, total, validator, segments)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['SegmentState']:
+        """The saved state, or None if there is none or it's unreadable."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(path, int(data['total']), data.get('validator', ''), data['segments'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @property
+    def done(self) -> int:
+        return sum(done for _, _, done in self.segments)
+
+    @property
+    def complete(self) -> bool:
+        return all(done == end - start for start, end, done in self.segments)
+
+    def save(self) -> None:
+        with self._lock:
+            data = {'total': self.total, 'validator': self.validator, 'segments': self.segments}
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+    def discard(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class MyrientDownloader:
+    """
+    Downloads files from Myrient several at a time over a shared connection pool.
+
+    Each file is streamed into '<name>.part' next to its destination and renamed
+    once its size checks out, so an interrupted run resumes where it stopped
+    (HTTP Range) instead of starting over.  Transient failures are retried with
+    exponential backoff; everything is driven by the Settings download section.
+
+    Files of at least download.segment_threshold_mb are split into byte-range
+    segments fetched over up to download.max_connections_per_file connections
+    at once, each written at its offset in a preallocated .part file.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the downloader.
+
+        Args:
+            settings (Optional[Settings]): Settings to use; defaults to Settings()
+        """
+        self.settings = settings or Settings()
+        self.workers = max(1, self.settings.download.concurrent_downloads)
+        self.connections_per_file = max(1, self.settings.download.max_connections_per_file)
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = self.settings.user_agent
+        # Enough keep-alive connections for every segment of every worker's file;
+        # Myrient serves everything from one host
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers * self.connections_per_file)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.progress = DownloadProgress(0, enabled=False)
+
+    # -- planning -----------------------------------------------------------
+
+    def select_links(self, base_url: str, hrefs: List[str]) -> List[Tuple[str, str]]:
+        """
+        Pick the links worth downloading from a directory listing.
+
+        Applies the settings filters (which match the URL-encoded href) and
+        skips files already present in the download directory.
+
+        Args:
+            base_url (str): URL of the listing the hrefs came from
+            hrefs (List[str]): Raw href attributes from the listing
+
+        Returns:
+            List[Tuple[str, str]]: (absolute URL, local file path) pairs
+        """
+        selected = []
+        for href in hrefs:
+            if not href or href.endswith('/') or href.startswith(('?', '#')):
+                continue
+            if not self.settings.should_download_file(href):
+                continue
+            filename = urllib.parse.unquote(href.rsplit('/', 1)[-1], encoding='utf-8', errors='replace')
+            filepath = self.settings.get_local_filepath(filename)
+            if os.path.exists(filepath):
+                if self.settings.verbose:
+                    print(f"{filename} Already Downloaded")
+                continue
+            selected.append((urllib.parse.urljoin(base_url, href), filepath))
+        return selected
+
+    # -- running ------------------------------------------------------------
+
+    def download_all(self, items: List[Tuple[str, str]]) -> Dict[str, bool]:
+        """
+        Download (url, filepath) pairs, settings.download.concurrent_downloads at a time.
+
+        Args:
+            items (List[Tuple[str, str]]): What to fetch and where to put it
+
+        Returns:
+            Dict[str, bool]: Success per local file path
+        """
+        os.makedirs(self.settings.effective_download_directory, exist_ok=True)
+        self.progress = DownloadProgress(len(items), enabled=self.settings.download.show_progress)
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(self.download_with_retry, url, path): path for url, path in items}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        finally:
+            self.progress.finish()
+        failed = [path for path, ok in results.items() if not ok]
+        print(f"Downloaded {len(results) - len(failed)} of {len(items)} file(s)"
+              f"{f', {len(failed)} failed' if failed else ''}.")
+        return results
+
+    def download_with_retry(self, url: str, filepath: str) -> bool:
+        """
+        Download one file, resuming its .part file and backing off between attempts.
+
+        Args:
+            url (str): URL to download
+            filepath (str): Final local path
+
+        Returns:
+            bool: True if the file is complete on disk
+        """
+        name = os.path.basename(filepath)
+        attempts = self.settings.download.max_retries + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                self._download(url, filepath)
+                if self.settings.verbose:
+                    self.progress.message(f"Downloaded '{name}'")
+                self.progress.file_finished(True)
+                return True
+            except DownloadError as e:
+                self.progress.message(f"Failed to download '{name}': {e}")
+                break
+            except (requests.RequestException, OSError) as e:
+                if attempt == attempts:
+                    self.progress.message(f"Failed to download '{name}' after {attempts} attempt(s): {e}")
+                    break
+                delay = self._backoff(attempt)
+                self.progress.message(f"Error downloading '{name}' ({e}); retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+        self.progress.file_finished(False)
+        return False
+
+    def _backoff(self, attempt: int) -> float:
+        """retry_delay doubled per attempt, capped at max_retry_delay, with jitter
+        so parallel workers don't retry in lockstep."""
+        base = self.settings.download.retry_delay
+        delay = min(base * 2 ** (attempt - 1), self.settings.download.max_retry_delay)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _download(self, url: str, filepath: str) -> None:
+        part_path = filepath + PART_SUFFIX
+        state = SegmentState.load(part_path + SEGMENTS_SUFFIX)
+        if state is not None and os.path.exists(part_path):
+            self._download_segmented(url, filepath, state)
+            return
+        if state is not None:
+            state.discard()
+        have = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {'Range': f'bytes={have}-'} if have else {}
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.settings.timeout) as response:
+            if response.status_code == 416 and have:
+                # Range starts at or past the end: the .part file may already be whole
+                total = _content_range_total(response.headers.get('Content-Range', ''))
+                if total is not None and have == total:
+                    self.progress.add_size(total, have)
+                    os.replace(part_path, filepath)
+                    return
+                os.remove(part_path)  # bigger than the file, or unknowable: start over
+                raise requests.RequestException("stale partial download discarded (HTTP 416)")
+            if response.status_code in RETRY_STATUS:
+                raise requests.RequestException(f"HTTP {response.status_code}")
+            if response.status_code >= 400:
+                raise DownloadError(f"HTTP {response.status_code}")
+
+            if response.status_code == 206:
+                total = _content_range_total(response.headers.get('Content-Range', ''))
+                mode = 'ab'
+            else:
+                # Server ignored the Range header: whatever is on disk is discarded
+                total = int(response.headers['Content-Length']) if 'Content-Length' in response.headers else None
+                have = 0
+                mode = 'wb'
+
+            if self._should_segment(response, total, have):
+                state = SegmentState.plan(part_path + SEGMENTS_SUFFIX, total, have,
+                                          self.connections_per_file, _validator(response))
+                response.close()
+                self._download_segmented(url, filepath, state)
+                return
+            self.progress.add_size(total or 0, have)
+
+            received = 0
+            try:
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        received += len(chunk)
+                        self.progress.advance(len(chunk))
+            except BaseException:
+                # Keep the bytes on disk for the next attempt, but not in the totals
+                self.progress.add_size(-(total or 0), -(have + received))
+                raise
+
+        size = os.path.getsize(part_path)
+        if total is not None and size != total:
+            self.progress.add_size(-total, -size)
+            raise requests.RequestException(f"incomplete download: {size:,} of {total:,} bytes")
+        os.replace(part_path, filepath)
+
+    # -- segmented downloads ------------------------------------------------
+
+    def _should_segment(self, response: requests.Response, total: Optional[int], have: int) -> bool:
+        """Whether the rest of this file is big enough to fetch over several connections."""
+        if self.connections_per_file < 2 or total is None:
+            return False
+        ranges_ok = response.status_code == 206 or response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        return ranges_ok and total - have >= self.settings.download.segment_threshold_mb * 1024 * 1024
+
+    def _download_segmented(self, url: str, filepath: str, state: SegmentState) -> None:
+        part_path = filepath + PART_SUFFIX
+        try:
+            _preallocate(part_path, state.total)
+            state.save()
+        except OSError:
+            state.discard()
+            raise
+
+        self.progress.add_size(state.total, state.done)
+        stop = threading.Event()
+        pending = [seg for seg in state.segments if seg[2] < seg[1] - seg[0]]
+        errors = []
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+                futures = [pool.submit(self._fetch_segment, url, part_path, state, seg, stop)
+                           for seg in pending]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except BaseException as e:
+                        stop.set()  # the other segments stop and the whole file is retried
+                        errors.append(e)
+        finally:
+            state.save()
+
+        if errors:
+            self.progress.add_size(-state.total, -state.done)
+            if any(isinstance(e, SourceChanged) for e in errors):
+                state.discard()
+                os.remove(part_path)
+            raise errors[0]
+
+        problem = self._verify(part_path, state)
+        if problem:
+            self.progress.add_size(-state.total, -state.total)
+            state.discard()
+            os.remove(part_path)
+            raise requests.RequestException(f"verification failed: {problem}")
+        os.replace(part_path, filepath)
+        state.discard()
+
+    def _fetch_segment(self, url: str, part_path: str, state: SegmentState, seg: List[int],
+                       stop: threading.Event) -> None:
+        start, end, _ = seg
+        headers = {'Range': f'bytes={start + seg[2]}-{end - 1}'}
+        if state.validator:
+            # Server sends the whole (new) file instead of the range if it changed
+            headers['If-Range'] = state.validator
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.settings.timeout) as response:
+            if response.status_code == 200:
+                raise SourceChanged("file changed on the server during a segmented download")
+            if response.status_code in RETRY_STATUS:
+                raise requests.RequestException(f"HTTP {response.status_code}")
+            if response.status_code != 206:
+                raise DownloadError(f"HTTP {response.status_code} for a segment")
+            offset = response.headers.get('Content-Range', '').split(' ', 1)[-1].split('-', 1)[0]
+            if offset != str(start + seg[2]):
+                raise requests.RequestException(f"server returned the wrong range ({response.headers.get('Content-Range')})")
+
+            unsaved = 0
+            with open(part_path, 'r+b') as f:
+                f.seek(start + seg[2])
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if stop.is_set():
+                        return
+                    chunk = chunk[:end - start - seg[2]]
+                    f.write(chunk)
+                    f.flush()  # on disk before the state says so
+                    seg[2] += len(chunk)
+                    self.progress.advance(len(chunk))
+                    unsaved += len(chunk)
+                    if unsaved >= STATE_SAVE_BYTES:
+                        state.save()
+                        unsaved = 0
+                    if seg[2] == end - start:
+                        break
+
+        if seg[2] < end - start:
+            raise requests.RequestException(f"segment at {start:,} ended after {seg[2]:,} of {end - start:,} bytes")
+
+    def _verify(self, part_path: str, state: SegmentState) -> Optional[str]:
+        """What's wrong with a finished segmented file, or None.  Zip archives
+        (most of Myrient) are also checked against their own CRCs, which
+        catches a segment written at the wrong offset."""
+        if not state.complete:
+            return "not every segment finished"
+        size = os.path.getsize(part_path)
+        if size != state.total:
+            return f"{size:,} bytes on disk, expected {state.total:,}"
+        if part_path[:-len(PART_SUFFIX)].lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(part_path) as archive:
+                    bad = archive.testzip()
+            except (zipfile.BadZipFile, OSError) as e:
+                return f"not a valid zip ({e})"
+            if bad is not None:
+                return f"CRC mismatch in '{bad}'"
+        return None
+
+
+def _preallocate(path: str, size: int) -> None:
+    """Make path `size` bytes long, keeping what's already in it, and reserve
+    the disk space up front where the OS supports it."""
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL):  # e.g. ENOSPC
+                    raise
+        if os.path.getsize(path) != size:
+            f.truncate(size)
+
+
+def _validator(response: requests.Response) -> str:
+    """Strong ETag or Last-Modified of a response, for If-Range."""
+    etag = response.headers.get('ETag', '')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified', '')
+
+
+def _content_range_total(value: str) -> Optional[int]:
+    """Total size from a Content-Range header ('bytes 0-99/1234' or 'bytes */1234')."""
+    total = value.rsplit('/', 1)[-1].strip()
+    return int(total) if total.isdigit() else None
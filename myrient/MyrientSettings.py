@@ -18,6 +18,10 @@ class DownloadSettings(BaseModel):
     max_retries: int = Field(default=3, description="Maximum number of download retry attempts")
     retry_delay: int = Field(default=5, description="Delay in seconds between retry attempts")
     show_progress: bool = Field(default=True, description="Whether to show download progress bar")
+    concurrent_downloads: int = Field(default=4, ge=1, description="Number of files downloaded in parallel")
+    max_retry_delay: int = Field(default=60, ge=0, description="Upper bound in seconds for the exponential retry backoff")
+    segment_threshold_mb: int = Field(default=64, ge=1, description="Files at least this many MB are downloaded in segments over several connections")
+    max_connections_per_file: int = Field(default=4, ge=1, description="Maximum connections per segmented file (1 disables segmenting)")
 
 
 class FilterSettings(BaseModel):
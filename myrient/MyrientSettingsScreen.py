@@ -103,6 +103,34 @@ class MyrientSettingsScreen(Widget):
                         id="retry-delay-input"
                     )
                     
+                    yield Label("Max Retry Delay (seconds):")
+                    yield Input(
+                        value=str(self.settings.download.max_retry_delay),
+                        validators=[Number(minimum=0, maximum=3600)],
+                        id="max-retry-delay-input"
+                    )
+                    
+                    yield Label("Concurrent Downloads:")
+                    yield Input(
+                        value=str(self.settings.download.concurrent_downloads),
+                        validators=[Number(minimum=1, maximum=16)],
+                        id="concurrent-downloads-input"
+                    )
+                    
+                    yield Label("Segment Threshold (MB):")
+                    yield Input(
+                        value=str(self.settings.download.segment_threshold_mb),
+                        validators=[Number(minimum=1, maximum=100000)],
+                        id="segment-threshold-input"
+                    )
+                    
+                    yield Label("Max Connections per File:")
+                    yield Input(
+                        value=str(self.settings.download.max_connections_per_file),
+                        validators=[Number(minimum=1, maximum=16)],
+                        id="max-connections-per-file-input"
+                    )
+                    
                     with Horizontal():
                         yield Label("Show Progress Bar:")
                         yield Switch(
@@ -254,6 +282,10 @@ class MyrientSettingsScreen(Widget):
         # Download settings
         max_retries = int(self.query_one("#max-retries-input", Input).value or "3")
         retry_delay = int(self.query_one("#retry-delay-input", Input).value or "5")
+        max_retry_delay = int(self.query_one("#max-retry-delay-input", Input).value or "60")
+        concurrent_downloads = int(self.query_one("#concurrent-downloads-input", Input).value or "4")
+        segment_threshold_mb = int(self.query_one("#segment-threshold-input", Input).value or "64")
+        max_connections_per_file = int(self.query_one("#max-connections-per-file-input", Input).value or "4")
         show_progress = self.query_one("#show-progress-switch", Switch).value
         
         # Filter settings
@@ -278,6 +310,10 @@ class MyrientSettingsScreen(Widget):
             "download": {
                 "max_retries": max_retries,
                 "retry_delay": retry_delay,
+                "max_retry_delay": max_retry_delay,
+                "concurrent_downloads": concurrent_downloads,
+                "segment_threshold_mb": segment_threshold_mb,
+                "max_connections_per_file": max_connections_per_file,
                 "show_progress": show_progress
             },
             "filters": {
@@ -300,6 +336,10 @@ class MyrientSettingsScreen(Widget):
         # Download settings
         self.query_one("#max-retries-input", Input).value = str(settings.download.max_retries)
         self.query_one("#retry-delay-input", Input).value = str(settings.download.retry_delay)
+        self.query_one("#max-retry-delay-input", Input).value = str(settings.download.max_retry_delay)
+        self.query_one("#concurrent-downloads-input", Input).value = str(settings.download.concurrent_downloads)
+        self.query_one("#segment-threshold-input", Input).value = str(settings.download.segment_threshold_mb)
+        self.query_one("#max-connections-per-file-input", Input).value = str(settings.download.max_connections_per_file)
         self.query_one("#show-progress-switch", Switch).value = settings.download.show_progress
         
         # Filter settings
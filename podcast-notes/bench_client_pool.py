@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fresh OpenAI client per request vs the shared pooled client.
+
+Starts a local fake chat-completions endpoint that counts TCP connections
+and (optionally) sleeps once per new connection to stand in for the
+TLS handshake a real API host costs.  No API key or network is needed.
+
+Usage:
+    python bench_client_pool.py                       # 50 requests, 4 workers
+    python bench_client_pool.py --requests 200 --workers 8 --handshake-ms 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import OpenAI
+
+import config
+import summarizer
+
+_FAKE_RESPONSE = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": "ok"},
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}).encode("utf-8")
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    handshake_s = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with _FakeHandler.lock:
+            _FakeHandler.connections += 1
+        if self.handshake_s:
+            time.sleep(self.handshake_s)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_FAKE_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(_FAKE_RESPONSE)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+def _call(client: OpenAI) -> None:
+    client.chat.completions.create(
+        model="bench",
+        messages=[{"role": "user", "content": "ping"}],
+    )
+
+
+def _run(label: str, make_client, requests: int, workers: int) -> None:
+    _FakeHandler.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: _call(make_client()), range(requests)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {label:<22} {elapsed:7.2f}s  "
+        f"{requests / elapsed:8.1f} req/s  "
+        f"{_FakeHandler.connections:5d} connections"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark OpenAI client connection reuse")
+    parser.add_argument("--requests", "-n", type=int, default=50)
+    parser.add_argument("--workers", "-w", type=int, default=4)
+    parser.add_argument("--handshake-ms", type=float, default=50,
+                        help="Simulated per-connection setup cost (default 50ms)")
+    args = parser.parse_args()
+
+    _FakeHandler.handshake_s = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    config.OPENAI_API_KEY = "bench"
+    config.OPENAI_BASE_URL = f"http://127.0.0.1:{server.server_port}/v1"
+    summarizer.reset_client()
+
+    print(f"{args.requests} requests, {args.workers} workers, "
+          f"{args.handshake_ms:.0f}ms simulated handshake\n")
+
+    def fresh_client() -> OpenAI:
+        return OpenAI(api_key=config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL)
+
+    _run("client per request", fresh_client, args.requests, args.workers)
+    _run("shared pooled client", summarizer.get_client, args.requests, args.workers)
+
+    summarizer.reset_client()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,14 @@ OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
 OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 
+# HTTP connection pool shared by every OpenAI request in a run
+OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "10"))
+# Seconds an idle keep-alive connection stays in the pool
+OPENAI_KEEPALIVE_EXPIRY: float = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "120"))
+# Seconds to establish a connection / to wait for a (long) completion
+OPENAI_CONNECT_TIMEOUT: float = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+OPENAI_READ_TIMEOUT: float = float(os.getenv("OPENAI_READ_TIMEOUT", "600"))
+
 # ---------------------------------------------------------------------------
 # Obsidian vault
 # ---------------------------------------------------------------------------
@@ -26,6 +34,8 @@ PODSCRIPTS_BASE_URL: str = os.getenv(
     "PODSCRIPTS_BASE_URL",
     "https://podscripts.co/podcasts/modern-wisdom",
 )
+# Extra shows (JSON list of profiles); Modern Wisdom above is always available
+PODCASTS_FILE: str = os.getenv("PODCASTS_FILE", str(Path(__file__).parent / "podcasts.json"))
 
 # ---------------------------------------------------------------------------
 # Budget enforcement
@@ -53,6 +63,20 @@ OPENAI_REQUEST_DELAY: float = float(os.getenv("OPENAI_REQUEST_DELAY", "0.5"))
 # ---------------------------------------------------------------------------
 TRACKER_PATH: str = str(Path(__file__).parent / "processed_episodes.csv")
 
+# Incremental [[wiki-link]] graph over the vault notes folder
+LINK_INDEX_PATH: str = str(Path(__file__).parent / "link_index.json")
+
+# Hashed TF-IDF vectors of staged transcripts (related-episode suggestions)
+SIMILARITY_INDEX_PATH: str = str(Path(__file__).parent / "similarity_index.npz")
+
+# ---------------------------------------------------------------------------
+# Watch mode state (lives next to this script)
+# ---------------------------------------------------------------------------
+# ETag / Last-Modified + parsed episodes for each listing page
+CATALOG_CACHE_PATH: str = str(Path(__file__).parent / "catalog_cache.json")
+# Single-instance lock held by `main.py watch`
+WATCH_LOCK_PATH: str = str(Path(__file__).parent / "watch.lock")
+
 # ---------------------------------------------------------------------------
 # Derived helpers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,202 @@
+"""
+Incrementally maintained [[wiki-link]] graph over the podcast notes folder.
+
+File: link_index.json (lives in the podcast-notes directory; other shows
+use link_index-<podcast>.json).
+Per note it stores mtime, size, a content hash and the link targets found,
+so a refresh only re-reads notes whose mtime/size changed and only re-parses
+those whose hash changed.  writer.write_note() updates the entry for each
+note it writes, so the index is usually current without any scan at all.
+
+Answers:
+  backlinks(concept)   — notes that link to a concept
+  orphan_concepts()    — link targets with no note anywhere in the vault,
+                         ranked by how many notes reference them
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import config
+import podcasts
+from podcasts import PodcastProfile
+
+# [[Target]], [[Target|Alias]], [[Target#Heading]], [[Target^block]], ![[Embed]]
+_WIKILINK_RE = re.compile(r"\[\[([^\]|#^\n]+)(?:[#^][^\]|\n]*)?(?:\|[^\]\n]*)?\]\]")
+
+# Vault folders Obsidian itself never treats as notes
+_SKIP_DIRS = {".obsidian", ".trash", ".git"}
+
+
+def extract_links(content: str) -> List[str]:
+    """Return the distinct link targets in a note, in first-seen order."""
+    seen: Dict[str, None] = {}
+    for m in _WIKILINK_RE.finditer(content):
+        target = m.group(1).strip()
+        if target:
+            seen.setdefault(target, None)
+    return list(seen)
+
+
+def _hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class LinkIndex:
+    """Link graph for the notes directly inside one folder."""
+
+    def __init__(self, notes_dir: Path, index_path: Optional[str] = None) -> None:
+        self.notes_dir = Path(notes_dir)
+        self.index_path = index_path or config.LINK_INDEX_PATH
+        self.files: Dict[str, dict] = {}
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("notes_dir") == str(self.notes_dir):
+            self.files = data.get("files", {})
+
+    def save(self) -> None:
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump({"notes_dir": str(self.notes_dir), "files": self.files}, f)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def update_note(self, path: Path, content: Optional[str] = None) -> bool:
+        """
+        Bring one note's entry up to date.  Returns True if its links were
+        re-parsed (i.e. the content changed).
+        """
+        st = path.stat()
+        entry = self.files.get(path.name)
+        if content is None:
+            if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+                return False
+            content = path.read_text(encoding="utf-8", errors="replace")
+
+        digest = _hash(content)
+        if entry and entry["hash"] == digest:
+            entry["mtime"], entry["size"] = st.st_mtime, st.st_size
+            return False
+
+        self.files[path.name] = {
+            "mtime": st.st_mtime,
+            "size": st.st_size,
+            "hash": digest,
+            "links": extract_links(content),
+        }
+        return True
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Sync the index with the notes folder.  Only changed files are read.
+        Returns (reparsed, removed).
+        """
+        present = set()
+        reparsed = 0
+        if self.notes_dir.exists():
+            for path in self.notes_dir.glob("*.md"):
+                present.add(path.name)
+                if self.update_note(path):
+                    reparsed += 1
+
+        removed = [name for name in self.files if name not in present]
+        for name in removed:
+            del self.files[name]
+        return reparsed, len(removed)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def backlinks(self, concept: str) -> List[str]:
+        """Note filenames that link to concept (case-insensitive, like Obsidian)."""
+        key = concept.strip().casefold()
+        return sorted(
+            name for name, entry in self.files.items()
+            if any(link.casefold() == key for link in entry["links"])
+        )
+
+    def reference_counts(self) -> Counter:
+        """Number of notes referencing each link target, keyed by display name."""
+        counts: Counter = Counter()
+        display: Dict[str, str] = {}
+        for entry in self.files.values():
+            for link in entry["links"]:
+                key = link.casefold()
+                display.setdefault(key, link)
+                counts[display[key]] += 1
+        return counts
+
+    def orphan_concepts(self, existing_notes: Optional[set[str]] = None) -> List[Tuple[str, int]]:
+        """
+        Link targets with no matching note in the vault, most referenced
+        first.  existing_notes is a set of casefolded note names; defaults
+        to every note in the vault.
+        """
+        if existing_notes is None:
+            existing_notes = vault_note_names()
+        orphans = [
+            (concept, n) for concept, n in self.reference_counts().items()
+            if Path(concept).name.casefold() not in existing_notes
+        ]
+        orphans.sort(key=lambda item: (-item[1], item[0].casefold()))
+        return orphans
+
+
+def vault_note_names(vault_root: Optional[Path] = None) -> set[str]:
+    """Casefolded basenames (without .md) of every note in the vault."""
+    root = Path(vault_root or config.OBSIDIAN_VAULT_PATH)
+    names: set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS and not d.startswith(".")]
+        for fn in filenames:
+            if fn.endswith(".md"):
+                names.add(fn[:-3].casefold())
+    return names
+
+
+def for_profile(profile: Optional[PodcastProfile] = None) -> LinkIndex:
+    """The link index over one show's notes folder (default: Modern Wisdom)."""
+    profile = profile or podcasts.get_profile()
+    return LinkIndex(profile.output_dir(), profile.state_path(config.LINK_INDEX_PATH))
+
+
+def record_written_note(path: Path, content: str, profile: Optional[PodcastProfile] = None) -> None:
+    """Update the index entry for a note the writer just produced."""
+    profile = profile or podcasts.get_profile()
+    index = LinkIndex(path.parent, profile.state_path(config.LINK_INDEX_PATH))
+    if index.update_note(path, content):
+        index.save()
+
+
+def build_report(orphans: List[Tuple[str, int]], limit: int = 50) -> str:
+    """Markdown report of the most-referenced concepts that lack notes."""
+    lines = [
+        "# Concepts Without Notes",
+        "",
+        f"{len(orphans)} linked concept(s) have no note yet.",
+        "",
+        "| Concept | Referenced by |",
+        "|---|---|",
+    ]
+    for concept, n in orphans[:limit]:
+        lines.append(f"| [[{concept}]] | {n} |")
+    return "\n".join(lines) + "\n"
@@ -5,6 +5,9 @@ Modern Wisdom Podcast → Obsidian Notes pipeline.
 Usage:
     python main.py list                      # show available episodes & status
     python main.py status                    # show tracker contents
+    python main.py links                     # most-linked concepts without notes
+    python main.py links --backlinks "Stoicism"
+    python main.py related                   # link related episodes (offline TF-IDF)
 
   Batch scraping (no API key needed):
     python main.py scrape --episode 1066     # scrape one episode to staging/
@@ -19,41 +22,67 @@ Usage:
     python main.py process --episode 1066    # scrape + AI + write in one step
     python main.py process-latest --count 5  # latest N unprocessed
     python main.py process-all               # process every unprocessed episode
+
+  Daemon:
+    python main.py watch                     # auto-ingest new episodes as they appear
+    python main.py watch --all-podcasts      # … for every show in podcasts.json
+
+  Other shows (profiles in podcasts.json):
+    python main.py scrape-latest --podcast huberman-lab
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
-import traceback
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+import requests
+
 import config
+import linkgraph
+import podcasts
 import scraper
+import sections
+import similarity
 import summarizer
 import tracker
 import writer
 
 STAGING_DIR = Path(__file__).parent / "staging"
 TEMPLATES_DIR = Path(__file__).parent / "templates"
-EPISODE_TEMPLATE_PATH = TEMPLATES_DIR / "modern-wisdom-episode-template.md"
 PROCESSED_DIR = Path(__file__).parent / "processed"
 
 
-def _is_scraped(ep_num: int) -> bool:
+def _staging_dir(profile: podcasts.PodcastProfile) -> Path:
+    """staging/ for the default show, staging/<podcast>/ for the others."""
+    return STAGING_DIR if profile.is_default else STAGING_DIR / profile.id
+
+
+def _processed_dir(profile: podcasts.PodcastProfile) -> Path:
+    """processed/ for the default show, processed/<podcast>/ for the others."""
+    return PROCESSED_DIR if profile.is_default else PROCESSED_DIR / profile.id
+
+
+def _is_scraped(profile: podcasts.PodcastProfile, ep_num: int) -> bool:
     """Check if a transcript already exists in staging/."""
-    return (STAGING_DIR / f"{ep_num}_transcript.txt").exists()
+    return (_staging_dir(profile) / f"{ep_num}_transcript.txt").exists()
 
 
-def _save_to_staging(ep: scraper.EpisodeMeta, transcript: str) -> None:
+def _save_to_staging(profile: podcasts.PodcastProfile, ep: scraper.EpisodeMeta, transcript: str) -> None:
     """Write transcript + metadata to staging/."""
-    STAGING_DIR.mkdir(exist_ok=True)
-    (STAGING_DIR / f"{ep.number}_transcript.txt").write_text(transcript, encoding="utf-8")
-    (STAGING_DIR / f"{ep.number}_meta.json").write_text(json.dumps({
+    staging = _staging_dir(profile)
+    staging.mkdir(parents=True, exist_ok=True)
+    (staging / f"{ep.number}_transcript.txt").write_text(transcript, encoding="utf-8")
+    (staging / f"{ep.number}_meta.json").write_text(json.dumps({
+        "podcast": profile.id,
         "number": ep.number,
         "title": ep.title,
         "guest": ep.guest,
@@ -62,11 +91,12 @@ def _save_to_staging(ep: scraper.EpisodeMeta, transcript: str) -> None:
     }, indent=2), encoding="utf-8")
 
 
-def _staged_episode_numbers() -> list[int]:
-    if not STAGING_DIR.exists():
+def _staged_episode_numbers(profile: podcasts.PodcastProfile) -> list[int]:
+    staging = _staging_dir(profile)
+    if not staging.exists():
         return []
     episode_nums: list[int] = []
-    for p in STAGING_DIR.glob("*_meta.json"):
+    for p in staging.glob("*_meta.json"):
         try:
             episode_nums.append(int(p.stem.split("_", 1)[0]))
         except ValueError:
@@ -74,9 +104,9 @@ def _staged_episode_numbers() -> list[int]:
     return sorted(set(episode_nums))
 
 
-def _load_staged_episode(ep_num: int) -> tuple[scraper.EpisodeMeta, str]:
-    meta_file = STAGING_DIR / f"{ep_num}_meta.json"
-    transcript_file = STAGING_DIR / f"{ep_num}_transcript.txt"
+def _load_staged_episode(profile: podcasts.PodcastProfile, ep_num: int) -> tuple[scraper.EpisodeMeta, str]:
+    meta_file = _staging_dir(profile) / f"{ep_num}_meta.json"
+    transcript_file = _staging_dir(profile) / f"{ep_num}_transcript.txt"
 
     if not meta_file.exists():
         raise FileNotFoundError(str(meta_file))
@@ -90,6 +120,7 @@ def _load_staged_episode(ep_num: int) -> tuple[scraper.EpisodeMeta, str]:
         guest=str(meta_json.get("guest", "")),
         slug=str(meta_json.get("slug", "")),
         url=str(meta_json.get("url", "")),
+        podcast=profile.id,
     )
     transcript = transcript_file.read_text(encoding="utf-8")
     return ep, transcript
@@ -99,12 +130,17 @@ def _load_staged_episode(ep_num: int) -> tuple[scraper.EpisodeMeta, str]:
 # Core pipeline
 # ---------------------------------------------------------------------------
 
-def process_episode(ep: scraper.EpisodeMeta, *, force: bool = False) -> bool:
+def process_episode(
+    profile: podcasts.PodcastProfile,
+    ep: scraper.EpisodeMeta,
+    *,
+    force: bool = False,
+) -> bool:
     """
     Run the full pipeline for one episode.
     Returns True on success, False on failure.
     """
-    if not force and tracker.is_processed(ep.number):
+    if not force and tracker.is_processed(ep.number, profile.id):
         print(f"  ⏭  Episode #{ep.number} already processed — skipping.")
         return True
 
@@ -113,22 +149,22 @@ def process_episode(ep: scraper.EpisodeMeta, *, force: bool = False) -> bool:
         transcript = scraper.get_transcript(ep.url)
     except Exception as exc:
         print(f"  ❌  Failed to scrape transcript: {exc}")
-        tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="failed")
+        tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="failed", podcast=profile.id)
         return False
 
     print(f"  🤖  Generating notes with model '{config.OPENAI_MODEL}'...")
     try:
-        notes_md = summarizer.generate_notes(transcript, ep)
+        notes_md = summarizer.generate_notes(transcript, ep, profile)
     except Exception as exc:
         print(f"  ❌  LLM generation failed: {exc}")
-        tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="failed")
+        tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="failed", podcast=profile.id)
         return False
 
     print(f"  💾  Writing note to vault...")
-    filepath = writer.write_note(notes_md, ep.number, ep.guest, ep.title)
+    filepath = writer.write_note(notes_md, ep.number, ep.guest, ep.title, profile)
     print(f"  ✅  Saved → {filepath}")
 
-    tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="completed")
+    tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="completed", podcast=profile.id)
     return True
 
 
@@ -138,9 +174,10 @@ def process_episode(ep: scraper.EpisodeMeta, *, force: bool = False) -> bool:
 
 def cmd_list(args: argparse.Namespace) -> None:
     """List available episodes and their processing status."""
-    print("Fetching episode list from Podscripts…")
-    episodes = scraper.get_episode_list(max_pages=args.pages)
-    processed = tracker.load_tracker()
+    profile = podcasts.get_profile(args.podcast)
+    print(f"Fetching {profile.name} episode list from Podscripts…")
+    episodes = scraper.get_episode_list(max_pages=args.pages, profile=profile)
+    processed = tracker.load_tracker(profile.id)
 
     print(f"\n{'EP':>6}  {'STATUS':>9}  TITLE")
     print("-" * 80)
@@ -157,25 +194,27 @@ def cmd_list(args: argparse.Namespace) -> None:
 
 def cmd_process(args: argparse.Namespace) -> None:
     """Process a single episode by number."""
+    profile = podcasts.get_profile(args.podcast)
     ep_num = args.episode
     print(f"Looking up episode #{ep_num}…")
-    ep = scraper.get_episode_by_number(ep_num)
+    ep = scraper.get_episode_by_number(ep_num, profile)
     if not ep:
         print(f"Episode #{ep_num} not found on Podscripts.")
         sys.exit(1)
 
-    ok = process_episode(ep, force=args.force)
+    ok = process_episode(profile, ep, force=args.force)
     sys.exit(0 if ok else 1)
 
 
 def cmd_process_latest(args: argparse.Namespace) -> None:
     """Process the latest N unprocessed episodes."""
+    profile = podcasts.get_profile(args.podcast)
     count = args.count
     print(f"Fetching episode list…")
-    episodes = scraper.get_episode_list(max_pages=args.pages)
+    episodes = scraper.get_episode_list(max_pages=args.pages, profile=profile)
 
     to_process = [
-        ep for ep in episodes if not tracker.is_processed(ep.number)
+        ep for ep in episodes if not tracker.is_processed(ep.number, profile.id)
     ][:count]
 
     if not to_process:
@@ -185,16 +224,17 @@ def cmd_process_latest(args: argparse.Namespace) -> None:
     print(f"Processing {len(to_process)} episode(s)…\n")
     for ep in to_process:
         print(f"── Episode #{ep.number} ──")
-        process_episode(ep)
+        process_episode(profile, ep)
         print()
 
 
 def cmd_process_all(args: argparse.Namespace) -> None:
     """Process every unprocessed episode."""
+    profile = podcasts.get_profile(args.podcast)
     print("Fetching full episode list…")
-    episodes = scraper.get_episode_list(max_pages=args.pages)
+    episodes = scraper.get_episode_list(max_pages=args.pages, profile=profile)
 
-    to_process = [ep for ep in episodes if not tracker.is_processed(ep.number)]
+    to_process = [ep for ep in episodes if not tracker.is_processed(ep.number, profile.id)]
 
     if not to_process:
         print("All episodes already processed!")
@@ -205,7 +245,7 @@ def cmd_process_all(args: argparse.Namespace) -> None:
     failures = 0
     for ep in to_process:
         print(f"── Episode #{ep.number} ──")
-        ok = process_episode(ep)
+        ok = process_episode(profile, ep)
         if ok:
             successes += 1
         else:
@@ -215,9 +255,9 @@ def cmd_process_all(args: argparse.Namespace) -> None:
     print(f"\nDone: {successes} succeeded, {failures} failed.")
 
 
-def cmd_status(_args: argparse.Namespace) -> None:
+def cmd_status(args: argparse.Namespace) -> None:
     """Show the current tracker contents."""
-    entries = tracker.get_processed_list()
+    entries = tracker.get_processed_list(podcasts.get_profile(args.podcast).id)
     if not entries:
         print("No episodes have been processed yet.")
         return
@@ -235,14 +275,15 @@ def cmd_scrape(args: argparse.Namespace) -> None:
     Outputs a JSON metadata file + a plain-text transcript file.
     Used by the Windsurf-credits workflow so Cascade can do the AI step.
     """
+    profile = podcasts.get_profile(args.podcast)
     ep_num = args.episode
     print(f"Looking up episode #{ep_num}…")
-    ep = scraper.get_episode_by_number(ep_num)
+    ep = scraper.get_episode_by_number(ep_num, profile)
     if not ep:
         print(f"Episode #{ep_num} not found on Podscripts.")
         sys.exit(1)
 
-    if not args.force and (tracker.is_processed(ep.number) or _is_scraped(ep.number)):
+    if not args.force and (tracker.is_processed(ep.number, profile.id) or _is_scraped(profile, ep.number)):
         print(f"Episode #{ep.number} already scraped — use --force to re-scrape.")
         sys.exit(0)
 
@@ -253,53 +294,59 @@ def cmd_scrape(args: argparse.Namespace) -> None:
         print(f"Failed to scrape transcript: {exc}")
         sys.exit(1)
 
-    _save_to_staging(ep, transcript)
+    _save_to_staging(profile, ep, transcript)
 
-    print(f"\nTranscript saved  → staging/{ep.number}_transcript.txt")
-    print(f"Metadata saved    → staging/{ep.number}_meta.json")
+    staging = _staging_dir(profile).relative_to(Path(__file__).parent).as_posix()
+    print(f"\nTranscript saved  → {staging}/{ep.number}_transcript.txt")
+    print(f"Metadata saved    → {staging}/{ep.number}_meta.json")
     print(f"Transcript length → {len(transcript):,} chars")
     print(f"\nNext step: have Cascade (or any LLM) generate the note, then run:")
-    print(f"  python main.py write-note --episode {ep.number} --file <generated_note.md>")
+    podcast_flag = "" if profile.is_default else f" --podcast {profile.id}"
+    print(f"  python main.py write-note --episode {ep.number} --file <generated_note.md>{podcast_flag}")
 
 
 def cmd_scrape_latest(args: argparse.Namespace) -> None:
     """Batch scrape the latest N unscraped episode transcripts to staging/."""
+    profile = podcasts.get_profile(args.podcast)
     count = args.count
     delay = args.delay
 
-    print("Fetching episode list from Podscripts…")
+    print(f"Fetching {profile.name} episode list from Podscripts…")
     episodes = scraper.get_episode_list(
         max_pages=args.pages,
         progress_cb=lambda pg, n: print(f"  page {pg} … {n} episodes found", end="\r"),
+        profile=profile,
     )
     print()
 
     to_scrape = [
         ep for ep in episodes
-        if not _is_scraped(ep.number) and not tracker.is_processed(ep.number)
+        if not _is_scraped(profile, ep.number) and not tracker.is_processed(ep.number, profile.id)
     ][:count]
 
     if not to_scrape:
         print("All episodes already scraped!")
         return
 
-    _run_batch_scrape(to_scrape, delay)
+    _run_batch_scrape(profile, to_scrape, delay)
 
 
 def cmd_scrape_all(args: argparse.Namespace) -> None:
     """Batch scrape every unscraped episode transcript to staging/."""
+    profile = podcasts.get_profile(args.podcast)
     delay = args.delay
 
-    print("Fetching full episode catalog from Podscripts…")
+    print(f"Fetching full {profile.name} catalog from Podscripts…")
     episodes = scraper.get_episode_list(
         max_pages=args.pages,
         progress_cb=lambda pg, n: print(f"  page {pg} … {n} episodes found", end="\r"),
+        profile=profile,
     )
     print()
 
     to_scrape = [
         ep for ep in episodes
-        if not _is_scraped(ep.number) and not tracker.is_processed(ep.number)
+        if not _is_scraped(profile, ep.number) and not tracker.is_processed(ep.number, profile.id)
     ]
 
     if args.force:
@@ -309,10 +356,15 @@ def cmd_scrape_all(args: argparse.Namespace) -> None:
         print("All episodes already scraped!")
         return
 
-    _run_batch_scrape(to_scrape, delay)
+    _run_batch_scrape(profile, to_scrape, delay)
 
 
-def _run_batch_scrape(episodes: list[scraper.EpisodeMeta], delay: float) -> None:
+def _run_batch_scrape(
+    profile: podcasts.PodcastProfile,
+    episodes: list[scraper.EpisodeMeta],
+    delay: float,
+    pool: scraper.BrowserPool | None = None,
+) -> None:
     """Execute batch scraping with progress output and rate limiting."""
     total = len(episodes)
     successes = 0
@@ -323,7 +375,7 @@ def _run_batch_scrape(episodes: list[scraper.EpisodeMeta], delay: float) -> None
     def on_success(ep: scraper.EpisodeMeta, transcript: str) -> None:
         nonlocal successes
         successes += 1
-        _save_to_staging(ep, transcript)
+        _save_to_staging(profile, ep, transcript)
         print(f"  ✅ [{successes + failures}/{total}] #{ep.number} — {len(transcript):,} chars")
 
     def on_error(ep: scraper.EpisodeMeta, exc: Exception) -> None:
@@ -336,10 +388,11 @@ def _run_batch_scrape(episodes: list[scraper.EpisodeMeta], delay: float) -> None
         delay=delay,
         on_success=on_success,
         on_error=on_error,
+        pool=pool,
     )
 
     print(f"\nBatch complete: {successes} succeeded, {failures} failed out of {total}.")
-    print(f"Transcripts saved to: {STAGING_DIR.resolve()}")
+    print(f"Transcripts saved to: {_staging_dir(profile).resolve()}")
 
 
 def cmd_write_note(args: argparse.Namespace) -> None:
@@ -347,6 +400,7 @@ def cmd_write_note(args: argparse.Namespace) -> None:
     Write a pre-generated note to the Obsidian vault and update the tracker.
     Used after Cascade has produced the markdown via Windsurf credits.
     """
+    profile = podcasts.get_profile(args.podcast)
     ep_num = args.episode
     note_path = Path(args.file)
 
@@ -355,7 +409,7 @@ def cmd_write_note(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     # Load metadata from staging (or fall back to scraping)
-    meta_file = STAGING_DIR / f"{ep_num}_meta.json"
+    meta_file = _staging_dir(profile) / f"{ep_num}_meta.json"
     if meta_file.exists():
         meta = json.loads(meta_file.read_text(encoding="utf-8"))
         guest = meta.get("guest", "")
@@ -363,15 +417,15 @@ def cmd_write_note(args: argparse.Namespace) -> None:
         url = meta.get("url", "")
     else:
         print(f"No staging metadata for #{ep_num}, looking up on Podscripts…")
-        ep = scraper.get_episode_by_number(ep_num)
+        ep = scraper.get_episode_by_number(ep_num, profile)
         if not ep:
             print(f"Episode #{ep_num} not found.")
             sys.exit(1)
         guest, title, url = ep.guest, ep.title, ep.url
 
     notes_md = note_path.read_text(encoding="utf-8")
-    filepath = writer.write_note(notes_md, ep_num, guest, title)
-    tracker.mark_processed(ep_num, guest, title, url, status="completed")
+    filepath = writer.write_note(notes_md, ep_num, guest, title, profile)
+    tracker.mark_processed(ep_num, guest, title, url, status="completed", podcast=profile.id)
 
     print(f"Note written → {filepath}")
     print(f"Tracker updated for episode #{ep_num}.")
@@ -383,66 +437,133 @@ def cmd_generate_processed(args: argparse.Namespace) -> None:
     Reads {episode}_meta.json + {episode}_transcript.txt from staging/.
     Writes final notes to processed/.
 
+    Episodes are generated on a pool of --workers threads that share one
+    RateLimiter and one OpenAI client; each note is written as soon as its
+    request completes.
+
+    With --repair, existing notes that are missing template sections (or
+    left them empty) get just those sections regenerated instead of being
+    skipped.
+
     Does not modify staging files.
     """
-    if not EPISODE_TEMPLATE_PATH.exists():
-        print(f"Template not found: {EPISODE_TEMPLATE_PATH}")
+    profile = podcasts.get_profile(args.podcast)
+    template_path = TEMPLATES_DIR / profile.template
+    if not template_path.exists():
+        print(f"Template not found: {template_path}")
         sys.exit(1)
 
     if args.episode is not None:
         episode_nums = [args.episode]
     else:
-        episode_nums = _staged_episode_numbers()
+        episode_nums = _staged_episode_numbers(profile)
 
     if not episode_nums:
         print("No staged episodes found in staging/.")
         return
 
-    template_md = EPISODE_TEMPLATE_PATH.read_text(encoding="utf-8")
+    template_md = template_path.read_text(encoding="utf-8")
+    required = sections.required_sections(template_md)
     created_date = datetime.now().date().isoformat()
 
-    PROCESSED_DIR.mkdir(exist_ok=True)
+    processed_dir = _processed_dir(profile)
+    processed_dir.mkdir(parents=True, exist_ok=True)
 
     total = len(episode_nums)
     successes = 0
     failures = 0
     skipped = 0
+    done = 0
 
-    for idx, ep_num in enumerate(episode_nums, start=1):
+    # Resolve staged files and skip-if-exists up front; only real work is queued.
+    pending: list[tuple[scraper.EpisodeMeta, str, Path, str | None]] = []
+    for ep_num in episode_nums:
         try:
-            ep, transcript = _load_staged_episode(ep_num)
+            ep, transcript = _load_staged_episode(profile, ep_num)
         except Exception as exc:
             failures += 1
-            print(f"  ❌ [{idx}/{total}] #{ep_num} — missing staged files: {exc}")
+            done += 1
+            print(f"  ❌ [{done}/{total}] #{ep_num} — missing staged files: {exc}")
             continue
 
         guest_for_filename = (ep.guest or "Unknown Guest").strip()
-        filename = writer.build_processed_filename(ep.number, guest_for_filename)
-        out_path = PROCESSED_DIR / filename
+        filename = writer.build_processed_filename(ep.number, guest_for_filename, profile.name)
+        out_path = processed_dir / filename
 
+        existing = None
         if out_path.exists() and not args.force:
-            skipped += 1
-            print(f"  ⏭  [{idx}/{total}] #{ep.number} — already generated")
-            continue
-
-        try:
-            note_md = summarizer.generate_notes_from_template(
+            if args.repair:
+                existing = out_path.read_text(encoding="utf-8")
+            if existing is None or not sections.find_problems(existing, required):
+                skipped += 1
+                done += 1
+                print(f"  ⏭  [{done}/{total}] #{ep.number} — already generated")
+                continue
+
+        pending.append((ep, transcript, out_path, existing))
+
+    if pending:
+        limiter = summarizer.RateLimiter(
+            rpm_limit=config.OPENAI_RPM_LIMIT,
+            tpm_limit=config.OPENAI_TPM_LIMIT,
+            run_token_cap=config.OPENAI_RUN_TOKEN_CAP,
+        )
+        client = summarizer.get_client()
+        workers = max(1, min(args.workers, len(pending)))
+        print(f"Generating {len(pending)} note(s) with {workers} worker(s) [{config.OPENAI_MODEL}]\n")
+
+        def generate(ep: scraper.EpisodeMeta, transcript: str, existing: str | None) -> str:
+            if existing is not None:
+                return summarizer.repair_note_from_template(
+                    existing,
+                    transcript=transcript,
+                    meta=ep,
+                    template_markdown=template_md,
+                    created_date=created_date,
+                    limiter=limiter,
+                    request_delay=args.delay,
+                    client=client,
+                    profile=profile,
+                )
+            return summarizer.generate_notes_from_template(
                 transcript=transcript,
                 meta=ep,
                 template_markdown=template_md,
                 created_date=created_date,
+                limiter=limiter,
+                request_delay=args.delay,
+                client=client,
+                profile=profile,
             )
-            transcript_block = f"\nTRANSCRIPT:\n{transcript.strip()}\n"
-            note_md = re.sub(r"\nTRANSCRIPT:\n[\s\S]*$", transcript_block, note_md.strip())
-            out_path.write_text(note_md, encoding="utf-8")
-            successes += 1
-            print(f"  ✅ [{idx}/{total}] #{ep.number} — wrote {out_path.name}")
-        except Exception as exc:
-            failures += 1
-            print(f"  ❌ [{idx}/{total}] #{ep.number} — generation failed: {exc}")
 
-        if idx < total and args.delay > 0:
-            time.sleep(args.delay)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(generate, ep, transcript, existing): (ep, transcript, out_path)
+                for ep, transcript, out_path, existing in pending
+            }
+            for future in as_completed(futures):
+                ep, transcript, out_path = futures[future]
+                done += 1
+                if future.cancelled():
+                    skipped += 1
+                    continue
+                try:
+                    note_md = future.result()
+                    transcript_block = f"\nTRANSCRIPT:\n{transcript.strip()}\n"
+                    note_md = re.sub(r"\nTRANSCRIPT:\n[\s\S]*$", transcript_block, note_md.strip())
+                    out_path.write_text(note_md, encoding="utf-8")
+                    successes += 1
+                    print(f"  ✅ [{done}/{total}] #{ep.number} — wrote {out_path.name}")
+                except Exception as exc:
+                    failures += 1
+                    print(f"  ❌ [{done}/{total}] #{ep.number} — generation failed: {exc}")
+                    if "token cap" in str(exc).lower():
+                        print("\nRun token cap reached — cancelling queued episodes. Re-run to continue.")
+                        for f in futures:
+                            f.cancel()
+
+        print(f"Total tokens consumed this run: {limiter.total_tokens_used:,}")
+        print(limiter.scheduling_summary())
 
     print(f"\nDone. {successes} succeeded, {skipped} skipped, {failures} failed.")
 
@@ -456,10 +577,11 @@ def cmd_summarize_staged(args: argparse.Namespace) -> None:
     Respects OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT, OPENAI_RUN_TOKEN_CAP, and
     OPENAI_REQUEST_DELAY from .env / config.
     """
+    profile = podcasts.get_profile(args.podcast)
     if args.episode is not None:
         staged_nums = [args.episode]
     else:
-        staged_nums = _staged_episode_numbers()
+        staged_nums = _staged_episode_numbers(profile)
 
     if not staged_nums:
         print("No staged episodes found in staging/.")
@@ -468,7 +590,7 @@ def cmd_summarize_staged(args: argparse.Namespace) -> None:
     if args.force:
         to_process = staged_nums
     else:
-        to_process = [n for n in staged_nums if not tracker.is_processed(n)]
+        to_process = [n for n in staged_nums if not tracker.is_processed(n, profile.id)]
 
     if not to_process:
         print("All staged episodes are already processed. Use --force to re-process.")
@@ -480,26 +602,43 @@ def cmd_summarize_staged(args: argparse.Namespace) -> None:
         run_token_cap=config.OPENAI_RUN_TOKEN_CAP,
     )
 
-    total = len(to_process)
-    successes = 0
-    failures = 0
-    skipped = 0
-
-    print(f"\nSummarizing {total} staged episode(s) via OpenAI [{config.OPENAI_MODEL}]")
+    print(f"\nSummarizing {len(to_process)} staged episode(s) via OpenAI [{config.OPENAI_MODEL}]")
     print(f"  RPM limit : {config.OPENAI_RPM_LIMIT or 'none'}")
     print(f"  TPM limit : {config.OPENAI_TPM_LIMIT or 'none'}")
     print(f"  Token cap : {config.OPENAI_RUN_TOKEN_CAP or 'none'}")
     print(f"  Req delay : {config.OPENAI_REQUEST_DELAY}s\n")
 
+    successes, skipped, failures = _summarize_staged_episodes(profile, to_process, limiter)
+
+    print(f"\nDone. {successes} succeeded, {skipped} skipped, {failures} failed.")
+    print(f"Total tokens consumed this run: {limiter.total_tokens_used:,}")
+    print(limiter.scheduling_summary())
+
+
+def _summarize_staged_episodes(
+    profile: podcasts.PodcastProfile,
+    to_process: list[int],
+    limiter: summarizer.RateLimiter,
+) -> tuple[int, int, int]:
+    """
+    Summarize staged transcripts, write each note to the vault and mark it
+    completed (or failed, so watch mode retries it).
+    Returns (successes, skipped, failures).
+    """
+    total = len(to_process)
+    successes = 0
+    failures = 0
+    skipped = 0
+
     for idx, ep_num in enumerate(to_process, start=1):
-        transcript_file = STAGING_DIR / f"{ep_num}_transcript.txt"
+        transcript_file = _staging_dir(profile) / f"{ep_num}_transcript.txt"
         if not transcript_file.exists():
             skipped += 1
             print(f"  ⏭  [{idx}/{total}] #{ep_num} — transcript missing, skipping")
             continue
 
         try:
-            ep, transcript = _load_staged_episode(ep_num)
+            ep, transcript = _load_staged_episode(profile, ep_num)
         except Exception as exc:
             failures += 1
             print(f"  ❌ [{idx}/{total}] #{ep_num} — failed to load staged files: {exc}")
@@ -513,10 +652,12 @@ def cmd_summarize_staged(args: argparse.Namespace) -> None:
                 ep,
                 limiter=limiter,
                 request_delay=config.OPENAI_REQUEST_DELAY,
+                profile=profile,
             )
         except RuntimeError as exc:
             failures += 1
             print(f"\n  ❌ [{idx}/{total}] #{ep_num} — {exc}")
+            tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="failed", podcast=profile.id)
             if "token cap" in str(exc).lower():
                 print(f"\nRun token cap reached after {successes} episodes. Re-run to continue.")
                 break
@@ -524,19 +665,244 @@ def cmd_summarize_staged(args: argparse.Namespace) -> None:
         except Exception as exc:
             failures += 1
             print(f"\n  ❌ [{idx}/{total}] #{ep_num} — OpenAI error: {exc}")
+            tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="failed", podcast=profile.id)
             continue
 
         try:
-            filepath = writer.write_note(notes_md, ep.number, ep.guest, ep.title)
-            tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="completed")
+            filepath = writer.write_note(notes_md, ep.number, ep.guest, ep.title, profile)
+            tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="completed", podcast=profile.id)
             successes += 1
             print(f"✅  → {filepath.name}  [{limiter.total_tokens_used:,} tokens used]")
         except Exception as exc:
             failures += 1
             print(f"\n  ❌ [{idx}/{total}] #{ep_num} — write failed: {exc}")
+            tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="failed", podcast=profile.id)
+
+    return successes, skipped, failures
 
-    print(f"\nDone. {successes} succeeded, {skipped} skipped, {failures} failed.")
-    print(f"Total tokens consumed this run: {limiter.total_tokens_used:,}")
+
+def cmd_links(args: argparse.Namespace) -> None:
+    """
+    Query the incremental [[wiki-link]] index over the vault notes folder.
+    Only notes changed since the last run are re-read.
+    """
+    index = linkgraph.for_profile(podcasts.get_profile(args.podcast))
+    reparsed, removed = index.refresh()
+    index.save()
+    print(f"Link index: {len(index.files)} notes ({reparsed} re-parsed, {removed} removed)\n")
+
+    if args.backlinks:
+        hits = index.backlinks(args.backlinks)
+        print(f"{len(hits)} note(s) link to [[{args.backlinks}]]:")
+        for name in hits:
+            print(f"  {name}")
+        return
+
+    orphans = index.orphan_concepts()
+    if args.out:
+        Path(args.out).write_text(linkgraph.build_report(orphans, args.top), encoding="utf-8")
+        print(f"Report written → {args.out}")
+        return
+
+    print(f"{len(orphans)} linked concept(s) have no note. Top {min(args.top, len(orphans))}:\n")
+    print(f"{'REFS':>5}  CONCEPT")
+    print("-" * 60)
+    for concept, n in orphans[: args.top]:
+        print(f"{n:>5}  {concept}")
+
+
+def cmd_related(args: argparse.Namespace) -> None:
+    """
+    Suggest related episodes from staged transcripts (offline, no API calls)
+    and write them into each vault note's Related Episodes section.
+    """
+    profile = podcasts.get_profile(args.podcast)
+    staging = _staging_dir(profile)
+    staged = _staged_episode_numbers(profile)
+    if not staged:
+        print("No staged episodes found in staging/.")
+        return
+
+    index = similarity.SimilarityIndex(profile.state_path(config.SIMILARITY_INDEX_PATH))
+    added, rebuilt = index.update(
+        staged,
+        lambda n: (staging / f"{n}_transcript.txt").read_text(encoding="utf-8"),
+        rebuild=args.rebuild,
+    )
+    index.save()
+    action = "rebuilt" if rebuilt else f"{added} added"
+    print(f"Similarity index: {len(index.episodes)} episodes ({action})\n")
+
+    targets = [args.episode] if args.episode is not None else None
+    neighbours = index.top_k(args.top_k, episodes=targets)
+
+    guests: dict[int, str] = {}
+    for ep_num in staged:
+        try:
+            meta = json.loads((staging / f"{ep_num}_meta.json").read_text(encoding="utf-8"))
+            guests[ep_num] = str(meta.get("guest", ""))
+        except (OSError, ValueError):
+            guests[ep_num] = ""
+
+    vault_dir = profile.output_dir()
+    updated = unchanged = missing = 0
+    for ep_num, related in sorted(neighbours.items()):
+        if args.dry_run:
+            shown = ", ".join(f"#{n} ({score:.2f})" for n, score in related)
+            print(f"  #{ep_num}: {shown}")
+            continue
+
+        note_path = vault_dir / writer.build_filename(ep_num, guests.get(ep_num, ""), "", profile.name)
+        if not note_path.exists():
+            missing += 1
+            continue
+
+        content = note_path.read_text(encoding="utf-8")
+        new_content = writer.set_related_section(
+            content, [(n, guests.get(n, "")) for n, _score in related], profile.name
+        )
+        if new_content == content:
+            unchanged += 1
+            continue
+        note_path.write_text(new_content, encoding="utf-8")
+        linkgraph.record_written_note(note_path, new_content, profile)
+        updated += 1
+        print(f"  ✅ #{ep_num} — {note_path.name}")
+
+    if not args.dry_run:
+        print(f"\nDone. {updated} updated, {unchanged} unchanged, {missing} without a vault note.")
+
+
+def _acquire_single_instance_lock(path: Path):
+    """
+    Take an exclusive, non-blocking OS lock on path and return the open file.
+    The OS drops the lock when the process exits, so a crash never leaves a
+    stale lock behind.  Returns None if another instance holds it.
+    """
+    fh = open(path, "a+", encoding="utf-8")
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fh.close()
+        return None
+    fh.seek(0)
+    fh.truncate()
+    fh.write(str(os.getpid()))
+    fh.flush()
+    return fh
+
+
+def _watch_cycle(
+    args: argparse.Namespace,
+    profile: podcasts.PodcastProfile,
+    limiter: summarizer.RateLimiter,
+    session,
+    pool: scraper.BrowserPool,
+) -> int:
+    """One watch refresh of one show: find new episodes, scrape them,
+    summarize + write.  Staged episodes the tracker marks failed (an earlier
+    summary errored or hit the token cap) are retried after the new ones;
+    staged episodes with no tracker entry (scrape-all, generate-processed)
+    are left alone.  At most --max-per-cycle episodes are summarized.
+    Returns the number of new episodes found."""
+    staged_nums = _staged_episode_numbers(profile)
+    tracked = tracker.load_tracker(profile.id)
+    # Staged transcripts only count as known for scraping; whether they were
+    # summarized is the tracker's business
+    known = set(staged_nums) | set(tracked)
+    new_eps = scraper.get_new_episodes(
+        known,
+        cache_path=profile.state_path(config.CATALOG_CACHE_PATH),
+        max_pages=args.pages,
+        session=session,
+        profile=profile,
+    )[: args.max_per_cycle]
+
+    if new_eps:
+        print(f"{profile.name}: {len(new_eps)} new episode(s): {', '.join(f'#{ep.number}' for ep in new_eps)}")
+        _run_batch_scrape(profile, new_eps, args.delay, pool)
+
+    if args.no_summarize:
+        return len(new_eps)
+
+    fresh = [ep.number for ep in new_eps if _is_scraped(profile, ep.number)]
+    failed = [
+        n for n in staged_nums
+        if n in tracked and tracked[n].status == "failed" and n not in fresh
+    ]
+    to_summarize = (fresh + failed)[: args.max_per_cycle]
+    retrying = [n for n in to_summarize if n in failed]
+    if retrying:
+        print(f"{profile.name}: retrying {len(retrying)} failed episode(s): "
+              f"{', '.join(f'#{n}' for n in retrying)}")
+    if to_summarize:
+        print(f"\nSummarizing {len(to_summarize)} episode(s) via OpenAI [{config.OPENAI_MODEL}]")
+        successes, skipped, failures = _summarize_staged_episodes(profile, to_summarize, limiter)
+        print(f"Summarized: {successes} succeeded, {skipped} skipped, {failures} failed.")
+    return len(new_eps)
+
+
+def cmd_watch(args: argparse.Namespace) -> None:
+    """
+    Daemon: poll the catalog for new episodes and run them through
+    scrape → summarize → write automatically.
+
+    Listing pages are fetched with ETag / Last-Modified validators, so an
+    unchanged catalog costs one 304 per refresh.  The interval doubles after
+    every idle refresh (up to --max-interval) and snaps back to --interval
+    as soon as something new shows up.  Only one watcher may run at a time.
+
+    With --all-podcasts every configured show is checked each refresh; they
+    share one HTTP session, one browser with a single page-load throttle,
+    and one OpenAI rate limiter.
+    """
+    lock = _acquire_single_instance_lock(Path(config.WATCH_LOCK_PATH))
+    if lock is None:
+        print(f"Another watcher is already running (lock: {config.WATCH_LOCK_PATH}).")
+        sys.exit(1)
+
+    limiter = summarizer.RateLimiter(
+        rpm_limit=config.OPENAI_RPM_LIMIT,
+        tpm_limit=config.OPENAI_TPM_LIMIT,
+        run_token_cap=config.OPENAI_RUN_TOKEN_CAP,
+    )
+    session = requests.Session()
+    interval = args.interval
+    profiles = podcasts.all_profiles() if args.all_podcasts else [podcasts.get_profile(args.podcast)]
+
+    for profile in profiles:
+        print(f"Watching {profile.base_url}")
+    print(f"  Interval : {args.interval}s (idle backoff up to {args.max_interval}s)")
+    print(f"  Pipeline : scrape{'' if args.no_summarize else ' → summarize → write'}\n")
+
+    try:
+        while True:
+            stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            found = 0
+            with scraper.BrowserPool() as pool:
+                for profile in profiles:
+                    try:
+                        found += _watch_cycle(args, profile, limiter, session, pool)
+                    except Exception as exc:
+                        print(f"[{stamp}] ❌ {profile.name} refresh failed: {exc}")
+
+            if found:
+                interval = args.interval
+            else:
+                interval = min(interval * 2, args.max_interval)
+                print(f"[{stamp}] Nothing new — next check in {interval}s")
+
+            if args.once:
+                break
+            time.sleep(interval)
+    finally:
+        lock.close()
 
 
 def cmd_rename_vault_range(args: argparse.Namespace) -> None:
@@ -546,7 +912,8 @@ def cmd_rename_vault_range(args: argparse.Namespace) -> None:
     if start > end:
         start, end = end, start
 
-    vault_dir = config.output_dir()
+    profile = podcasts.get_profile(args.podcast)
+    vault_dir = profile.output_dir()
     total = end - start + 1
     renamed = 0
     skipped = 0
@@ -554,13 +921,13 @@ def cmd_rename_vault_range(args: argparse.Namespace) -> None:
 
     for idx, ep_num in enumerate(range(start, end + 1), start=1):
         try:
-            ep, _transcript = _load_staged_episode(ep_num)
+            ep, _transcript = _load_staged_episode(profile, ep_num)
         except Exception as exc:
             failures += 1
             print(f"  ❌ [{idx}/{total}] #{ep_num} — missing staged meta/transcript: {exc}")
             continue
 
-        target_name = writer.build_filename(ep.number, ep.guest, ep.title)
+        target_name = writer.build_filename(ep.number, ep.guest, ep.title, profile.name)
         target_path = vault_dir / target_name
 
         # If already correct, nothing to do
@@ -570,7 +937,8 @@ def cmd_rename_vault_range(args: argparse.Namespace) -> None:
             continue
 
         # Find existing legacy file(s)
-        legacy_candidates = sorted(vault_dir.glob(f"Modern-Wisdom-{ep_num}-*.md"))
+        legacy_prefix = writer.sanitize_filename(profile.name)
+        legacy_candidates = sorted(vault_dir.glob(f"{legacy_prefix}-{ep_num}-*.md"))
         if not legacy_candidates:
             skipped += 1
             print(f"  ⏭  [{idx}/{total}] #{ep_num} — no legacy file found")
@@ -609,6 +977,7 @@ def cmd_rename_vault_range(args: argparse.Namespace) -> None:
 
 def cmd_write_notes_range(args: argparse.Namespace) -> None:
     """Write staged notes (staging/{ep}_note.md) to the vault for a range."""
+    profile = podcasts.get_profile(args.podcast)
     start = args.start
     end = args.end
 
@@ -621,14 +990,14 @@ def cmd_write_notes_range(args: argparse.Namespace) -> None:
     skipped = 0
 
     for idx, ep_num in enumerate(range(start, end + 1), start=1):
-        note_path = STAGING_DIR / f"{ep_num}_note.md"
+        note_path = _staging_dir(profile) / f"{ep_num}_note.md"
         if not note_path.exists():
             skipped += 1
             print(f"  ⏭  [{idx}/{total}] #{ep_num} — missing staged note (expected {note_path.name})")
             continue
 
         try:
-            ep, _transcript = _load_staged_episode(ep_num)
+            ep, _transcript = _load_staged_episode(profile, ep_num)
         except Exception as exc:
             failures += 1
             print(f"  ❌ [{idx}/{total}] #{ep_num} — missing staged meta/transcript: {exc}")
@@ -636,8 +1005,8 @@ def cmd_write_notes_range(args: argparse.Namespace) -> None:
 
         try:
             notes_md = note_path.read_text(encoding="utf-8")
-            filepath = writer.write_note(notes_md, ep.number, ep.guest, ep.title)
-            tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="completed")
+            filepath = writer.write_note(notes_md, ep.number, ep.guest, ep.title, profile)
+            tracker.mark_processed(ep.number, ep.guest, ep.title, ep.url, status="completed", podcast=profile.id)
             successes += 1
             print(f"  ✅ [{idx}/{total}] #{ep.number} — wrote {filepath.name}")
         except Exception as exc:
@@ -657,42 +1026,49 @@ def build_parser() -> argparse.ArgumentParser:
     )
     sub = parser.add_subparsers(dest="command", required=True)
 
+    # --podcast is accepted by every subcommand
+    podcast_opt = argparse.ArgumentParser(add_help=False)
+    podcast_opt.add_argument(
+        "--podcast", "-p", default=podcasts.DEFAULT_PODCAST,
+        help=f"Podcast profile id (default: {podcasts.DEFAULT_PODCAST}; see podcasts.json)",
+    )
+
     # list
-    p_list = sub.add_parser("list", help="Show available episodes and status")
+    p_list = sub.add_parser("list", parents=[podcast_opt], help="Show available episodes and status")
     p_list.add_argument("--pages", type=int, default=10, help="Max listing pages to scrape")
     p_list.set_defaults(func=cmd_list)
 
     # process
-    p_proc = sub.add_parser("process", help="Process a single episode")
+    p_proc = sub.add_parser("process", parents=[podcast_opt], help="Process a single episode")
     p_proc.add_argument("--episode", "-e", type=int, required=True, help="Episode number")
     p_proc.add_argument("--force", "-f", action="store_true", help="Re-process even if already done")
     p_proc.add_argument("--pages", type=int, default=10)
     p_proc.set_defaults(func=cmd_process)
 
     # process-latest
-    p_latest = sub.add_parser("process-latest", help="Process latest N unprocessed episodes")
+    p_latest = sub.add_parser("process-latest", parents=[podcast_opt], help="Process latest N unprocessed episodes")
     p_latest.add_argument("--count", "-n", type=int, default=5, help="Number of episodes")
     p_latest.add_argument("--pages", type=int, default=10)
     p_latest.set_defaults(func=cmd_process_latest)
 
     # process-all
-    p_all = sub.add_parser("process-all", help="Process all unprocessed episodes")
+    p_all = sub.add_parser("process-all", parents=[podcast_opt], help="Process all unprocessed episodes")
     p_all.add_argument("--pages", type=int, default=50)
     p_all.set_defaults(func=cmd_process_all)
 
     # status
-    p_status = sub.add_parser("status", help="Show tracker status")
+    p_status = sub.add_parser("status", parents=[podcast_opt], help="Show tracker status")
     p_status.set_defaults(func=cmd_status)
 
     # scrape  (single episode)
-    p_scrape = sub.add_parser("scrape", help="Scrape one transcript to staging/")
+    p_scrape = sub.add_parser("scrape", parents=[podcast_opt], help="Scrape one transcript to staging/")
     p_scrape.add_argument("--episode", "-e", type=int, required=True, help="Episode number")
     p_scrape.add_argument("--force", "-f", action="store_true", help="Re-scrape even if already done")
     p_scrape.add_argument("--pages", type=int, default=10)
     p_scrape.set_defaults(func=cmd_scrape)
 
     # scrape-latest  (batch)
-    p_sl = sub.add_parser("scrape-latest", help="Batch scrape latest N unscraped transcripts")
+    p_sl = sub.add_parser("scrape-latest", parents=[podcast_opt], help="Batch scrape latest N unscraped transcripts")
     p_sl.add_argument("--count", "-n", type=int, default=10, help="Number of episodes (default 10)")
     p_sl.add_argument("--delay", "-d", type=float, default=scraper.DEFAULT_SCRAPE_DELAY,
                        help=f"Seconds between page loads (default {scraper.DEFAULT_SCRAPE_DELAY})")
@@ -700,7 +1076,7 @@ def build_parser() -> argparse.ArgumentParser:
     p_sl.set_defaults(func=cmd_scrape_latest)
 
     # scrape-all  (batch — full catalog)
-    p_sa = sub.add_parser("scrape-all", help="Batch scrape ALL unscraped transcripts")
+    p_sa = sub.add_parser("scrape-all", parents=[podcast_opt], help="Batch scrape ALL unscraped transcripts")
     p_sa.add_argument("--delay", "-d", type=float, default=scraper.DEFAULT_SCRAPE_DELAY,
                        help=f"Seconds between page loads (default {scraper.DEFAULT_SCRAPE_DELAY})")
     p_sa.add_argument("--force", "-f", action="store_true", help="Re-scrape everything")
@@ -709,7 +1085,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     # generate-processed  (LLM fills in episode template from staged transcript)
     p_gp = sub.add_parser(
-        "generate-processed",
+        "generate-processed", parents=[podcast_opt],
         help="Generate episode notes into processed/ from staging/ using the episode template",
     )
     p_gp.add_argument(
@@ -724,7 +1100,14 @@ def build_parser() -> argparse.ArgumentParser:
         "-d",
         type=float,
         default=0,
-        help="Optional delay (seconds) between LLM calls",
+        help="Optional delay (seconds) after each LLM call, per worker",
+    )
+    p_gp.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=4,
+        help="Number of concurrent LLM requests (default 4)",
     )
     p_gp.add_argument(
         "--force",
@@ -732,11 +1115,16 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Overwrite already-generated processed notes",
     )
+    p_gp.add_argument(
+        "--repair",
+        action="store_true",
+        help="Regenerate only the missing/empty sections of already-generated notes",
+    )
     p_gp.set_defaults(func=cmd_generate_processed)
 
     # write-notes-range  (Option A Step 3 helper)
     p_wnr = sub.add_parser(
-        "write-notes-range",
+        "write-notes-range", parents=[podcast_opt],
         help="Write staging/{ep}_note.md to the vault for a numeric episode range",
     )
     p_wnr.add_argument("--start", type=int, required=True, help="Start episode number")
@@ -745,8 +1133,8 @@ def build_parser() -> argparse.ArgumentParser:
 
     # rename-vault-range  (rename legacy vault notes to current naming)
     p_rvr = sub.add_parser(
-        "rename-vault-range",
-        help="Rename vault notes for a numeric episode range to 'Modern Wisdom - {episode} - {guest}.md'",
+        "rename-vault-range", parents=[podcast_opt],
+        help="Rename vault notes for a numeric episode range to '{Podcast} - {episode} - {guest}.md'",
     )
     p_rvr.add_argument("--start", type=int, required=True, help="Start episode number")
     p_rvr.add_argument("--end", type=int, required=True, help="End episode number")
@@ -756,7 +1144,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     # summarize-staged  (Option B batch — skip scraping, only OpenAI + vault)
     p_ss = sub.add_parser(
-        "summarize-staged",
+        "summarize-staged", parents=[podcast_opt],
         help="Batch summarize all staged transcripts via OpenAI and write to vault (no scraping)",
     )
     p_ss.add_argument(
@@ -769,8 +1157,57 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_ss.set_defaults(func=cmd_summarize_staged)
 
+    # links  (backlinks / concepts that still need atomic notes)
+    p_links = sub.add_parser(
+        "links", parents=[podcast_opt],
+        help="Backlink and missing-concept queries over the vault's [[links]]",
+    )
+    p_links.add_argument("--backlinks", "-b", metavar="CONCEPT", default=None,
+                         help="List notes that link to CONCEPT")
+    p_links.add_argument("--top", "-n", type=int, default=25,
+                         help="How many missing concepts to show (default 25)")
+    p_links.add_argument("--out", "-o", default=None,
+                         help="Write the missing-concepts report as markdown to this path")
+    p_links.set_defaults(func=cmd_links)
+
+    # related  (offline related-episode suggestions)
+    p_rel = sub.add_parser(
+        "related", parents=[podcast_opt],
+        help="Write offline related-episode suggestions into vault notes (no API calls)",
+    )
+    p_rel.add_argument("--episode", "-e", type=int, default=None,
+                       help="Only update this episode's note (default: all)")
+    p_rel.add_argument("--top-k", "-k", type=int, default=5,
+                       help="Related episodes per note (default 5)")
+    p_rel.add_argument("--rebuild", action="store_true",
+                       help="Recompute every vector instead of only adding new transcripts")
+    p_rel.add_argument("--dry-run", action="store_true",
+                       help="Print suggestions without changing notes")
+    p_rel.set_defaults(func=cmd_related)
+
+    # watch  (daemon — auto-ingest new episodes)
+    p_watch = sub.add_parser(
+        "watch", parents=[podcast_opt],
+        help="Daemon: poll for new episodes and scrape → summarize → write them automatically",
+    )
+    p_watch.add_argument("--interval", "-i", type=int, default=1800,
+                         help="Seconds between catalog refreshes when active (default 1800)")
+    p_watch.add_argument("--max-interval", type=int, default=6 * 3600,
+                         help="Upper bound for the idle backoff in seconds (default 21600)")
+    p_watch.add_argument("--max-per-cycle", type=int, default=5,
+                         help="Max new episodes ingested per refresh (default 5)")
+    p_watch.add_argument("--delay", "-d", type=float, default=scraper.DEFAULT_SCRAPE_DELAY,
+                         help=f"Seconds between transcript page loads (default {scraper.DEFAULT_SCRAPE_DELAY})")
+    p_watch.add_argument("--pages", type=int, default=200, help="Max listing pages to scan")
+    p_watch.add_argument("--no-summarize", action="store_true",
+                         help="Only scrape to staging/ (Windsurf-credits workflow)")
+    p_watch.add_argument("--once", action="store_true", help="Single refresh, then exit")
+    p_watch.add_argument("--all-podcasts", action="store_true",
+                         help="Watch every configured podcast, not just --podcast")
+    p_watch.set_defaults(func=cmd_watch)
+
     # write-note  (post-Cascade step)
-    p_write = sub.add_parser("write-note", help="Write a pre-generated note to vault + tracker")
+    p_write = sub.add_parser("write-note", parents=[podcast_opt], help="Write a pre-generated note to vault + tracker")
     p_write.add_argument("--episode", "-e", type=int, required=True, help="Episode number")
     p_write.add_argument("--file", required=True, help="Path to the generated markdown note")
     p_write.set_defaults(func=cmd_write_note)
@@ -0,0 +1,135 @@
+"""
+Podcast profiles: everything that differs between shows on Podscripts.
+
+The built-in "modern-wisdom" profile is derived from .env (PODSCRIPTS_BASE_URL,
+OBSIDIAN_SUBFOLDER) so single-show setups keep working unchanged.  More
+shows are added in podcasts.json next to this file, e.g.:
+
+    [
+      {
+        "id": "huberman-lab",
+        "name": "Huberman Lab",
+        "host": "Andrew Huberman",
+        "base_url": "https://podscripts.co/podcasts/huberman-lab-podcast",
+        "vault_subfolder": "Robert-Vault/Podcasts/Huberman Lab"
+      }
+    ]
+
+Omitted fields fall back to Podscripts defaults (link pattern derived from
+base_url, "#123 - Guest - Title" link titles, the Modern Wisdom template).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import config
+
+DEFAULT_PODCAST = "modern-wisdom"
+
+_DEFAULT_TITLE_PATTERN = r"^#(\d+)\s*-\s*(.+?)\s*-\s*(.+)$"
+
+
+@dataclass(frozen=True)
+class PodcastProfile:
+    id: str                   # short key used in the tracker, staging and CLI
+    name: str                 # display name, also the note filename prefix
+    host: str
+    base_url: str             # podscripts listing URL
+    vault_subfolder: str      # folder inside OBSIDIAN_VAULT_PATH
+    template: str = "modern-wisdom-episode-template.md"
+    link_pattern: str = ""    # regex on episode hrefs: group 1 = number
+    title_pattern: str = _DEFAULT_TITLE_PATTERN
+
+    @property
+    def link_re(self) -> re.Pattern:
+        if self.link_pattern:
+            return re.compile(self.link_pattern)
+        path = urlparse(self.base_url).path.rstrip("/")
+        return re.compile(rf"{re.escape(path)}/(\d+)-(.+)$")
+
+    @property
+    def title_re(self) -> re.Pattern:
+        return re.compile(self.title_pattern)
+
+    @property
+    def site_root(self) -> str:
+        parsed = urlparse(self.base_url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    @property
+    def is_default(self) -> bool:
+        return self.id == DEFAULT_PODCAST
+
+    def output_dir(self) -> Path:
+        """Vault folder for this show's notes, created if needed."""
+        p = Path(config.OBSIDIAN_VAULT_PATH) / self.vault_subfolder
+        p.mkdir(parents=True, exist_ok=True)
+        return p
+
+    def state_path(self, base: str) -> str:
+        """
+        Per-show variant of a state file path: the default show keeps the
+        original name, others get their id appended (link_index-<id>.json).
+        """
+        if self.is_default:
+            return base
+        p = Path(base)
+        return str(p.with_name(f"{p.stem}-{self.id}{p.suffix}"))
+
+
+def _default_profile() -> PodcastProfile:
+    return PodcastProfile(
+        id=DEFAULT_PODCAST,
+        name="Modern Wisdom",
+        host="Chris Williamson",
+        base_url=config.PODSCRIPTS_BASE_URL,
+        vault_subfolder=config.OBSIDIAN_SUBFOLDER,
+    )
+
+
+_profiles: Optional[Dict[str, PodcastProfile]] = None
+
+
+def load_profiles() -> Dict[str, PodcastProfile]:
+    """Return all configured profiles keyed by id (default show first)."""
+    global _profiles
+    if _profiles is not None:
+        return _profiles
+
+    profiles = {DEFAULT_PODCAST: _default_profile()}
+    path = Path(config.PODCASTS_FILE)
+    if path.exists():
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as exc:
+            raise RuntimeError(f"Invalid JSON in {path}: {exc}") from exc
+        for entry in entries:
+            try:
+                profile = PodcastProfile(**entry)
+            except TypeError as exc:
+                raise RuntimeError(f"Invalid podcast profile in {path}: {exc}") from exc
+            profiles[profile.id] = profile
+
+    _profiles = profiles
+    return profiles
+
+
+def get_profile(podcast_id: Optional[str] = None) -> PodcastProfile:
+    """Look up a profile by id (default: Modern Wisdom)."""
+    profiles = load_profiles()
+    key = podcast_id or DEFAULT_PODCAST
+    if key not in profiles:
+        raise RuntimeError(
+            f"Unknown podcast '{key}'. Configured: {', '.join(profiles)}"
+        )
+    return profiles[key]
+
+
+def all_profiles() -> List[PodcastProfile]:
+    return list(load_profiles().values())
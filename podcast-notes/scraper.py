@@ -1,5 +1,8 @@
 """
-Scrape podscripts.co for Modern Wisdom episode listings and transcripts.
+Scrape podscripts.co for podcast episode listings and transcripts.
+
+Show-specific URLs and link/title patterns come from a podcasts.PodcastProfile
+(default: Modern Wisdom).
 
 Episode list pages are mostly static HTML (requests + BeautifulSoup).
 Transcript pages are JS-rendered, so we use Playwright.
@@ -7,16 +10,18 @@ Transcript pages are JS-rendered, so we use Playwright.
 
 from __future__ import annotations
 
+import json
 import re
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Callable, Dict, List, Optional, Tuple
 
 import requests
 from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright, Browser, TimeoutError as PwTimeout
 
-import config
+import podcasts
+from podcasts import PodcastProfile
 
 # Default delay between transcript page loads (seconds)
 DEFAULT_SCRAPE_DELAY = 8
@@ -33,23 +38,15 @@ class EpisodeMeta:
     slug: str             # URL slug on podscripts
     url: str              # full podscripts URL
     description: str = ""
+    podcast: str = podcasts.DEFAULT_PODCAST   # profile id
 
 # ---------------------------------------------------------------------------
 # Episode listing
 # ---------------------------------------------------------------------------
 
-_EPISODE_LINK_RE = re.compile(
-    r"/podcasts/modern-wisdom/(\d+)-(.+)$"
-)
-
-_TITLE_RE = re.compile(
-    r"^#(\d+)\s*-\s*(.+?)\s*-\s*(.+)$"
-)
-
-
-def _parse_title(raw: str) -> tuple[int, str, str]:
+def _parse_title(raw: str, title_re: re.Pattern) -> tuple[int, str, str]:
     """Return (episode_number, guest, episode_title) from a raw link title."""
-    m = _TITLE_RE.match(raw.strip())
+    m = title_re.match(raw.strip())
     if m:
         return int(m.group(1)), m.group(2).strip(), m.group(3).strip()
     # Fallback: try to at least get the number
@@ -58,62 +55,82 @@ def _parse_title(raw: str) -> tuple[int, str, str]:
     return num, "", raw.strip()
 
 
+def _parse_listing_html(html: str, profile: PodcastProfile) -> List[EpisodeMeta]:
+    """Extract every episode link on one listing page (in page order)."""
+    soup = BeautifulSoup(html, "html.parser")
+    episodes: List[EpisodeMeta] = []
+    link_re = profile.link_re
+    title_re = profile.title_re
+
+    for link in soup.find_all("a", href=link_re):
+        href = link.get("href", "")
+        text = link.get_text(strip=True)
+        if not text or not href:
+            continue
+
+        ep_num, guest, title = _parse_title(text, title_re)
+        if ep_num == 0:
+            continue
+
+        slug_match = link_re.search(href)
+        slug = slug_match.group(0).split("/")[-1] if slug_match else ""
+
+        full_url = f"{profile.site_root}{href}" if href.startswith("/") else href
+
+        episodes.append(EpisodeMeta(
+            number=ep_num,
+            title=f"{guest} - {title}" if guest else title,
+            guest=guest,
+            slug=slug,
+            url=full_url,
+            podcast=profile.id,
+        ))
+
+    return episodes
+
+
+def _listing_page_url(profile: PodcastProfile, page_num: int) -> str:
+    url = profile.base_url
+    if page_num > 1:
+        url = f"{url}?page={page_num}"
+    return url
+
+
 def get_episode_list(
     max_pages: int = 200,
     progress_cb: Optional[Callable[[int, int], None]] = None,
+    profile: Optional[PodcastProfile] = None,
 ) -> List[EpisodeMeta]:
     """
-    Scrape the Modern Wisdom listing pages and return episode metadata.
+    Scrape a podcast's listing pages and return episode metadata.
 
     Args:
         max_pages: Upper bound on listing pages to fetch.
         progress_cb: Optional callback(page_num, episodes_found_so_far).
+        profile: Show to list (default: Modern Wisdom).
     """
+    profile = profile or podcasts.get_profile()
     episodes: List[EpisodeMeta] = []
     seen: set[int] = set()
 
     for page_num in range(1, max_pages + 1):
-        url = config.PODSCRIPTS_BASE_URL
-        if page_num > 1:
-            url = f"{url}?page={page_num}"
-
         try:
-            resp = requests.get(url, timeout=30)
+            resp = requests.get(_listing_page_url(profile, page_num), timeout=30)
         except requests.RequestException:
             break
         if resp.status_code != 200:
             break
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        links = soup.find_all("a", href=_EPISODE_LINK_RE)
-
-        if not links:
+        page_episodes = _parse_listing_html(resp.text, profile)
+        if not page_episodes:
             break
 
         found_new = False
-        for link in links:
-            href = link.get("href", "")
-            text = link.get_text(strip=True)
-            if not text or not href:
-                continue
-
-            ep_num, guest, title = _parse_title(text)
-            if ep_num == 0 or ep_num in seen:
+        for ep in page_episodes:
+            if ep.number in seen:
                 continue
-
-            slug_match = _EPISODE_LINK_RE.search(href)
-            slug = slug_match.group(0).split("/")[-1] if slug_match else ""
-
-            full_url = f"https://podscripts.co{href}" if href.startswith("/") else href
-
-            episodes.append(EpisodeMeta(
-                number=ep_num,
-                title=f"{guest} - {title}" if guest else title,
-                guest=guest,
-                slug=slug,
-                url=full_url,
-            ))
-            seen.add(ep_num)
+            episodes.append(ep)
+            seen.add(ep.number)
             found_new = True
 
         if progress_cb:
@@ -128,9 +145,106 @@ def get_episode_list(
     return episodes
 
 
-def get_episode_by_number(episode_number: int) -> Optional[EpisodeMeta]:
+# ---------------------------------------------------------------------------
+# Conditional listing refresh (watch mode)
+# ---------------------------------------------------------------------------
+
+def load_listing_cache(path: str) -> Dict[str, dict]:
+    """Load cached listing validators + parsed episodes, keyed by page URL."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_listing_cache(path: str, cache: Dict[str, dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+
+
+def fetch_listing_page(
+    session: requests.Session,
+    url: str,
+    cache: Dict[str, dict],
+    profile: PodcastProfile,
+) -> Tuple[List[EpisodeMeta], bool]:
+    """
+    Fetch one listing page with If-None-Match / If-Modified-Since.
+
+    Returns (episodes, changed).  On 304 the cached episodes are returned
+    without re-parsing; on a 200 the page is parsed and the cache entry for
+    url is replaced.  Raises requests.RequestException on network errors.
+    """
+    entry = cache.get(url, {})
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    resp = session.get(url, headers=headers, timeout=30)
+    if resp.status_code == 304 and "episodes" in entry:
+        return [EpisodeMeta(**e) for e in entry["episodes"]], False
+    resp.raise_for_status()
+
+    episodes = _parse_listing_html(resp.text, profile)
+    cache[url] = {
+        "etag": resp.headers.get("ETag", ""),
+        "last_modified": resp.headers.get("Last-Modified", ""),
+        "episodes": [asdict(e) for e in episodes],
+    }
+    return episodes, True
+
+
+def get_new_episodes(
+    known: set[int],
+    *,
+    cache_path: str,
+    max_pages: int = 200,
+    session: Optional[requests.Session] = None,
+    profile: Optional[PodcastProfile] = None,
+) -> List[EpisodeMeta]:
+    """
+    Return listed episodes whose numbers are not in known, newest first.
+
+    Listing pages are newest-first, so paging stops at the first page that
+    holds nothing new.  Every page is fetched conditionally, so a quiet
+    catalog costs a single 304 and no HTML parsing.
+    """
+    profile = profile or podcasts.get_profile()
+    session = session or requests.Session()
+    cache = load_listing_cache(cache_path)
+    new: Dict[int, EpisodeMeta] = {}
+
+    try:
+        for page_num in range(1, max_pages + 1):
+            page_episodes, _changed = fetch_listing_page(
+                session, _listing_page_url(profile, page_num), cache, profile,
+            )
+            if not page_episodes:
+                break
+
+            page_new = [e for e in page_episodes if e.number not in known and e.number not in new]
+            for ep in page_new:
+                new[ep.number] = ep
+
+            if not page_new:
+                break
+
+            time.sleep(1)  # polite delay between listing pages
+    finally:
+        save_listing_cache(cache_path, cache)
+
+    return sorted(new.values(), key=lambda e: e.number, reverse=True)
+
+
+def get_episode_by_number(
+    episode_number: int,
+    profile: Optional[PodcastProfile] = None,
+) -> Optional[EpisodeMeta]:
     """Find a single episode by number from the listing."""
-    for ep in get_episode_list():
+    for ep in get_episode_list(profile=profile):
         if ep.number == episode_number:
             return ep
     return None
@@ -187,6 +301,50 @@ def get_transcript(episode_url: str, headless: bool = True) -> str:
     return transcript_text
 
 
+class BrowserPool:
+    """
+    One Playwright browser shared by every batch in a run — including
+    batches for different shows — plus a single page-load throttle, so all
+    shows together stay within one polite request rate for the site.
+
+    The browser is launched lazily on first use.  Use as a context manager.
+    """
+
+    def __init__(self, *, headless: bool = True) -> None:
+        self.headless = headless
+        self._pw = None
+        self._browser: Optional[Browser] = None
+        self._last_load = 0.0
+
+    def browser(self) -> Browser:
+        if self._browser is None:
+            self._pw = sync_playwright().start()
+            self._browser = self._pw.chromium.launch(headless=self.headless)
+        return self._browser
+
+    def throttle(self, delay: float) -> None:
+        """Sleep until at least delay seconds have passed since the last page load."""
+        if self._last_load:
+            wait = self._last_load + delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        self._last_load = time.monotonic()
+
+    def close(self) -> None:
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            self._pw.stop()
+            self._pw = None
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
 def get_transcripts_batch(
     episodes: List[EpisodeMeta],
     *,
@@ -194,6 +352,7 @@ def get_transcripts_batch(
     delay: float = DEFAULT_SCRAPE_DELAY,
     on_success: Optional[Callable[[EpisodeMeta, str], None]] = None,
     on_error: Optional[Callable[[EpisodeMeta, Exception], None]] = None,
+    pool: Optional[BrowserPool] = None,
 ) -> Dict[int, str]:
     """
     Scrape transcripts for multiple episodes using a single browser instance.
@@ -204,37 +363,42 @@ def get_transcripts_batch(
         delay: Seconds to wait between page loads (rate limiting).
         on_success: Callback(episode, transcript) after each successful scrape.
         on_error: Callback(episode, exception) after each failed scrape.
+        pool: Shared BrowserPool to scrape with (and pace against); a
+            private one is opened and closed when omitted.
 
     Returns:
         Dict mapping episode number → transcript text (only successes).
     """
-    results: Dict[int, str] = {}
+    if pool is None:
+        with BrowserPool(headless=headless) as own_pool:
+            return get_transcripts_batch(
+                episodes,
+                delay=delay,
+                on_success=on_success,
+                on_error=on_error,
+                pool=own_pool,
+            )
 
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=headless)
-
-        for i, ep in enumerate(episodes):
-            try:
-                transcript = _scrape_single_page(browser, ep.url)
-
-                if not transcript or len(transcript) < 200:
-                    raise RuntimeError(
-                        "Transcript too short or empty — may require auth."
-                    )
+    results: Dict[int, str] = {}
 
-                results[ep.number] = transcript
-                if on_success:
-                    on_success(ep, transcript)
+    for ep in episodes:
+        # Rate-limit: wait between page loads (shared across batches)
+        pool.throttle(delay)
+        try:
+            transcript = _scrape_single_page(pool.browser(), ep.url)
 
-            except Exception as exc:
-                if on_error:
-                    on_error(ep, exc)
+            if not transcript or len(transcript) < 200:
+                raise RuntimeError(
+                    "Transcript too short or empty — may require auth."
+                )
 
-            # Rate-limit: wait between episodes (skip after last one)
-            if i < len(episodes) - 1:
-                time.sleep(delay)
+            results[ep.number] = transcript
+            if on_success:
+                on_success(ep, transcript)
 
-        browser.close()
+        except Exception as exc:
+            if on_error:
+                on_error(ep, exc)
 
     return results
 
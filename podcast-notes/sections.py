@@ -0,0 +1,136 @@
+"""
+Required-section checks for generated notes.
+
+The required "## " headings (and the guidance line under each) are read
+from whatever the note was generated against — SYSTEM_PROMPT or an episode
+template — so adding a heading there makes it required everywhere.
+
+A section counts as missing when its heading is absent and as empty when
+its body is blank or still holds the spec's guidance text.  splice_section()
+puts a regenerated body back in place without touching the rest of the note.
+Headings are matched on their words only, so "## 🧠 Key Insights" and
+"## Key insights" are the same section.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+_HEADING_RE = re.compile(r"^## +(.+?)\s*$", re.MULTILINE)
+# The transcript block always ends a note; sections are only looked for above it
+_TRANSCRIPT_RE = re.compile(r"^TRANSCRIPT:", re.MULTILINE)
+_PLACEHOLDER_RE = re.compile(r"^\[[^\]]*\]$")
+
+
+@dataclass(frozen=True)
+class Section:
+    heading: str    # heading text as written in the spec, without "## "
+    guidance: str   # what the spec asks for under it
+
+    @property
+    def key(self) -> str:
+        return heading_key(self.heading)
+
+
+def heading_key(heading: str) -> str:
+    """Case-, emoji- and punctuation-insensitive form of a heading."""
+    words = re.findall(r"[^\W_]+", heading.casefold())
+    return " ".join(words)
+
+
+def _split(note: str) -> Tuple[str, List[Tuple[str, str]], str]:
+    """
+    Split note into (head, [(heading, chunk), ...], tail).  Each chunk runs
+    from its "## " line up to the next one; tail is the TRANSCRIPT block.
+    Joining head + chunks + tail gives back the note unchanged.
+    """
+    m = _TRANSCRIPT_RE.search(note)
+    body, tail = (note[: m.start()], note[m.start():]) if m else (note, "")
+    starts = [h for h in _HEADING_RE.finditer(body)]
+    if not starts:
+        return body, [], tail
+    head = body[: starts[0].start()]
+    chunks = []
+    for i, h in enumerate(starts):
+        end = starts[i + 1].start() if i + 1 < len(starts) else len(body)
+        chunks.append((h.group(1), body[h.start():end]))
+    return head, chunks, tail
+
+
+def _chunk_body(chunk: str) -> str:
+    return chunk.split("\n", 1)[1].strip() if "\n" in chunk else ""
+
+
+def required_sections(spec: str) -> List[Section]:
+    """The "## " sections a prompt or template asks for, in order."""
+    _head, chunks, _tail = _split(spec)
+    return [Section(heading, _chunk_body(chunk)) for heading, chunk in chunks]
+
+
+def section_bodies(note: str) -> dict[str, str]:
+    """{heading_key: body} for every "## " section in note."""
+    _head, chunks, _tail = _split(note)
+    bodies: dict[str, str] = {}
+    for heading, chunk in chunks:
+        bodies.setdefault(heading_key(heading), _chunk_body(chunk))
+    return bodies
+
+
+def _is_empty(body: str, section: Section) -> bool:
+    text = body.strip()
+    return not text or text == section.guidance or bool(_PLACEHOLDER_RE.match(text))
+
+
+def find_problems(note: str, required: List[Section]) -> List[Section]:
+    """Required sections that are missing from note or left empty."""
+    bodies = section_bodies(note)
+    return [s for s in required if s.key not in bodies or _is_empty(bodies[s.key], s)]
+
+
+def splice_section(note: str, section: Section, body: str, required: List[Section]) -> str:
+    """
+    Return note with section's body replaced by body.  A missing section is
+    inserted after the nearest earlier required section the note has (else
+    before the nearest later one, else above the TRANSCRIPT block).
+    """
+    head, chunks, tail = _split(note)
+    new_chunk = f"## {section.heading}\n{body.strip()}\n\n"
+    keys = [heading_key(h) for h, _c in chunks]
+
+    if section.key in keys:
+        i = keys.index(section.key)
+        chunks[i] = (chunks[i][0], f"## {chunks[i][0]}\n{body.strip()}\n\n")
+    else:
+        order = [s.key for s in required]
+        pos = order.index(section.key) if section.key in order else len(order)
+        insert_at: Optional[int] = None
+        for earlier in reversed(order[:pos]):
+            if earlier in keys:
+                insert_at = keys.index(earlier) + 1
+                break
+        if insert_at is None:
+            later = [keys.index(k) for k in order[pos + 1:] if k in keys]
+            insert_at = min(later) if later else len(chunks)
+        if insert_at > 0 and not chunks[insert_at - 1][1].endswith("\n\n"):
+            prev_heading, prev_chunk = chunks[insert_at - 1]
+            chunks[insert_at - 1] = (prev_heading, prev_chunk.rstrip("\n") + "\n\n")
+        elif insert_at == 0 and head and not head.endswith("\n\n"):
+            head = head.rstrip("\n") + "\n\n"
+        chunks.insert(insert_at, (section.heading, new_chunk))
+
+    return head + "".join(chunk for _h, chunk in chunks) + tail
+
+
+def extract_sections(reply: str) -> dict[str, str]:
+    """{heading_key: body} for the sections in a repair reply."""
+    return {k: v for k, v in section_bodies(reply.strip() + "\n").items() if v}
+
+
+def without_transcript(note: str) -> str:
+    """note with its TRANSCRIPT block reduced to the template placeholder."""
+    m = _TRANSCRIPT_RE.search(note)
+    if not m:
+        return note
+    return note[: m.start()] + "TRANSCRIPT:\n[PASTE TRANSCRIPT HERE]"
@@ -0,0 +1,192 @@
+"""
+Offline cross-episode similarity for "related episodes" suggestions.
+
+No API calls: each staged transcript becomes a hashed TF-IDF vector.
+Terms are hashed (crc32, stable across runs) into a 2^20-bucket document-
+frequency table for IDF weighting, then signed-projected into DIMS
+dimensions and L2-normalised.  All vectors live in one compact float32
+NumPy matrix, so top-k neighbours for every episode come from a handful of
+batched matrix multiplies instead of pairwise text comparisons.
+
+File: similarity_index.npz (lives in the podcast-notes directory).
+
+Updates are incremental: new transcripts are vectorised with the current
+IDF and appended.  Older rows keep the IDF they were built with until the
+corpus has grown by REBUILD_GROWTH since the last full build, at which
+point every row is recomputed.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import config
+
+DIMS = 1024
+_DF_BITS = 20
+_DF_SIZE = 1 << _DF_BITS
+REBUILD_GROWTH = 0.25
+
+_TOKEN_RE = re.compile(r"[a-z][a-z']{2,}")
+
+# Conversational filler that dominates transcripts but says nothing about topic
+_STOP_WORDS = frozenset("""
+about above after again against all also and any are aren't because been before
+being below between both but can can't cannot could couldn't did didn't does
+doesn't doing don't down during each even every few for from further get gets
+getting go goes going gonna got had hadn't has hasn't have haven't having he'd
+he'll he's her here here's hers herself him himself his how how's i'd i'll i'm
+i've into isn't it's its itself just know kind let's like lot mean more most
+much must mustn't myself not now off once one only other ought our ours
+ourselves out over own really right said same say says see shan't she she'd
+she'll she's should shouldn't so some something such than that that's the their
+theirs them themselves then there there's these they they'd they'll they're
+they've thing things think this those through too under until very wanna want
+was wasn't way we'd we'll we're we've well were weren't what what's when when's
+where where's which while who who's whom why why's will with won't would
+wouldn't yeah yes you you'd you'll you're you've your yours yourself yourselves
+""".split())
+
+
+def _term_features(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (crc32 hashes, sublinear tf) for the distinct terms in text."""
+    counts = Counter(t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP_WORDS)
+    if not counts:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.float32)
+    hashes = np.fromiter((zlib.crc32(t.encode()) for t in counts), dtype=np.uint32, count=len(counts))
+    tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    return hashes, tf
+
+
+def _project(hashes: np.ndarray, tf: np.ndarray, idf: np.ndarray) -> np.ndarray:
+    """Weight by IDF, signed-hash into DIMS dimensions and L2-normalise."""
+    vec = np.zeros(DIMS, dtype=np.float32)
+    if hashes.size:
+        buckets = hashes & (_DF_SIZE - 1)
+        upper = hashes >> _DF_BITS
+        dims = upper % DIMS
+        signs = np.where(upper & 0x800, 1.0, -1.0).astype(np.float32)
+        vec = np.bincount(dims, weights=tf * idf[buckets] * signs, minlength=DIMS).astype(np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+class SimilarityIndex:
+    """Episode vectors + the document-frequency table that weights them."""
+
+    def __init__(self, path: str = config.SIMILARITY_INDEX_PATH) -> None:
+        self.path = path
+        self.episodes = np.zeros(0, dtype=np.int32)
+        self.vectors = np.zeros((0, DIMS), dtype=np.float32)
+        self.df = np.zeros(_DF_SIZE, dtype=np.int32)
+        self.built_at = 0  # corpus size at the last full build
+        self._load()
+
+    def _load(self) -> None:
+        if not Path(self.path).exists():
+            return
+        with np.load(self.path) as data:
+            if data["vectors"].shape[1] != DIMS:
+                return
+            self.episodes = data["episodes"]
+            self.vectors = data["vectors"]
+            self.df = data["df"]
+            self.built_at = int(data["built_at"])
+
+    def save(self) -> None:
+        with open(self.path, "wb") as f:
+            np.savez_compressed(
+                f,
+                episodes=self.episodes,
+                vectors=self.vectors,
+                df=self.df,
+                built_at=np.int64(self.built_at),
+            )
+
+    def _idf(self) -> np.ndarray:
+        n = max(len(self.episodes), 1)
+        return (np.log((1 + n) / (1 + self.df)) + 1.0).astype(np.float32)
+
+    def update(
+        self,
+        episode_numbers: Iterable[int],
+        load_text: Callable[[int], str],
+        *,
+        rebuild: bool = False,
+    ) -> Tuple[int, bool]:
+        """
+        Sync the index with episode_numbers (the full staged corpus): new
+        episodes are vectorised and appended.  Rebuilds every row when
+        asked to or once the corpus outgrows the last build's IDF.
+        Returns (episodes_added, rebuilt).
+        """
+        wanted = sorted(set(episode_numbers))
+        known = set(self.episodes.tolist())
+        new_eps = [n for n in wanted if n not in known]
+
+        grown = len(known) + len(new_eps)
+        rebuild = rebuild or grown > self.built_at * (1 + REBUILD_GROWTH)
+
+        eps = wanted if rebuild else new_eps
+        features = [_term_features(load_text(n)) for n in eps]
+        if rebuild:
+            self.df = np.zeros(_DF_SIZE, dtype=np.int32)
+
+        for hashes, _tf in features:
+            np.add.at(self.df, np.unique(hashes & (_DF_SIZE - 1)), 1)
+
+        if rebuild:
+            self.episodes = np.asarray(eps, dtype=np.int32)
+            idf = self._idf()
+            self.vectors = np.vstack([_project(h, tf, idf) for h, tf in features]) if features \
+                else np.zeros((0, DIMS), dtype=np.float32)
+            self.built_at = len(eps)
+        elif eps:
+            self.episodes = np.concatenate([self.episodes, np.asarray(eps, dtype=np.int32)])
+            idf = self._idf()
+            self.vectors = np.vstack([self.vectors] + [_project(h, tf, idf)[None, :] for h, tf in features])
+
+        return len(new_eps), rebuild
+
+    def top_k(
+        self,
+        k: int = 5,
+        episodes: Optional[Iterable[int]] = None,
+        batch_size: int = 512,
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        """
+        Return {episode: [(neighbour, cosine), ...]} for the given episodes
+        (default: all), computed in batches of row × matrix products.
+        """
+        n = len(self.episodes)
+        k = min(k, n - 1)
+        if k <= 0:
+            return {}
+
+        if episodes is None:
+            rows = np.arange(n)
+        else:
+            pos = {int(e): i for i, e in enumerate(self.episodes)}
+            rows = np.array([pos[e] for e in episodes if e in pos], dtype=np.int64)
+
+        result: Dict[int, List[Tuple[int, float]]] = {}
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            sims = self.vectors[batch] @ self.vectors.T
+            sims[np.arange(len(batch)), batch] = -np.inf
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_sims, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_sims = np.take_along_axis(top_sims, order, axis=1)
+            for row, idxs, scores in zip(batch, top, top_sims):
+                result[int(self.episodes[row])] = [
+                    (int(self.episodes[j]), float(s)) for j, s in zip(idxs, scores)
+                ]
+        return result
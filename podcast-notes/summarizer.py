@@ -12,25 +12,46 @@ import datetime
 import time
 from collections import deque
 from threading import Lock
+from typing import Sequence
 
+import httpx
 import requests
 
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 import config
+import podcasts
+import sections
+import tokencount
+from podcasts import PodcastProfile
 from scraper import EpisodeMeta
 
+# Hard ceiling on completion length sent with every request
+MAX_COMPLETION_TOKENS = 8192
+
 
 # ---------------------------------------------------------------------------
 # Rate limiter
 # ---------------------------------------------------------------------------
 
+# Output reservation: until OUTPUT_WARMUP completions have been seen the full
+# max_completion_tokens is reserved; after that, the OUTPUT_PERCENTILE of the
+# last OUTPUT_HISTORY completion sizes plus OUTPUT_HEADROOM.
+OUTPUT_HISTORY = 50
+OUTPUT_WARMUP = 3
+OUTPUT_PERCENTILE = 0.95
+OUTPUT_HEADROOM = 1.15
+
+
 class RateLimiter:
     """
     Sliding-window rate limiter that enforces:
     - requests per minute (RPM)
     - tokens per minute (TPM)
     - optional hard cap on total tokens for the entire run
+
+    It also keeps reserved-vs-actual token totals for completed requests
+    (see scheduling_summary()), so admission estimates can be checked.
     """
 
     def __init__(
@@ -46,8 +67,19 @@ class RateLimiter:
         self._lock = Lock()
         self._request_times: deque[float] = deque()
         self._token_events: deque[tuple[float, int]] = deque()
+        # Admitted-but-unfinished requests, so concurrent workers don't all
+        # pass the window check before any of them has recorded usage.
+        self._in_flight: int = 0
+        self._reserved_tokens: int = 0
         self.total_tokens_used: int = 0
 
+        self._completion_sizes: deque[int] = deque(maxlen=OUTPUT_HISTORY)
+        self.requests_completed: int = 0
+        self.reserved_tokens_total: int = 0
+        self.actual_tokens_total: int = 0
+        self.reservation_error_total: int = 0  # sum of |reserved - actual|
+        self.under_reserved: int = 0           # requests that used more than reserved
+
     def _purge_old(self, now: float) -> None:
         cutoff = now - 60.0
         while self._request_times and self._request_times[0] < cutoff:
@@ -67,21 +99,31 @@ class RateLimiter:
                     )
 
     def wait_if_needed(self, estimated_tokens: int = 0) -> None:
-        """Block until RPM and TPM windows allow the next request."""
+        """
+        Block until RPM and TPM windows allow the next request, then reserve
+        estimated_tokens for it.  Every call must be paired with record() or
+        release() so the reservation is returned.
+        """
         while True:
             with self._lock:
                 now = time.monotonic()
                 self._purge_old(now)
 
-                rpm_ok = (self.rpm_limit == 0) or (len(self._request_times) < self.rpm_limit)
-                current_tpm = sum(t for _, t in self._token_events)
+                rpm_used = len(self._request_times) + self._in_flight
+                rpm_ok = (self.rpm_limit == 0) or (rpm_used < self.rpm_limit)
+                current_tpm = sum(t for _, t in self._token_events) + self._reserved_tokens
                 tpm_ok = (self.tpm_limit == 0) or (current_tpm + estimated_tokens <= self.tpm_limit)
+                # A lone request larger than the whole TPM window must still run
+                if not tpm_ok and current_tpm == 0:
+                    tpm_ok = True
 
                 if rpm_ok and tpm_ok:
+                    self._in_flight += 1
+                    self._reserved_tokens += estimated_tokens
                     break
 
-            oldest_req = self._request_times[0] if self._request_times else None
-            oldest_tok = self._token_events[0][0] if self._token_events else None
+                oldest_req = self._request_times[0] if self._request_times else None
+                oldest_tok = self._token_events[0][0] if self._token_events else None
 
             candidates = [t for t in [oldest_req, oldest_tok] if t is not None]
             if candidates:
@@ -93,14 +135,69 @@ class RateLimiter:
             else:
                 time.sleep(1.0)
 
-    def record(self, tokens_used: int) -> None:
-        """Record that a request just completed using tokens_used tokens."""
+    def output_reservation(self, max_completion_tokens: int) -> int:
+        """Tokens to reserve for a reply, based on recently observed completions."""
+        with self._lock:
+            sizes = sorted(self._completion_sizes)
+        if len(sizes) < OUTPUT_WARMUP:
+            return max_completion_tokens
+        observed = sizes[int(OUTPUT_PERCENTILE * (len(sizes) - 1))]
+        return min(max_completion_tokens, int(observed * OUTPUT_HEADROOM))
+
+    def record(
+        self,
+        tokens_used: int,
+        reserved_tokens: int = 0,
+        completion_tokens: int | None = None,
+    ) -> None:
+        """
+        Record that a request just completed using tokens_used tokens and
+        return the reserved_tokens that wait_if_needed() set aside for it.
+        completion_tokens feeds the adaptive output reservation.
+        """
         with self._lock:
             now = time.monotonic()
+            self._release_locked(reserved_tokens)
             self._request_times.append(now)
             self._token_events.append((now, tokens_used))
             self.total_tokens_used += tokens_used
 
+            if completion_tokens is not None:
+                self._completion_sizes.append(completion_tokens)
+            if reserved_tokens:
+                self.requests_completed += 1
+                self.reserved_tokens_total += reserved_tokens
+                self.actual_tokens_total += tokens_used
+                self.reservation_error_total += abs(reserved_tokens - tokens_used)
+                if tokens_used > reserved_tokens:
+                    self.under_reserved += 1
+
+    def scheduling_summary(self) -> str:
+        """One-line reserved-vs-actual report for the requests recorded so far."""
+        with self._lock:
+            n = self.requests_completed
+            if not n:
+                return "Token reservations: no completed requests."
+            reserved = self.reserved_tokens_total
+            actual = self.actual_tokens_total
+            mean_err = self.reservation_error_total / n
+            under = self.under_reserved
+        return (
+            f"Token reservations: {n} request(s), {reserved:,} reserved vs "
+            f"{actual:,} used ({reserved / actual if actual else 0:.2f}x), "
+            f"mean |reserved - actual| {mean_err:,.0f} tokens/request, "
+            f"{under} under-reserved"
+        )
+
+    def release(self, reserved_tokens: int) -> None:
+        """Return a reservation for a request that failed before completing."""
+        with self._lock:
+            self._release_locked(reserved_tokens)
+
+    def _release_locked(self, reserved_tokens: int) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        self._reserved_tokens = max(0, self._reserved_tokens - reserved_tokens)
+
 
 _default_limiter: RateLimiter | None = None
 
@@ -259,10 +356,27 @@ Concise, lowercase, reusable tags.
 """
 
 
-def generate_notes(transcript: str, meta: EpisodeMeta) -> str:
+def system_prompt(profile: PodcastProfile | None = None) -> str:
+    """SYSTEM_PROMPT with the show name and host swapped in for profile."""
+    profile = profile or podcasts.get_profile()
+    if profile.is_default:
+        return SYSTEM_PROMPT
+    return SYSTEM_PROMPT.replace("Modern Wisdom", profile.name).replace("Chris Williamson", profile.host)
+
+
+# ---------------------------------------------------------------------------
+# Shared OpenAI client
+# ---------------------------------------------------------------------------
+
+_client: OpenAI | None = None
+_client_lock = Lock()
+
+
+def create_client() -> OpenAI:
     """
-    Call the configured LLM with the transcript and return the filled
-    Obsidian markdown note.
+    Build a new OpenAI client from config with a tuned HTTP connection pool:
+    keep-alive connections sized to OPENAI_MAX_CONNECTIONS and explicit
+    connect / read timeouts.  Raises if no API key is configured.
     """
     if not config.OPENAI_API_KEY:
         raise RuntimeError(
@@ -270,11 +384,59 @@ def generate_notes(transcript: str, meta: EpisodeMeta) -> str:
             "Copy .env.example to .env and fill in your key."
         )
 
-    client = OpenAI(
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=config.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=config.OPENAI_MAX_CONNECTIONS,
+            keepalive_expiry=config.OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            config.OPENAI_READ_TIMEOUT,
+            connect=config.OPENAI_CONNECT_TIMEOUT,
+        ),
+    )
+    return OpenAI(
         api_key=config.OPENAI_API_KEY,
         base_url=config.OPENAI_BASE_URL,
+        http_client=http_client,
     )
 
+
+def get_client() -> OpenAI:
+    """
+    Return the module-level OpenAI client, creating it on first use.
+
+    Every request in the process reuses its connection pool, so only the
+    first call to a host pays for the TCP + TLS handshake.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+    return _client
+
+
+def reset_client() -> None:
+    """Close and drop the module-level client (e.g. after changing config)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+def generate_notes(
+    transcript: str,
+    meta: EpisodeMeta,
+    profile: PodcastProfile | None = None,
+) -> str:
+    """
+    Call the configured LLM with the transcript and return the filled
+    Obsidian markdown note.
+    """
+    client = get_client()
+
     user_message = (
         f"Episode Number: {meta.number}\n"
         f"Guest: {meta.guest}\n"
@@ -286,11 +448,11 @@ def generate_notes(transcript: str, meta: EpisodeMeta) -> str:
     response = client.chat.completions.create(
         model=config.OPENAI_MODEL,
         messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "system", "content": system_prompt(profile)},
             {"role": "user", "content": user_message},
         ],
         temperature=0.3,
-        max_completion_tokens=8192,
+        max_completion_tokens=MAX_COMPLETION_TOKENS,
     )
 
     content = response.choices[0].message.content
@@ -300,28 +462,35 @@ def generate_notes(transcript: str, meta: EpisodeMeta) -> str:
     return content.strip()
 
 
-def generate_notes_with_limit(
-    transcript: str,
-    meta: EpisodeMeta,
+Messages = Sequence[tuple[str, Sequence[str]]]
+
+
+def _chat_with_limit(
+    client: OpenAI,
+    messages: Messages,
     *,
-    limiter: RateLimiter | None = None,
-    request_delay: float | None = None,
+    limiter: RateLimiter,
+    request_delay: float,
+    max_completion_tokens: int = MAX_COMPLETION_TOKENS,
+    adaptive_output: bool = True,
 ) -> str:
     """
-    Rate-limit-aware version of generate_notes.
-
-    Uses the module-level default RateLimiter (configured from config.*) unless
-    a custom limiter is passed.  Also enforces a minimum per-request delay.
+    Send one chat completion through the limiter: budget + token-cap checks,
+    RPM/TPM admission, 429 retries with exponential backoff, usage recording.
+
+    messages is a list of (role, parts); each message's content is the
+    concatenation of its parts.  Parts are token-counted (and cached)
+    separately so the transcript is tokenized once however it is wrapped.
+    The reservation is the exact prompt size plus the limiter's adaptive
+    estimate of the reply, or the full max_completion_tokens for requests
+    (like section repairs) whose size says nothing about a full note.
     """
-    if limiter is None:
-        limiter = get_default_limiter()
-
-    if request_delay is None:
-        request_delay = config.OPENAI_REQUEST_DELAY
-
-    # Rough token estimate: system prompt + user message chars / 4, plus max output
-    estimated_input = (len(SYSTEM_PROMPT) + len(transcript) + 256) // 4
-    estimated_total = estimated_input + 8192
+    estimated_input = tokencount.count_chat_tokens(parts for _role, parts in messages)
+    if adaptive_output:
+        estimated_output = limiter.output_reservation(max_completion_tokens)
+    else:
+        estimated_output = max_completion_tokens
+    estimated_total = estimated_input + estimated_output
 
     # Monthly dollar budget check (fetches live spend from Costs API)
     check_monthly_budget()
@@ -332,52 +501,41 @@ def generate_notes_with_limit(
     # Wait for RPM / TPM window
     limiter.wait_if_needed(estimated_total)
 
-    if not config.OPENAI_API_KEY:
-        raise RuntimeError(
-            "OPENAI_API_KEY is not set. "
-            "Copy .env.example to .env and fill in your key."
-        )
-
-    client = OpenAI(
-        api_key=config.OPENAI_API_KEY,
-        base_url=config.OPENAI_BASE_URL,
-    )
-
-    user_message = (
-        f"Episode Number: {meta.number}\n"
-        f"Guest: {meta.guest}\n"
-        f"Episode Title: {meta.title}\n"
-        f"Transcript Source: {meta.url} (via Podscripts)\n\n"
-        f"TRANSCRIPT:\n{transcript}"
-    )
-
     max_retries = 6
     backoff = 5.0
     response = None
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.completions.create(
-                model=config.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                ],
-                temperature=0.3,
-                max_completion_tokens=8192,
-            )
-            break
-        except Exception as exc:
-            err_str = str(exc)
-            is_rate_limit = "429" in err_str or "rate_limit_exceeded" in err_str or "Rate limit" in err_str
-            if is_rate_limit and attempt < max_retries - 1:
-                wait = backoff * (2 ** attempt)
-                print(f"\n    ⏳ 429 rate limit — retrying in {wait:.0f}s (attempt {attempt + 1}/{max_retries}) …", flush=True)
-                time.sleep(wait)
-                continue
-            raise
-
-    actual_tokens = response.usage.total_tokens if response.usage else estimated_total
-    limiter.record(actual_tokens)
+    try:
+        for attempt in range(max_retries):
+            try:
+                response = client.chat.completions.create(
+                    model=config.OPENAI_MODEL,
+                    messages=[
+                        {"role": role, "content": "".join(parts)}
+                        for role, parts in messages
+                    ],
+                    temperature=0.3,
+                    max_completion_tokens=max_completion_tokens,
+                )
+                break
+            except Exception as exc:
+                err_str = str(exc)
+                is_rate_limit = "429" in err_str or "rate_limit_exceeded" in err_str or "Rate limit" in err_str
+                if is_rate_limit and attempt < max_retries - 1:
+                    wait = backoff * (2 ** attempt)
+                    print(f"\n    ⏳ 429 rate limit — retrying in {wait:.0f}s (attempt {attempt + 1}/{max_retries}) …", flush=True)
+                    time.sleep(wait)
+                    continue
+                raise
+    except BaseException:
+        limiter.release(estimated_total)
+        raise
+
+    usage = response.usage
+    if usage:
+        completion = usage.completion_tokens if adaptive_output else None
+        limiter.record(usage.total_tokens, estimated_total, completion)
+    else:
+        limiter.record(estimated_total, estimated_total)
 
     if request_delay > 0:
         time.sleep(request_delay)
@@ -389,24 +547,136 @@ def generate_notes_with_limit(
     return content.strip()
 
 
-def generate_notes_from_template(
+# ---------------------------------------------------------------------------
+# Section repair
+# ---------------------------------------------------------------------------
+
+# Reply budget per regenerated section, and follow-up rounds per note
+REPAIR_TOKENS_PER_SECTION = 1024
+REPAIR_ATTEMPTS = 2
+
+
+def repair_sections(
+    note: str,
     *,
+    spec: str,
+    messages: Messages,
+    limiter: RateLimiter,
+    request_delay: float,
+    client: OpenAI,
+) -> tuple[str, list[str]]:
+    """
+    Regenerate the sections of note that spec requires but that are missing
+    or empty, and splice them in.  Returns (note, repaired headings).
+
+    Each follow-up replays messages (the request that produced the note)
+    unchanged, then the note as the assistant turn, then a short request for
+    just the problem sections.  The identical prefix lets the provider's
+    prompt cache serve the transcript, and the reply is only a few hundred
+    tokens, so this is far cheaper and faster than regenerating the note.
+
+    Repair is best effort: if a follow-up call fails (rate limit, token cap,
+    API error) a warning is printed and the note is returned as it stands.
+    """
+    required = sections.required_sections(spec)
+    repaired: list[str] = []
+    for _attempt in range(REPAIR_ATTEMPTS):
+        problems = sections.find_problems(note, required)
+        if not problems:
+            break
+        wanted = "\n\n".join(f"## {s.heading}\n{s.guidance}".rstrip() for s in problems)
+        request = (
+            "The note above is missing these sections, or left them empty:\n\n"
+            f"{wanted}\n\n"
+            "Write ONLY these sections, in this order, each starting with its exact "
+            "heading line. Base them on the transcript and keep them consistent with "
+            "the rest of the note. No other text, no code fences."
+        )
+        try:
+            reply = _chat_with_limit(
+                client,
+                [*messages, ("assistant", [sections.without_transcript(note)]), ("user", [request])],
+                limiter=limiter,
+                request_delay=request_delay,
+                max_completion_tokens=min(MAX_COMPLETION_TOKENS, REPAIR_TOKENS_PER_SECTION * len(problems)),
+                adaptive_output=False,
+            )
+        except Exception as exc:
+            # Best effort: never lose the (already paid for) note over a repair
+            print(f"    ⚠️  Section repair failed, keeping the note as generated: {exc}", flush=True)
+            break
+        found = sections.extract_sections(reply)
+        for section in problems:
+            body = found.get(section.key)
+            if body:
+                note = sections.splice_section(note, section, body, required)
+                repaired.append(section.heading)
+    return note, repaired
+
+
+def _report_repair(meta: EpisodeMeta, note: str, spec: str, repaired: list[str]) -> None:
+    if repaired:
+        print(f"    🩹 #{meta.number}: regenerated {', '.join(repaired)}", flush=True)
+    still = sections.find_problems(note, sections.required_sections(spec))
+    if still:
+        print(f"    ⚠️  #{meta.number}: still missing {', '.join(s.heading for s in still)}", flush=True)
+
+
+def generate_notes_with_limit(
     transcript: str,
     meta: EpisodeMeta,
-    template_markdown: str,
-    created_date: str,
+    *,
+    limiter: RateLimiter | None = None,
+    request_delay: float | None = None,
+    client: OpenAI | None = None,
+    profile: PodcastProfile | None = None,
+    repair: bool = True,
 ) -> str:
-    if not config.OPENAI_API_KEY:
-        raise RuntimeError(
-            "OPENAI_API_KEY is not set. "
-            "Copy .env.example to .env and fill in your key."
-        )
+    """
+    Rate-limit-aware version of generate_notes.
 
-    client = OpenAI(
-        api_key=config.OPENAI_API_KEY,
-        base_url=config.OPENAI_BASE_URL,
+    Uses the module-level default RateLimiter (configured from config.*) unless
+    a custom limiter is passed.  Also enforces a minimum per-request delay.
+    Uses the shared module-level client unless one is passed.  Sections of
+    SYSTEM_PROMPT's structure that come back missing or empty are regenerated
+    with repair_sections() unless repair is False.
+    """
+    if limiter is None:
+        limiter = get_default_limiter()
+
+    if request_delay is None:
+        request_delay = config.OPENAI_REQUEST_DELAY
+
+    if client is None:
+        client = get_client()
+
+    header = (
+        f"Episode Number: {meta.number}\n"
+        f"Guest: {meta.guest}\n"
+        f"Episode Title: {meta.title}\n"
+        f"Transcript Source: {meta.url} (via Podscripts)\n\n"
+        "TRANSCRIPT:\n"
     )
+    system = system_prompt(profile)
+    messages = [("system", [system]), ("user", [header, transcript])]
+
+    note = _chat_with_limit(client, messages, limiter=limiter, request_delay=request_delay)
+    if repair:
+        note, repaired = repair_sections(
+            note, spec=system, messages=messages,
+            limiter=limiter, request_delay=request_delay, client=client,
+        )
+        _report_repair(meta, note, system, repaired)
+    return note
+
 
+def _template_messages(
+    transcript: str,
+    meta: EpisodeMeta,
+    template_markdown: str,
+    created_date: str,
+    profile: PodcastProfile | None,
+) -> Messages:
     episode_title = meta.title
     if meta.guest and episode_title.startswith(meta.guest + " - "):
         episode_title = episode_title[len(meta.guest) + 3 :]
@@ -417,7 +687,7 @@ def generate_notes_from_template(
         .strip()
     )
 
-    user_message = (
+    instructions = (
         "Fill in the following Obsidian note template using the transcript and metadata.\n\n"
         "RULES:\n"
         "- Return ONLY the final Obsidian markdown note (no code fences, no extra commentary).\n"
@@ -434,21 +704,79 @@ def generate_notes_from_template(
         "TEMPLATE:\n"
         f"{template_prefilled}\n\n"
         "TRANSCRIPT:\n"
-        f"{transcript}"
     )
+    return [("system", [system_prompt(profile)]), ("user", [instructions, transcript])]
 
-    response = client.chat.completions.create(
-        model=config.OPENAI_MODEL,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_message},
-        ],
-        temperature=0.3,
-        max_completion_tokens=8192,
-    )
 
-    content = response.choices[0].message.content
-    if not content:
-        raise RuntimeError("LLM returned an empty response.")
+def generate_notes_from_template(
+    *,
+    transcript: str,
+    meta: EpisodeMeta,
+    template_markdown: str,
+    created_date: str,
+    limiter: RateLimiter | None = None,
+    request_delay: float | None = None,
+    client: OpenAI | None = None,
+    profile: PodcastProfile | None = None,
+    repair: bool = True,
+) -> str:
+    """
+    Fill the episode template for one transcript.
 
-    return content.strip()
+    Goes through the same limiter path as generate_notes_with_limit, so it is
+    safe to call from several worker threads sharing one limiter and client.
+    Template sections that come back missing or empty are regenerated with
+    repair_sections() unless repair is False.
+    """
+    if limiter is None:
+        limiter = get_default_limiter()
+
+    if request_delay is None:
+        request_delay = config.OPENAI_REQUEST_DELAY
+
+    if client is None:
+        client = get_client()
+
+    messages = _template_messages(transcript, meta, template_markdown, created_date, profile)
+    note = _chat_with_limit(client, messages, limiter=limiter, request_delay=request_delay)
+    if repair:
+        note, repaired = repair_sections(
+            note, spec=template_markdown, messages=messages,
+            limiter=limiter, request_delay=request_delay, client=client,
+        )
+        _report_repair(meta, note, template_markdown, repaired)
+    return note
+
+
+def repair_note_from_template(
+    note: str,
+    *,
+    transcript: str,
+    meta: EpisodeMeta,
+    template_markdown: str,
+    created_date: str,
+    limiter: RateLimiter | None = None,
+    request_delay: float | None = None,
+    client: OpenAI | None = None,
+    profile: PodcastProfile | None = None,
+) -> str:
+    """
+    Repair an already generated template note in place of regenerating it:
+    only its missing or empty sections are requested.
+    """
+    if limiter is None:
+        limiter = get_default_limiter()
+
+    if request_delay is None:
+        request_delay = config.OPENAI_REQUEST_DELAY
+
+    if client is None:
+        client = get_client()
+
+    messages = _template_messages(transcript, meta, template_markdown, created_date, profile)
+    note, repaired = repair_sections(
+        note, spec=template_markdown, messages=messages,
+        limiter=limiter, request_delay=request_delay, client=client,
+    )
+    _report_repair(meta, note, template_markdown, repaired)
+    return note
@@ -0,0 +1,98 @@
+"""
+Model-aware token counting for request admission control.
+
+Uses tiktoken with the encoding of config.OPENAI_MODEL (o200k_base for
+models tiktoken doesn't know, e.g. local servers behind OPENAI_BASE_URL).
+If tiktoken is missing or its encoding file can't be loaded (offline
+first run), falls back to a chars / 4 estimate and says so once.
+
+Counts are cached by content hash, so a transcript that is sent several
+times (retries, section repairs, re-runs of generate-processed) is only
+tokenized once per process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Iterable, Optional
+
+import config
+
+# Per-message framing the chat format adds around each message's content
+# (role + separators), plus the tokens that prime the assistant reply.
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+_FALLBACK_ENCODING = "o200k_base"
+_CACHE_SIZE = 1024
+
+_encoders: Dict[str, Optional[Callable[[str], list]]] = {}
+_encoders_lock = Lock()
+_cache: "OrderedDict[tuple[str, str], int]" = OrderedDict()
+_cache_lock = Lock()
+
+
+def _load_encoder(model: str) -> Optional[Callable[[str], list]]:
+    try:
+        import tiktoken
+    except ImportError:
+        print("    ⚠️  tiktoken not installed — estimating tokens as chars / 4.", flush=True)
+        return None
+    try:
+        try:
+            enc = tiktoken.encoding_for_model(model)
+        except KeyError:
+            enc = tiktoken.get_encoding(_FALLBACK_ENCODING)
+    except Exception as exc:
+        print(f"    ⚠️  tiktoken encoding unavailable ({exc.__class__.__name__}) — "
+              "estimating tokens as chars / 4.", flush=True)
+        return None
+    return lambda text: enc.encode(text, disallowed_special=())
+
+
+def _encoder(model: str) -> Optional[Callable[[str], list]]:
+    if model not in _encoders:
+        with _encoders_lock:
+            if model not in _encoders:
+                _encoders[model] = _load_encoder(model)
+    return _encoders[model]
+
+
+def is_exact(model: Optional[str] = None) -> bool:
+    """True if counts for model come from a real tokenizer, not the estimate."""
+    return _encoder(model or config.OPENAI_MODEL) is not None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count of text for model (default: OPENAI_MODEL), cached by hash."""
+    if not text:
+        return 0
+    model = model or config.OPENAI_MODEL
+    key = (model, hashlib.sha1(text.encode("utf-8")).hexdigest())
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    encode = _encoder(model)
+    n = len(encode(text)) if encode else (len(text) + 3) // 4
+
+    with _cache_lock:
+        _cache[key] = n
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return n
+
+
+def count_chat_tokens(messages: Iterable[Iterable[str]], model: Optional[str] = None) -> int:
+    """
+    Prompt tokens for a chat request.  Each message is given as the list of
+    text pieces that make it up, so a large shared piece (the transcript)
+    keeps its own cache entry however it is wrapped.
+    """
+    total = TOKENS_PER_REPLY
+    for parts in messages:
+        total += TOKENS_PER_MESSAGE + sum(count_tokens(p, model) for p in parts)
+    return total
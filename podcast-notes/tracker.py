@@ -2,7 +2,10 @@
 Human-readable CSV tracker for processed podcast episodes.
 
 File: processed_episodes.csv (lives in the podcast-notes directory).
-Columns: episode_number, guest, title, url, processed_at, status
+Columns: podcast, episode_number, guest, title, url, processed_at, status
+
+Entries are keyed by (podcast, episode_number).  Rows written before the
+podcast column existed are read as the default show (Modern Wisdom).
 """
 
 from __future__ import annotations
@@ -11,11 +14,13 @@ import csv
 import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import config
+import podcasts
 
 FIELDNAMES = [
+    "podcast",
     "episode_number",
     "guest",
     "title",
@@ -33,6 +38,7 @@ class TrackerEntry:
     url: str
     processed_at: str
     status: str  # "completed" | "failed"
+    podcast: str = podcasts.DEFAULT_PODCAST
 
 
 def _ensure_file() -> None:
@@ -43,10 +49,10 @@ def _ensure_file() -> None:
             writer.writeheader()
 
 
-def load_tracker() -> Dict[int, TrackerEntry]:
-    """Load all tracker entries keyed by episode number."""
+def _load_all() -> Dict[Tuple[str, int], TrackerEntry]:
+    """Load every tracker entry keyed by (podcast, episode number)."""
     _ensure_file()
-    entries: Dict[int, TrackerEntry] = {}
+    entries: Dict[Tuple[str, int], TrackerEntry] = {}
     with open(config.TRACKER_PATH, "r", newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -54,21 +60,31 @@ def load_tracker() -> Dict[int, TrackerEntry]:
                 ep_num = int(row["episode_number"])
             except (ValueError, KeyError):
                 continue
-            entries[ep_num] = TrackerEntry(
+            podcast = row.get("podcast") or podcasts.DEFAULT_PODCAST
+            entries[(podcast, ep_num)] = TrackerEntry(
                 episode_number=ep_num,
                 guest=row.get("guest", ""),
                 title=row.get("title", ""),
                 url=row.get("url", ""),
                 processed_at=row.get("processed_at", ""),
                 status=row.get("status", ""),
+                podcast=podcast,
             )
     return entries
 
 
-def is_processed(episode_number: int) -> bool:
+def load_tracker(podcast: str = podcasts.DEFAULT_PODCAST) -> Dict[int, TrackerEntry]:
+    """Load one show's tracker entries keyed by episode number."""
+    return {
+        ep_num: entry
+        for (show, ep_num), entry in _load_all().items()
+        if show == podcast
+    }
+
+
+def is_processed(episode_number: int, podcast: str = podcasts.DEFAULT_PODCAST) -> bool:
     """Return True if the episode has already been successfully processed."""
-    entries = load_tracker()
-    entry = entries.get(episode_number)
+    entry = _load_all().get((podcast, episode_number))
     return entry is not None and entry.status == "completed"
 
 
@@ -78,35 +94,45 @@ def mark_processed(
     title: str,
     url: str,
     status: str = "completed",
+    podcast: str = podcasts.DEFAULT_PODCAST,
 ) -> None:
     """Append (or update) an entry in the tracker."""
-    entries = load_tracker()
-    entries[episode_number] = TrackerEntry(
+    entries = _load_all()
+    entries[(podcast, episode_number)] = TrackerEntry(
         episode_number=episode_number,
         guest=guest,
         title=title,
         url=url,
         processed_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
         status=status,
+        podcast=podcast,
     )
     _write_all(entries)
 
 
-def get_processed_list() -> List[TrackerEntry]:
-    """Return all tracker entries sorted by episode number descending."""
-    entries = load_tracker()
-    return sorted(entries.values(), key=lambda e: e.episode_number, reverse=True)
+def get_processed_list(podcast: str | None = None) -> List[TrackerEntry]:
+    """Return tracker entries (one show, or all) sorted by show then episode number descending."""
+    entries = [
+        e for e in _load_all().values()
+        if podcast is None or e.podcast == podcast
+    ]
+    return sorted(entries, key=_sort_key)
+
+
+def _sort_key(entry: TrackerEntry) -> tuple:
+    return (entry.podcast != podcasts.DEFAULT_PODCAST, entry.podcast, -entry.episode_number)
 
 
-def _write_all(entries: Dict[int, TrackerEntry]) -> None:
+def _write_all(entries: Dict[Tuple[str, int], TrackerEntry]) -> None:
     """Rewrite the full CSV (keeps it sorted and deduped)."""
     _ensure_file()
-    sorted_entries = sorted(entries.values(), key=lambda e: e.episode_number, reverse=True)
+    sorted_entries = sorted(entries.values(), key=_sort_key)
     with open(config.TRACKER_PATH, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
         writer.writeheader()
         for entry in sorted_entries:
             writer.writerow({
+                "podcast": entry.podcast,
                 "episode_number": entry.episode_number,
                 "guest": entry.guest,
                 "title": entry.title,
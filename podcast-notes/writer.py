@@ -8,7 +8,9 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-import config
+import linkgraph
+import podcasts
+from podcasts import PodcastProfile
 
 
 def sanitize_filename(raw: str) -> str:
@@ -42,12 +44,17 @@ def sanitize_filename(raw: str) -> str:
     return name
 
 
-def build_filename(episode_number: int, guest: str, title: str) -> str:
+def build_filename(
+    episode_number: int,
+    guest: str,
+    title: str,
+    podcast_name: str = "Modern Wisdom",
+) -> str:
     """
     Build the full .md filename for an episode.
-    Example: Modern-Wisdom-1066-Dr-Kathryn-Paige-Harden-The-Genetics-of-Evil-Are-People-Born-Bad.md
+    Example: Modern Wisdom - 1066 - Dr Kathryn Paige Harden.md
     """
-    raw = f"Modern Wisdom - {episode_number} - {guest}.md" if guest else f"Modern Wisdom - {episode_number}.md"
+    raw = f"{podcast_name} - {episode_number} - {guest}.md" if guest else f"{podcast_name} - {episode_number}.md"
     return sanitize_filename_keep_format(raw)
 
 
@@ -70,17 +77,20 @@ def write_note(
     episode_number: int,
     guest: str,
     title: str,
+    profile: PodcastProfile | None = None,
 ) -> Path:
     """
-    Write the markdown content to the Obsidian vault and return the
-    resulting file path.
+    Write the markdown content to the show's vault folder (default: Modern
+    Wisdom) and return the resulting file path.
     """
-    out_dir = config.output_dir()
-    filename = build_filename(episode_number, guest, title)
+    profile = profile or podcasts.get_profile()
+    out_dir = profile.output_dir()
+    filename = build_filename(episode_number, guest, title, profile.name)
     filepath = out_dir / filename
 
     content = _ensure_blank_line_before_tags(content)
     filepath.write_text(content, encoding="utf-8")
+    linkgraph.record_written_note(filepath, content, profile)
     return filepath
 
 
@@ -98,6 +108,45 @@ def sanitize_filename_keep_format(raw: str) -> str:
     return name
 
 
-def build_processed_filename(episode_number: int, guest: str) -> str:
-    raw = f"Modern Wisdom - {episode_number} — {guest}.md" if guest else f"Modern Wisdom - {episode_number}.md"
+def build_processed_filename(
+    episode_number: int,
+    guest: str,
+    podcast_name: str = "Modern Wisdom",
+) -> str:
+    raw = f"{podcast_name} - {episode_number} — {guest}.md" if guest else f"{podcast_name} - {episode_number}.md"
     return sanitize_filename_keep_format(raw)
+
+
+RELATED_HEADING = "## 🔁 Related Episodes"
+
+_RELATED_SECTION_RE = re.compile(
+    rf"{re.escape(RELATED_HEADING)}\n[\s\S]*?(?=\n## |\nTRANSCRIPT:|\Z)"
+)
+
+
+def set_related_section(
+    content: str,
+    related: list[tuple[int, str]],
+    podcast_name: str = "Modern Wisdom",
+) -> str:
+    """
+    Return content with its Related Episodes section replaced by links to
+    related, a list of (episode_number, guest).  The section is inserted
+    before the Tags heading / TRANSCRIPT block (or appended) if the note
+    doesn't have one yet.
+    """
+    lines = [RELATED_HEADING]
+    for number, guest in related:
+        target = build_filename(number, guest, "", podcast_name)[: -len(".md")]
+        label = f"#{number} — {guest}" if guest else f"#{number}"
+        lines.append(f"- [[{target}|{label}]]")
+    section = "\n".join(lines) + "\n"
+
+    if _RELATED_SECTION_RE.search(content):
+        return _RELATED_SECTION_RE.sub(lambda _m: section, content, count=1)
+
+    for marker in ("\n## 🏷 Tags", "\nTRANSCRIPT:"):
+        at = content.find(marker)
+        if at != -1:
+            return content[: at + 1] + section + "\n" + content[at + 1 :]
+    return content.rstrip("\n") + "\n\n" + section
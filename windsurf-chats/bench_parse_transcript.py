@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hook_export's streaming transcript parser vs the previous
+parser, which kept every step in a list and de-duplicated files/commands
+with `x not in list`.
+
+Writes a synthetic JSONL transcript (user prompts, long planner responses,
+file writes and terminal commands, with repeats) of the requested size to
+a temp dir, then reports wall time and peak Python heap (tracemalloc) for
+each parser.  Both must produce the same note.
+
+Usage:
+    python bench_parse_transcript.py                 # 100 MB transcript
+    python bench_parse_transcript.py --size-mb 20 --distinct-files 5000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import hook_export
+
+
+def write_transcript(path: Path, size_mb: int, distinct_files: int, distinct_commands: int) -> int:
+    """Write about size_mb of steps to path; returns the step count."""
+    rng = random.Random(0)
+    target = size_mb * 1024 * 1024
+    filler = "lorem ipsum dolor sit amet " * 40
+    written = steps = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            kind = rng.random()
+            if kind < 0.15:
+                step = {"type": "user_input", "user_input": {"user_response": f"prompt {steps}\n{filler[:200]}"}}
+            elif kind < 0.45:
+                step = {"type": "planner_response", "planner_response": {"response": f"answer {steps} {filler}"}}
+            elif kind < 0.75:
+                step = {"type": "code_action",
+                        "code_action": {"path": f"src/pkg{rng.randrange(distinct_files) % 50}/mod{rng.randrange(distinct_files)}.py",
+                                        "diff": filler}}
+            else:
+                step = {"type": "terminal_action",
+                        "terminal_action": {"command": f"pytest -k case{rng.randrange(distinct_commands)}",
+                                            "output": filler[:300]}}
+            step["timestamp"] = f"2026-01-01T00:00:{steps % 60:02d}Z"
+            line = json.dumps(step) + "\n"
+            f.write(line)
+            written += len(line)
+            steps += 1
+    return steps
+
+
+def parse_materialised(jsonl_path: str) -> dict:
+    """The previous parser: every step kept, list-membership de-duplication.
+    Returns the same shape as hook_export.parse_transcript()."""
+    path = Path(jsonl_path)
+    steps, user_messages, ai_responses, files_changed, commands_run = [], [], [], [], []
+    first_ts = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                step = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            steps.append(step)
+            step_type = step.get("type", "")
+            if first_ts is None and step.get("timestamp"):
+                first_ts = step["timestamp"]
+            if step_type == "user_input":
+                prompt = step.get("user_input", {}).get("user_response", "")
+                if prompt:
+                    user_messages.append(prompt)
+            elif step_type == "planner_response":
+                response = step.get("planner_response", {}).get("response", "")
+                if response:
+                    ai_responses.append(response)
+            elif step_type == "code_action":
+                fpath = step.get("code_action", {}).get("path", "")
+                if fpath and fpath not in files_changed:
+                    files_changed.append(fpath)
+            elif step_type == "terminal_action":
+                ta = step.get("terminal_action", {})
+                cmd = ta.get("command", "") or ta.get("command_line", "")
+                if cmd and cmd not in commands_run:
+                    commands_run.append(cmd)
+
+    title = "Untitled Conversation"
+    for line in (user_messages[0].splitlines() if user_messages else []):
+        if line.strip():
+            title = line.strip()[:80]
+            break
+    return {
+        "trajectory_id": path.stem,
+        "step_count": len(steps),
+        "user_messages": user_messages[:hook_export.PROMPTS_SHOWN],
+        "user_message_count": len(user_messages),
+        "last_ai_response": ai_responses[-1] if ai_responses else "",
+        "files_changed": files_changed[:hook_export.FILES_SHOWN],
+        "files_changed_count": len(files_changed),
+        "commands_run": commands_run[:hook_export.COMMANDS_SHOWN],
+        "commands_run_count": len(commands_run),
+        "first_ts": first_ts,
+        "title": title,
+    }
+
+
+def measure(parse, path: Path) -> tuple[dict, float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    data = parse(str(path))
+    elapsed = time.perf_counter() - t0
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=100, help="Transcript size to generate")
+    parser.add_argument("--distinct-files", type=int, default=5000)
+    parser.add_argument("--distinct-commands", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench-trajectory.jsonl"
+        print(f"Writing ~{args.size_mb} MB synthetic transcript...")
+        steps = write_transcript(path, args.size_mb, args.distinct_files, args.distinct_commands)
+        print(f"  {steps:,} steps, {path.stat().st_size / 1024 / 1024:.1f} MB\n")
+
+        results = {}
+        for name, parse in (("list + `in list` (previous)", parse_materialised),
+                            ("streaming + sets", hook_export.parse_transcript)):
+            data, elapsed, peak = measure(parse, path)
+            results[name] = data
+            print(f"{name:28s}  {elapsed:7.2f} s   peak heap {peak / 1024 / 1024:8.1f} MB")
+
+        old, new = results.values()
+        same = hook_export.build_note(old, "bench", "") == hook_export.build_note(new, "bench", "")
+        print(f"\nIdentical note: {same}")
+
+
+if __name__ == "__main__":
+    main()
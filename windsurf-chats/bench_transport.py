@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON vs binary protobuf (application/proto) language-server calls.
+
+Runs fake_ls.py in-process and calls GetAllCascadeTrajectories and
+GetCascadeTrajectory both ways, the way watcher.py does (requests session,
+r.json() vs ls_proto's decoders).  For each payload it prints, side by side:
+response size, decode time and full round-trip time (median of --repeat
+calls).  It also checks that the binary decode gives the same dicts as the
+JSON one, for the fields ls_proto maps.
+
+Usage:
+    python bench_transport.py
+    python bench_transport.py --conversations 1000,10000 --steps 40,400,4000 --repeat 9
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+
+import requests
+
+import ls_proto
+from fake_ls import SERVICE, FakeLanguageServer
+
+
+def _post(session: requests.Session, server: FakeLanguageServer, method: str,
+          binary: bool, body: dict, proto_body: bytes) -> requests.Response:
+    headers = {"x-codeium-csrf-token": server.csrf}
+    if binary:
+        headers.update({"Content-Type": "application/proto", "Connect-Protocol-Version": "1"})
+        r = session.post(f"http://127.0.0.1:{server.port}/{SERVICE}/{method}",
+                         headers=headers, data=proto_body, timeout=60)
+    else:
+        headers["Content-Type"] = "application/json"
+        r = session.post(f"http://127.0.0.1:{server.port}/{SERVICE}/{method}",
+                         headers=headers, json=body, timeout=60)
+    r.raise_for_status()
+    return r
+
+
+def _median_seconds(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def _mapped_summary(item: dict, shape: dict) -> dict:
+    """item restricted to what the summary shape maps (recursively)."""
+    out = {}
+    for spec in shape.values():
+        key, kind = (spec, None) if isinstance(spec, str) else spec
+        if key not in item:
+            continue
+        if isinstance(kind, dict):
+            out[key] = _mapped_summary(item[key], kind)
+        elif isinstance(kind, list):
+            out[key] = [_mapped_summary(v, kind[0]) for v in item[key]]
+        else:
+            out[key] = item[key]
+    return out
+
+
+def _mapped_step(step: dict, step_types: set[str]) -> dict:
+    return step if step.get("type") in step_types else {"type": ""}
+
+
+def bench(label: str, session, server, method: str, body: dict, proto_body: bytes,
+          decode, repeat: int, field_map: dict) -> tuple[bool, str]:
+    r_json = _post(session, server, method, False, body, proto_body)
+    r_proto = _post(session, server, method, True, body, proto_body)
+    from_json = r_json.json()
+    from_proto = decode(r_proto.content, field_map)
+
+    if method == "GetAllCascadeTrajectories":
+        shape = field_map["summary"]
+        same = from_proto["trajectorySummaries"] == {
+            uuid: _mapped_summary(item, shape) for uuid, item in from_json["trajectorySummaries"].items()
+        }
+    else:
+        step_types = {v[0] for v in field_map["steps"].values()}
+        same = from_proto["trajectory"]["steps"] == [
+            _mapped_step(s, step_types) for s in from_json["trajectory"]["steps"]
+        ]
+
+    decode_json = _median_seconds(lambda: json.loads(r_json.content), repeat)
+    decode_proto = _median_seconds(lambda: decode(r_proto.content, field_map), repeat)
+    trip_json = _median_seconds(lambda: _post(session, server, method, False, body, proto_body).json(), repeat)
+    trip_proto = _median_seconds(
+        lambda: decode(_post(session, server, method, True, body, proto_body).content, field_map), repeat)
+
+    row = (f"{label:<28} {len(r_json.content) / 1e3:10.1f} {len(r_proto.content) / 1e3:10.1f} "
+           f"{decode_json * 1e3:9.2f} {decode_proto * 1e3:9.2f} "
+           f"{trip_json * 1e3:9.2f} {trip_proto * 1e3:9.2f}  {'yes' if same else 'NO'}")
+    return same, row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JSON and binary protobuf LS transports")
+    parser.add_argument("--conversations", default="100,1000,10000",
+                        help="Comma-separated conversation counts for GetAllCascadeTrajectories")
+    parser.add_argument("--steps", default="40,400,4000",
+                        help="Comma-separated step counts for GetCascadeTrajectory")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls per measurement (median reported)")
+    args = parser.parse_args()
+
+    field_map = ls_proto.load_field_map()
+    session = requests.Session()
+    print(f"{'payload':<28} {'JSON KB':>10} {'proto KB':>10} {'dec JSON':>9} {'dec proto':>9} "
+          f"{'trip JSON':>9} {'trip prot':>9}  same")
+    print(f"{'':<28} {'':>10} {'':>10} {'ms':>9} {'ms':>9} {'ms':>9} {'ms':>9}")
+
+    all_same = True
+    for n in [int(x) for x in args.conversations.split(",") if x.strip()]:
+        server = FakeLanguageServer(conversations=n)
+        server.start()
+        try:
+            same, row = bench(f"GetAllCascadeTrajectories {n}", session, server,
+                               "GetAllCascadeTrajectories", {}, b"",
+                               ls_proto.decode_all_trajectories, args.repeat, field_map)
+        finally:
+            server.stop()
+        all_same &= same
+        print(row)
+
+    for steps in [int(x) for x in args.steps.split(",") if x.strip()]:
+        server = FakeLanguageServer(conversations=1, steps=steps)
+        server.start()
+        cascade_id = server.ids[0]
+        try:
+            same, row = bench(f"GetCascadeTrajectory {server.step_counts[0]} st", session, server,
+                               "GetCascadeTrajectory", {"cascadeId": cascade_id},
+                               ls_proto.encode_get_trajectory_request(cascade_id, field_map),
+                               ls_proto.decode_get_trajectory, args.repeat, field_map)
+        finally:
+            server.stop()
+        all_same &= same
+        print(row)
+
+    if not all_same:
+        raise SystemExit("Binary decode differs from JSON for at least one payload.")
+
+
+if __name__ == "__main__":
+    main()
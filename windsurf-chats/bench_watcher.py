@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark: watcher.py poll cycles against a fake language server.
+
+For each conversation count, starts fake_ls.py in its own process and runs
+the watcher's real poll_once() in a fresh child process whose vault, index
+(WINDSURF_INDEX_DB) and step archive (STEP_ARCHIVE_DIR) live in a temp
+directory, so nothing touches your real vault or index.  Three cycles are
+timed per size:
+
+  cold    empty index: every conversation fetched, rendered and written
+  idle    nothing changed: one GetAllCascadeTrajectories and index lookups
+  active  --active percent of conversations gained --new-steps steps
+
+Reported per cycle: wall time, notes written, LS requests and response
+bytes, and bytes the watcher process wrote (notes, index, archive — from
+/proc/self/io where available, else the temp directory's growth).  Peak
+RSS of the watcher process is reported per size.
+
+Runs anywhere: no Windsurf install, API key or .env needed.
+
+Usage:
+    python bench_watcher.py                          # 100, 1000, 10000 conversations
+    python bench_watcher.py --sizes 100,1000 --steps 80 --latency-ms 2
+    python bench_watcher.py --workers 16 --active 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCRIPT_DIR = Path(__file__).parent
+CSRF = "bench-csrf-token"
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers (child process)
+# ---------------------------------------------------------------------------
+
+def _written_bytes(workdir: Path) -> int:
+    """Bytes this process has written so far (approximate off Linux)."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return sum(p.stat().st_size for p in workdir.rglob("*") if p.is_file())
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _fake_call(port: int, path: str, body: dict) -> dict:
+    import requests
+    return requests.post(f"http://127.0.0.1:{port}{path}", json=body, timeout=30).json()
+
+
+def run_child(port: int, workers: int, active_pct: float, new_steps: int, conversations: int) -> None:
+    """Time three poll cycles and print one JSON line of results."""
+    workdir = Path(os.environ["BENCH_WORKDIR"])
+    import logging
+    import watcher
+
+    watcher.VAULT_CHATS_DIR = workdir / "vault" / "Chats"
+    logging.getLogger("watcher").setLevel(logging.WARNING)  # no per-note lines in watcher.log
+
+    def cycle(name: str) -> dict:
+        stats = _fake_call(port, "/_fake/stats", {})
+        wrote = _written_bytes(workdir)
+        started = time.perf_counter()
+        notes = watcher.poll_once(port, CSRF, workers)
+        elapsed = time.perf_counter() - started
+        wrote = _written_bytes(workdir) - wrote
+        after = _fake_call(port, "/_fake/stats", {})
+        return {
+            "cycle": name,
+            "seconds": elapsed,
+            "notes": notes,
+            "requests": after["requests"] - stats["requests"],
+            "received": after["bytes_sent"] - stats["bytes_sent"],
+            "written": wrote,
+        }
+
+    results = [cycle("cold"), cycle("idle")]
+    touched = max(1, round(conversations * active_pct / 100))
+    _fake_call(port, "/_fake/advance", {"conversations": touched, "steps": new_steps})
+    results.append(cycle("active"))
+    print(json.dumps({"cycles": results, "peak_rss_mb": _peak_rss_mb()}), flush=True)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def _start_fake_ls(conversations: int, steps: int, latency_ms: float) -> tuple[subprocess.Popen, int]:
+    proc = subprocess.Popen(
+        [sys.executable, str(SCRIPT_DIR / "fake_ls.py"), "--conversations", str(conversations),
+         "--steps", str(steps), "--latency-ms", str(latency_ms), "--csrf", CSRF],
+        stdout=subprocess.PIPE, text=True,
+    )
+    # "Fake language server on 127.0.0.1:<port>  (csrf ...)"
+    line = proc.stdout.readline()
+    port = int(line.split("127.0.0.1:", 1)[1].split()[0])
+    return proc, port
+
+
+def bench_size(conversations: int, args: argparse.Namespace) -> dict:
+    server, port = _start_fake_ls(conversations, args.steps, args.latency_ms)
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_watcher_") as tmp:
+            env = {
+                **os.environ,
+                "BENCH_WORKDIR": tmp,
+                "OBSIDIAN_VAULT": str(Path(tmp) / "vault"),
+                "WINDSURF_INDEX_DB": str(Path(tmp) / "index.db"),
+                "STEP_ARCHIVE_DIR": str(Path(tmp) / "archive"),
+            }
+            out = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), "--child", "--port", str(port),
+                 "--workers", str(args.workers), "--active", str(args.active),
+                 "--new-steps", str(args.new_steps), "--conversations", str(conversations)],
+                env=env, capture_output=True, text=True, check=True, cwd=SCRIPT_DIR,
+            ).stdout
+    finally:
+        server.terminate()
+        server.wait()
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1e6:9.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark watcher poll cycles against a fake language server")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated conversation counts")
+    parser.add_argument("--steps", type=int, default=40, help="Steps per conversation")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake LS delay per request")
+    parser.add_argument("--workers", type=int, default=8, help="watcher poll_once() fetch workers")
+    parser.add_argument("--active", type=float, default=1.0, help="Percent of conversations changed before the active cycle")
+    parser.add_argument("--new-steps", type=int, default=6, help="Steps added to each changed conversation")
+    # Internal: run one size's measurements in this process
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--conversations", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.port, args.workers, args.active, args.new_steps, args.conversations)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    print(f"{args.steps} steps/conversation, {args.latency_ms:g} ms LS latency, {args.workers} workers, "
+          f"active cycle: {args.active:g}% of conversations +{args.new_steps} steps\n")
+    print(f"{'convs':>7}  {'cycle':<6} {'seconds':>8} {'notes':>6} {'requests':>8} "
+          f"{'recv MB':>9} {'wrote MB':>9} {'peak RSS MB':>11}")
+    for n in sizes:
+        result = bench_size(n, args)
+        rss = result["peak_rss_mb"]
+        for c in result["cycles"]:
+            rss_col = f"{rss:11.1f}" if rss is not None and c["cycle"] == "active" else " " * 11
+            print(f"{n:>7}  {c['cycle']:<6} {c['seconds']:8.2f} {c['notes']:6d} {c['requests']:8d} "
+                  f"{_mb(c['received'])} {_mb(c['written'])} {rss_col}")
+
+
+if __name__ == "__main__":
+    main()
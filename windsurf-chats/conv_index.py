@@ -0,0 +1,367 @@
+"""
+conv_index.py
+
+Shared conversation index for the Windsurf scripts, stored in index.db
+(SQLite, WAL mode) next to the scripts, or at WINDSURF_INDEX_DB.
+
+Each conversation is one row keyed by uuid.  The fields other scripts look
+things up by — trajectory_id, last_modified, exported — are real indexed
+columns; everything else in the entry (export_path, synced_steps,
+files_changed, ...) rides along in a JSON `data` column, so entries keep the
+same dict shape index.json had.
+
+Writes are per-conversation upserts inside BEGIN IMMEDIATE transactions:
+the fields passed in are merged into the stored entry, so the hook and the
+watcher updating different conversations (or different fields of the same
+one) at the same time don't lose each other's changes.  A writer that finds
+the database locked waits up to BUSY_TIMEOUT seconds instead of failing.
+
+On first open, an existing index.json next to the database is imported once
+and renamed to index.json.migrated.
+
+Full-text search: an entry written with a `search_text` field (the
+conversation thread, as rendered into the note) also updates an FTS5 table
+in the same transaction, over title, workspace, that text, files_changed
+and commands_run.  search_text itself isn't stored in the entry.
+search(query) returns bm25-ranked hits with a snippet.
+
+Usage from other scripts:
+  import conv_index
+  idx = conv_index.open_index()
+  entry = idx.get(uuid)                      # dict or None
+  idx.upsert(uuid, {"exported": True, ...})  # merge fields into the entry
+  hits = idx.search("pytest conv_index.py")  # [{"uuid", "title", "workspace", "snippet", ...}]
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+SCRIPT_DIR  = Path(__file__).parent
+DB_FILE     = Path(os.environ.get("WINDSURF_INDEX_DB") or SCRIPT_DIR / "index.db")
+LEGACY_FILE = DB_FILE.with_name("index.json")
+
+BUSY_TIMEOUT = 30  # seconds a writer waits for another writer's lock
+
+# Entry keys stored as their own (indexed) columns rather than inside `data`
+_COLUMNS = ("trajectory_id", "title", "exported", "exported_at", "last_modified")
+
+# Entry key routed to the full-text index instead of being stored
+SEARCH_TEXT = "search_text"
+
+# bm25 weights per search column: uuid, title, workspace, conversation, files, commands
+_SEARCH_WEIGHTS = (0.0, 5.0, 2.0, 1.0, 3.0, 3.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    uuid          TEXT PRIMARY KEY,
+    trajectory_id TEXT,
+    title         TEXT,
+    exported      INTEGER NOT NULL DEFAULT 0,
+    exported_at   TEXT,
+    last_modified TEXT,
+    data          TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS conversations_trajectory ON conversations (trajectory_id);
+CREATE INDEX IF NOT EXISTS conversations_modified   ON conversations (last_modified);
+CREATE INDEX IF NOT EXISTS conversations_exported   ON conversations (exported);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# rowid matches the conversation's rowid in `conversations`
+_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    uuid UNINDEXED, title, workspace, conversation, files, commands
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ConversationIndex:
+    """One connection to index.db.  Not shared between threads."""
+
+    def __init__(self, path: Path = DB_FILE, legacy_path: Path | None = LEGACY_FILE):
+        self.path = Path(path)
+        # isolation_level=None: no implicit transactions; writes open their own
+        self.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}")
+        self.conn.executescript(_SCHEMA)
+        try:
+            self.conn.executescript(_SEARCH_SCHEMA)
+            self.has_search = True
+        except sqlite3.OperationalError:  # SQLite built without FTS5
+            self.has_search = False
+        if legacy_path is not None:
+            self._migrate_json(Path(legacy_path))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ConversationIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -----------------------------------------------------------------------
+    # Reads
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> dict:
+        entry = json.loads(row["data"])
+        entry["uuid"] = row["uuid"]
+        for col in _COLUMNS:
+            entry[col] = row[col]
+        entry["exported"] = bool(row["exported"])
+        return entry
+
+    def get(self, uuid: str) -> dict | None:
+        row = self.conn.execute("SELECT * FROM conversations WHERE uuid = ?", (uuid,)).fetchone()
+        return self._entry(row) if row else None
+
+    def get_many(self, uuids: Iterable[str]) -> dict[str, dict]:
+        """{uuid: entry} for those of uuids that are in the index."""
+        found: dict[str, dict] = {}
+        uuids = list(uuids)
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(uuids), 500):
+            chunk = uuids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in self.conn.execute(f"SELECT * FROM conversations WHERE uuid IN ({marks})", chunk):
+                found[row["uuid"]] = self._entry(row)
+        return found
+
+    def find(self, key: str) -> dict | None:
+        """Entry whose uuid or trajectory_id is key."""
+        row = self.conn.execute(
+            "SELECT * FROM conversations WHERE uuid = ? "
+            "UNION ALL SELECT * FROM conversations WHERE trajectory_id = ? LIMIT 1",
+            (key, key),
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def modified_since(self, timestamp: str) -> list[dict]:
+        """Entries whose last_modified is after timestamp (ISO 8601), oldest first."""
+        rows = self.conn.execute(
+            "SELECT * FROM conversations WHERE last_modified > ? ORDER BY last_modified",
+            (timestamp,),
+        )
+        return [self._entry(r) for r in rows]
+
+    def all(self) -> list[dict]:
+        return [self._entry(r) for r in self.conn.execute("SELECT * FROM conversations ORDER BY rowid")]
+
+    def pending(self) -> list[dict]:
+        rows = self.conn.execute("SELECT * FROM conversations WHERE exported = 0 ORDER BY rowid")
+        return [self._entry(r) for r in rows]
+
+    def counts(self) -> tuple[int, int]:
+        """(total, pending)."""
+        total, pending = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(exported = 0), 0) FROM conversations"
+        ).fetchone()
+        return total, pending
+
+    def __contains__(self, uuid: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM conversations WHERE uuid = ?", (uuid,)).fetchone() is not None
+
+    def search(self, query: str, limit: int = 20, raw: bool = False) -> list[dict]:
+        """Conversations matching query, best first: dicts with uuid, title,
+        workspace, snippet, score (bm25, lower is better), export_path and
+        last_modified.  Every word must match (a trailing * matches a
+        prefix); raw=True passes query to FTS5 unchanged."""
+        if not self.has_search:
+            raise RuntimeError("This SQLite build has no FTS5; full-text search is unavailable.")
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+        weights = ", ".join(str(w) for w in _SEARCH_WEIGHTS)
+        rows = self.conn.execute(
+            "SELECT search.uuid, search.title, search.workspace, "
+            "snippet(search, -1, '[', ']', '…', 12) AS snippet, "
+            f"bm25(search, {weights}) AS score, c.last_modified, c.data "
+            "FROM search JOIN conversations c ON c.rowid = search.rowid "
+            "WHERE search MATCH ? ORDER BY score LIMIT ?",
+            (match, limit),
+        )
+        hits = []
+        for r in rows:
+            hits.append({
+                "uuid": r["uuid"],
+                "title": r["title"],
+                "workspace": r["workspace"],
+                "snippet": r["snippet"],
+                "score": r["score"],
+                "export_path": json.loads(r["data"]).get("export_path"),
+                "last_modified": r["last_modified"],
+            })
+        return hits
+
+    def search_missing(self) -> list[dict]:
+        """Exported entries with nothing in the full-text index (exported
+        before it existed, or by a script that doesn't feed it)."""
+        if not self.has_search:
+            return []
+        rows = self.conn.execute(
+            "SELECT * FROM conversations WHERE exported = 1 "
+            "AND rowid NOT IN (SELECT rowid FROM search) ORDER BY rowid"
+        )
+        return [self._entry(r) for r in rows]
+
+    def search_count(self) -> int:
+        """Conversations in the full-text index."""
+        if not self.has_search:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM search").fetchone()[0]
+
+    # -----------------------------------------------------------------------
+    # Writes
+    # -----------------------------------------------------------------------
+
+    def _write(self, uuid: str, fields: dict, insert_only: bool) -> bool:
+        row = self.conn.execute("SELECT * FROM conversations WHERE uuid = ?", (uuid,)).fetchone()
+        if row and insert_only:
+            return False
+        entry = self._entry(row) if row else {}
+        entry.update(fields)
+        entry["uuid"] = uuid
+        search_text = entry.pop(SEARCH_TEXT, None)
+        data = {k: v for k, v in entry.items() if k != "uuid" and k not in _COLUMNS}
+        # ON CONFLICT rather than INSERT OR REPLACE: keeps the rowid, which
+        # the search table shares
+        self.conn.execute(
+            "INSERT INTO conversations "
+            "(uuid, trajectory_id, title, exported, exported_at, last_modified, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (uuid) DO UPDATE SET trajectory_id = excluded.trajectory_id, "
+            "title = excluded.title, exported = excluded.exported, exported_at = excluded.exported_at, "
+            "last_modified = excluded.last_modified, data = excluded.data",
+            (
+                uuid,
+                entry.get("trajectory_id"),
+                entry.get("title"),
+                int(bool(entry.get("exported"))),
+                entry.get("exported_at"),
+                entry.get("last_modified"),
+                json.dumps(data, ensure_ascii=False),
+            ),
+        )
+        if search_text is not None and self.has_search:
+            self._write_search(uuid, entry, search_text)
+        return True
+
+    def _write_search(self, uuid: str, entry: dict, text: str) -> None:
+        rowid = self.conn.execute("SELECT rowid FROM conversations WHERE uuid = ?", (uuid,)).fetchone()[0]
+        self.conn.execute("DELETE FROM search WHERE rowid = ?", (rowid,))
+        self.conn.execute(
+            "INSERT INTO search (rowid, uuid, title, workspace, conversation, files, commands) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                rowid,
+                uuid,
+                entry.get("title") or "",
+                entry.get("workspace") or "",
+                text,
+                "\n".join(entry.get("files_changed") or []),
+                "\n".join(entry.get("commands_run") or []),
+            ),
+        )
+
+    def _transaction(self, writes: Iterable[tuple[str, dict]], insert_only: bool) -> int:
+        # IMMEDIATE takes the write lock up front, so the read-merge-write of
+        # each entry can't interleave with another process's update.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            written = sum(self._write(uuid, fields, insert_only) for uuid, fields in writes)
+            if written:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)", (_now(),)
+                )
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return written
+
+    def upsert(self, uuid: str, fields: dict) -> None:
+        """Merge fields into uuid's entry, creating it if needed."""
+        self._transaction([(uuid, fields)], insert_only=False)
+
+    def upsert_many(self, updates: dict[str, dict]) -> None:
+        """upsert() every {uuid: fields} pair in one transaction."""
+        if updates:
+            self._transaction(updates.items(), insert_only=False)
+
+    def add(self, uuid: str, entry: dict) -> bool:
+        """Insert entry unless uuid is already indexed.  Returns True if added."""
+        return bool(self._transaction([(uuid, entry)], insert_only=True))
+
+    def add_many(self, entries: dict[str, dict]) -> int:
+        """add() every {uuid: entry} pair in one transaction.  Returns count added."""
+        return self._transaction(entries.items(), insert_only=True) if entries else 0
+
+    # -----------------------------------------------------------------------
+    # index.json migration
+    # -----------------------------------------------------------------------
+
+    def _migrate_json(self, legacy: Path) -> None:
+        if not legacy.exists():
+            return
+        try:
+            with open(legacy, encoding="utf-8") as f:
+                conversations = json.load(f).get("conversations", {})
+        except (OSError, ValueError):
+            return
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Checked under the write lock: two scripts starting together
+            # must not both import the file.
+            done = self.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone()
+            if not done:
+                for uuid, entry in conversations.items():
+                    self._write(uuid, entry, insert_only=True)
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (str(legacy),)
+                )
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+        try:
+            legacy.replace(legacy.with_name(legacy.name + ".migrated"))
+        except OSError:
+            pass  # another process got there first
+
+
+def fts_query(text: str) -> str:
+    """FTS5 query matching every word of text.  Each word is quoted, so
+    punctuation in file names and commands (conv_index.py, --once) is
+    matched literally instead of being read as query syntax; a trailing *
+    makes it a prefix match."""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def open_index(path: Path = DB_FILE) -> ConversationIndex:
+    """Open (creating and migrating if needed) the shared index."""
+    return ConversationIndex(path)
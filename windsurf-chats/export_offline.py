@@ -0,0 +1,214 @@
+"""
+export_offline.py
+
+Bulk-exports Cascade conversations straight from Windsurf's on-disk
+trajectory storage (one <cascade id>.pb per conversation, see
+watcher.CASCADE_DIR) — no running language server, no per-conversation
+GetCascadeTrajectory call.  Meant for backfilling history; watcher.py keeps
+notes current afterwards.
+
+How it works:
+  1. Lists the .pb files and skips those whose mtime matches the
+     last_modified already recorded in the index (unless --force).
+  2. Fans the rest out over a process pool.  Each worker decodes its file
+     with the schema-less wire decoder (pb_wire.py, ls_proto.py), turns the trajectory
+     into the same step dicts the language server's JSON API returns, and
+     renders/writes the note with watcher.py's own render_conversation /
+     export_conversation, so offline and live notes are identical.
+  3. Upserts every exported conversation into the index in one transaction,
+     with the watcher's incremental-sync fields filled in.
+
+Windsurf publishes no schema for these files.  ls_proto.FIELD_MAP is the
+layout this script was written against; if an update moves a field,
+--dump prints the decoded tree of one file and pb_fields.json (same shape
+as FIELD_MAP, next to this script) overrides the map without code changes.
+Files that don't decode as protobuf (e.g. encrypted storage), or whose
+steps all come out unmapped (a field map that no longer fits), are counted
+and skipped rather than exported as empty notes.
+
+Usage:
+  python export_offline.py                   # export everything changed since last run
+  python export_offline.py --workers 8
+  python export_offline.py --force           # re-render every conversation
+  python export_offline.py --storage D:/backup/cascade
+  python export_offline.py --dump <cascade id or .pb path>
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+import conv_index
+import watcher
+from ls_proto import decode_trajectory, load_field_map
+from pb_wire import DecodeError, dump
+
+DEFAULT_WORKERS = os.cpu_count() or 4
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _first_prompt(steps: list[dict]) -> str:
+    for step in steps:
+        text = step.get("userInput", {}).get("userResponse", "")
+        for line in text.splitlines():
+            if line.strip():
+                return line.strip()[:80]
+    return ""
+
+
+def export_file(path: str, entry: dict, field_map: dict) -> tuple[str, dict | None, str]:
+    """Decode one .pb file and write its note.  Runs in a worker process.
+    Returns (uuid, updated index entry or None, error message)."""
+    pb_path = Path(path)
+    uuid = pb_path.stem
+    try:
+        stat = pb_path.stat()
+        trajectory_id, steps = decode_trajectory(pb_path.read_bytes(), field_map)
+    except (OSError, DecodeError) as e:
+        return uuid, None, f"{type(e).__name__}: {e}"
+    if not steps:
+        return uuid, None, "no steps decoded"
+    if not any(step["type"] for step in steps):
+        # Protobuf decodes without error under any field map, so a wrong or
+        # outdated map shows up as steps of no known type — an empty note
+        return uuid, None, f"none of {len(steps)} steps has a mapped type (field map outdated? see --dump)"
+
+    conversation_md, tail_chars, files_changed, commands_run = watcher.render_conversation(steps)
+
+    last_modified = _iso(stat.st_mtime)
+    # The same item shape GetAllCascadeTrajectories returns, from what the
+    # index already knows plus what the file itself says
+    item = {
+        "summary": entry.get("title") or _first_prompt(steps) or "Untitled Conversation",
+        "stepCount": len(steps),
+        "createdTime": entry.get("created_at") or "",
+        "trajectoryId": entry.get("trajectory_id") or trajectory_id,
+        "lastModifiedTime": last_modified,
+    }
+    exported = watcher.export_conversation(
+        uuid, item, conversation_md, files_changed, commands_run, entry.get("note_hash")
+    )
+    if not exported:
+        return uuid, None, "note write failed"
+    note_path, note_hash, _written = exported
+
+    return uuid, {
+        **entry,
+        "uuid": uuid,
+        "trajectory_id": item["trajectoryId"],
+        "title": item["summary"],
+        "category": "cascade",
+        "step_count": len(steps),
+        "created_at": entry.get("created_at"),
+        "last_modified": last_modified,
+        "exported": True,
+        "export_path": note_path,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "note_hash": note_hash,
+        "synced_steps": len(steps),
+        "tail_chars": tail_chars,
+        "conversation_chars": len(conversation_md),
+        "files_changed": files_changed,
+        "commands_run": commands_run,
+        "search_text": conversation_md,
+    }, ""
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+def cmd_export(storage: Path, workers: int, force: bool) -> None:
+    files = sorted(storage.glob("*.pb"))
+    if not files:
+        sys.exit(f"No .pb files in {storage}")
+    field_map = load_field_map()
+
+    with conv_index.open_index() as index:
+        known = index.get_many(p.stem for p in files)
+
+    due = []
+    for p in files:
+        entry = known.get(p.stem, {})
+        if not force and entry.get("exported") and entry.get("last_modified") == _iso(p.stat().st_mtime) \
+                and entry.get("export_path") and Path(entry["export_path"]).exists():
+            continue
+        due.append((p, entry))
+
+    print(f"{len(files)} conversation file(s) in {storage}; {len(due)} to export "
+          f"on {min(workers, max(len(due), 1))} process(es).")
+    if not due:
+        return
+
+    started = time.perf_counter()
+    updates: dict[str, dict] = {}
+    failed: list[tuple[str, str]] = []
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(due)))) as pool:
+        futures = [pool.submit(export_file, str(p), entry, field_map) for p, entry in due]
+        for future in as_completed(futures):
+            uuid, entry, error = future.result()
+            if entry:
+                updates[uuid] = entry
+            else:
+                failed.append((uuid, error))
+
+    with conv_index.open_index() as index:
+        index.upsert_many(updates)
+
+    elapsed = time.perf_counter() - started
+    print(f"Exported {len(updates)} in {elapsed:.1f}s  |  Skipped/failed: {len(failed)}")
+    for uuid, error in failed[:20]:
+        print(f"  [{uuid[:8]}] {error}")
+    if len(failed) > 20:
+        print(f"  …and {len(failed) - 20} more")
+
+
+def cmd_dump(target: str, storage: Path) -> None:
+    path = Path(target)
+    if not path.exists():
+        path = storage / f"{target}.pb"
+    data = path.read_bytes()
+    try:
+        print(json.dumps(dump(data), indent=1, ensure_ascii=False))
+    except DecodeError as e:
+        sys.exit(f"{path.name} is not protobuf wire format ({e}); it may be encrypted.")
+    _trajectory_id, steps = decode_trajectory(data, load_field_map())
+    kinds = {}
+    for step in steps:
+        kinds[step["type"] or "(unmapped)"] = kinds.get(step["type"] or "(unmapped)", 0) + 1
+    print(f"\n{len(steps)} step(s) with the current field map: {kinds}", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export Cascade conversations from Windsurf's on-disk storage")
+    parser.add_argument("--storage", type=Path, default=watcher.CASCADE_DIR,
+                        help=f"Directory of <cascade id>.pb files (default: {watcher.CASCADE_DIR})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes")
+    parser.add_argument("--force", action="store_true", help="Re-export conversations that look unchanged")
+    parser.add_argument("--dump", metavar="ID_OR_PATH", help="Print the decoded tree of one .pb file")
+    args = parser.parse_args()
+
+    if args.dump:
+        cmd_dump(args.dump, args.storage)
+    else:
+        cmd_export(args.storage, args.workers, args.force)
+
+
+if __name__ == "__main__":
+    main()
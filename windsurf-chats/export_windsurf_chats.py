@@ -2,8 +2,8 @@
 export_windsurf_chats.py
 
 Helper script for the /export-chats Windsurf workflow.
-Manages an index.json that tracks which Windsurf conversations have been
-exported to the Obsidian vault.
+Manages the conversation index (index.db, see conv_index.py) that tracks
+which Windsurf conversations have been exported to the Obsidian vault.
 
 Windsurf trajectory data is server-side only; UUIDs must be provided manually
 (copy from the Windsurf chat history panel) or via --add.
@@ -23,17 +23,18 @@ Usage:
 """
 
 import argparse
-import json
+import os
 import re
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+import conv_index
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = Path(__file__).parent
-INDEX_FILE = SCRIPT_DIR / "index.json"
 
 
 def _load_dotenv() -> dict[str, str]:
@@ -74,45 +75,31 @@ def slugify(text: str) -> str:
     return text[:60]
 
 
-def load_index() -> dict:
-    if INDEX_FILE.exists():
-        with open(INDEX_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    return {"conversations": {}, "last_updated": None}
-
-
-def save_index(index: dict) -> None:
-    index["last_updated"] = datetime.now(timezone.utc).isoformat()
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
-    print(f"Index saved → {INDEX_FILE}")
-
-
 
 # ---------------------------------------------------------------------------
 # Commands
 # ---------------------------------------------------------------------------
 
 def cmd_add(uuid: str, category: str, title: str) -> None:
-    index = load_index()
-    if uuid in index["conversations"]:
-        print(f"Already in index: {uuid} — {index['conversations'][uuid]['title']}")
-        return
-    index["conversations"][uuid] = {
-        "uuid": uuid,
-        "title": title,
-        "category": category,
-        "exported": False,
-        "export_path": None,
-        "added_at": datetime.now(timezone.utc).isoformat(),
-    }
-    save_index(index)
+    with conv_index.open_index() as index:
+        added = index.add(uuid, {
+            "uuid": uuid,
+            "title": title,
+            "category": category,
+            "exported": False,
+            "export_path": None,
+            "added_at": datetime.now(timezone.utc).isoformat(),
+        })
+        if not added:
+            print(f"Already in index: {uuid} — {index.get(uuid)['title']}")
+            return
+        print(f"Index saved → {index.path}")
     print(f"Added to index: {uuid} — {title}")
 
 
 def cmd_status() -> None:
-    index = load_index()
-    convos = list(index["conversations"].values())
+    with conv_index.open_index() as index:
+        convos = index.all()
     exported = [c for c in convos if c["exported"]]
     pending = [c for c in convos if not c["exported"]]
     print(f"Total tracked: {len(convos)}  |  Exported: {len(exported)}  |  Pending: {len(pending)}")
@@ -127,33 +114,27 @@ def cmd_status() -> None:
 
 
 def cmd_mark_exported(uuid: str, category: str, title: str) -> None:
-    index = load_index()
     slug = slugify(title)
     short = uuid[:8]
     filename = f"{slug}_{short}.md"
     export_path = str(OBSIDIAN_CHATS_DIR / filename)
 
-    if uuid in index["conversations"]:
-        index["conversations"][uuid]["exported"] = True
-        index["conversations"][uuid]["export_path"] = export_path
-        index["conversations"][uuid]["exported_at"] = datetime.now(timezone.utc).isoformat()
-    else:
-        index["conversations"][uuid] = {
-            "uuid": uuid,
-            "title": title,
-            "category": category,
-            "exported": True,
-            "export_path": export_path,
-            "exported_at": datetime.now(timezone.utc).isoformat(),
-        }
-
-    save_index(index)
+    fields = {
+        "exported": True,
+        "export_path": export_path,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with conv_index.open_index() as index:
+        if uuid not in index:
+            fields = {"uuid": uuid, "title": title, "category": category, **fields}
+        index.upsert(uuid, fields)
+        print(f"Index saved → {index.path}")
     print(f"Marked exported: {uuid} → {export_path}")
 
 
 def cmd_list_pending() -> None:
-    index = load_index()
-    pending = [v for v in index["conversations"].values() if not v["exported"]]
+    with conv_index.open_index() as index:
+        pending = index.pending()
     if not pending:
         print("No pending conversations.")
         return
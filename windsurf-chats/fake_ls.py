@@ -0,0 +1,275 @@
+"""
+fake_ls.py
+
+Local stand-in for the Windsurf language server's Connect JSON API, for
+measuring the watcher on any OS without Windsurf installed.
+
+Serves synthetic conversations at
+http://127.0.0.1:{port}/exa.language_server_pb.LanguageServerService/<Method>:
+
+  GetAllCascadeTrajectories   summaries for every conversation
+  GetCascadeTrajectory        {"trajectory": {"steps": [...]}}
+  GetCascadeTrajectorySteps   {"steps": [...]} from stepOffset (disable with --no-paged;
+                              --paged-offset-field other reads another field, so
+                              stepOffset is ignored as an unknown field would be)
+  Heartbeat                   {}
+
+GetAllCascadeTrajectories and GetCascadeTrajectory also answer Connect's
+binary encoding (Content-Type application/proto, via ls_proto.py's
+encoders) unless --no-proto, which makes them refuse it with 415 like a
+server without the codec.
+
+Steps are generated on demand from (conversation, step index), so 10,000
+conversations cost no memory beyond their step counts.  The x-codeium-csrf-token
+header must match --csrf.  Each request sleeps --latency-ms first.
+
+Benchmarks drive and observe it through two extra endpoints:
+  POST /_fake/advance {"conversations": N, "steps": M}
+      appends M steps to N conversations (round-robin) and bumps their
+      lastModifiedTime, as if they were being chatted in.
+  POST /_fake/stats
+      {"requests": ..., "bytes_sent": ...} served so far (LS methods only).
+
+Usage:
+  python fake_ls.py --conversations 1000 --steps 40 --latency-ms 2
+  python fake_ls.py --port 42100 --csrf test-token
+
+From Python:
+  server = FakeLanguageServer(conversations=100, steps=40)
+  port = server.start()          # background thread
+  ...
+  server.stop()
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import ls_discovery
+import ls_proto
+from pb_wire import DecodeError, Message
+
+SERVICE = ls_discovery.SERVICE
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+FILLER = (
+    "The quick brown fox jumps over the lazy dog while the build runs and "
+    "the tests report back with a handful of warnings worth a second look. "
+)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def make_step(conv: int, i: int) -> dict:
+    """Deterministic synthetic step i of conversation conv, in LS JSON shape."""
+    kind = i % 6
+    if kind == 0:
+        return {"type": "CORTEX_STEP_TYPE_USER_INPUT",
+                "userInput": {"userResponse": f"Question {i} about module {conv % 97}\n{FILLER[:80]}"}}
+    if kind in (1, 4):
+        return {"type": "CORTEX_STEP_TYPE_PLANNER_RESPONSE",
+                "plannerResponse": {"response": f"Answer {i}. " + FILLER * (1 + (conv + i) % 4)}}
+    if kind == 2:
+        return {"type": "CORTEX_STEP_TYPE_CODE_ACTION",
+                "codeAction": {"actionSpec": {"absoluteUri": f"file:///c:/src/proj{conv % 13}/mod{i % 17}.py"}}}
+    if kind == 3:
+        return {"type": "CORTEX_STEP_TYPE_RUN_COMMAND",
+                "runCommand": {"commandLine": f"python -m pytest tests/test_mod{i % 11}.py -q"}}
+    return {"type": "CORTEX_STEP_TYPE_VIEW_FILE",
+            "viewFile": {"absolutePathUri": f"file:///c:/src/proj{conv % 13}/mod{i % 17}.py"}}
+
+
+class FakeLanguageServer:
+    def __init__(self, conversations: int = 100, steps: int = 40, latency_ms: float = 0.0,
+                 csrf: str = "fake-csrf-token", paged: bool = True, proto: bool = True,
+                 port: int = 0, paged_offset_field: str = "stepOffset"):
+        self.csrf = csrf
+        self.proto = proto
+        self.field_map = ls_proto.load_field_map()
+        self.latency = latency_ms / 1000
+        self.paged = paged
+        self.paged_offset_field = paged_offset_field
+        self.ids = [f"{n:08x}-fake-4000-8000-{n:012x}" for n in range(conversations)]
+        self.step_counts = [steps + n % 7 for n in range(conversations)]
+        self.modified = [BASE_TIME + timedelta(minutes=n) for n in range(conversations)]
+        self._by_id = {cid: n for n, cid in enumerate(self.ids)}
+        self._advance_next = 0
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    # -----------------------------------------------------------------------
+    # Responses
+    # -----------------------------------------------------------------------
+
+    def summaries(self) -> dict:
+        out = {}
+        for n, cid in enumerate(self.ids):
+            out[cid] = {
+                "summary": f"Synthetic conversation {n}",
+                "stepCount": self.step_counts[n],
+                "trajectoryId": f"traj-{n:08x}",
+                "createdTime": _iso(BASE_TIME + timedelta(minutes=n)),
+                "lastModifiedTime": _iso(self.modified[n]),
+                "lastUserInputTime": _iso(self.modified[n]),
+                "lastGeneratorModelUid": "MODEL_FAKE",
+                "workspaces": [{"repository": {"computedName": f"proj{n % 13}"}}],
+            }
+        return {"trajectorySummaries": out}
+
+    def steps(self, cascade_id: str, offset: int = 0) -> list[dict] | None:
+        n = self._by_id.get(cascade_id)
+        if n is None:
+            return None
+        return [make_step(n, i) for i in range(offset, self.step_counts[n])]
+
+    def advance(self, conversations: int, steps: int) -> list[str]:
+        """Add steps to the next `conversations` conversations (round-robin)."""
+        touched = []
+        with self.lock:
+            now = datetime.now(timezone.utc)
+            for _ in range(min(conversations, len(self.ids))):
+                n = self._advance_next
+                self._advance_next = (n + 1) % len(self.ids)
+                self.step_counts[n] += steps
+                self.modified[n] = now
+                touched.append(self.ids[n])
+        return touched
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real LS
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: dict | bytes, count: bool = True) -> None:
+                binary = isinstance(body, bytes)
+                data = body if binary else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/proto" if binary else "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                if not count:
+                    return
+                with server.lock:
+                    server.requests += 1
+                    server.bytes_sent += len(data)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                binary = self.headers.get("Content-Type", "").startswith("application/proto")
+                try:
+                    req = self._proto_request(raw) if binary else json.loads(raw or b"{}")
+                except (ValueError, DecodeError):
+                    return self._send(400, {"code": "invalid_argument"})
+
+                if self.path == "/_fake/advance":
+                    touched = server.advance(req.get("conversations", 1), req.get("steps", 1))
+                    return self._send(200, {"touched": touched}, count=False)
+                if self.path == "/_fake/stats":
+                    with server.lock:
+                        stats = {"requests": server.requests, "bytes_sent": server.bytes_sent}
+                    return self._send(200, stats, count=False)
+
+                if server.latency:
+                    time.sleep(server.latency)
+                if self.headers.get("x-codeium-csrf-token") != server.csrf:
+                    return self._send(401, {"code": "unauthenticated", "message": "bad csrf token"})
+
+                method = self.path.rsplit("/", 1)[-1]
+                if not self.path.startswith(f"/{SERVICE}/"):
+                    return self._send(404, {"code": "not_found"})
+                if binary and (not server.proto or method not in ("GetAllCascadeTrajectories", "GetCascadeTrajectory")):
+                    return self._send(415, {"code": "unimplemented", "message": "application/proto not supported"})
+                if method == "Heartbeat":
+                    return self._send(200, {})
+                if method == "GetAllCascadeTrajectories":
+                    summaries = server.summaries()
+                    if binary:
+                        return self._send(200, ls_proto.encode_all_trajectories_response(
+                            summaries["trajectorySummaries"], server.field_map))
+                    return self._send(200, summaries)
+                if method == "GetCascadeTrajectory":
+                    cascade_id = req.get("cascadeId", "")
+                    steps = server.steps(cascade_id)
+                    if steps is None:
+                        return self._send(404, {"code": "not_found"})
+                    trajectory_id = f"traj-{server._by_id[cascade_id]:08x}"
+                    if binary:
+                        return self._send(200, ls_proto.encode_get_trajectory_response(
+                            trajectory_id, steps, server.field_map))
+                    return self._send(200, {"trajectory": {"trajectoryId": trajectory_id, "steps": steps}})
+                if method == "GetCascadeTrajectorySteps" and server.paged:
+                    steps = server.steps(req.get("cascadeId", ""), int(req.get(server.paged_offset_field, 0)))
+                    if steps is None:
+                        return self._send(404, {"code": "not_found"})
+                    return self._send(200, {"steps": steps})
+                return self._send(404, {"code": "unimplemented", "message": f"{method} is not implemented"})
+
+            def _proto_request(self, raw: bytes) -> dict:
+                if self.path.endswith("/GetCascadeTrajectory"):
+                    return {"cascadeId": Message.parse(raw).string(server.field_map["cascade_id"])}
+                Message.parse(raw)  # validate only: the other methods take no fields
+                return {}
+
+        return Handler
+
+    # -----------------------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------------------
+
+    def start(self) -> int:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Windsurf language server for benchmarks")
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=40, help="Steps per conversation (roughly)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before every response")
+    parser.add_argument("--csrf", default="fake-csrf-token")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--no-paged", action="store_true", help="Don't implement GetCascadeTrajectorySteps")
+    parser.add_argument("--no-proto", action="store_true", help="Refuse application/proto requests")
+    parser.add_argument("--paged-offset-field", default="stepOffset",
+                        help="Request field GetCascadeTrajectorySteps reads its offset from")
+    args = parser.parse_args()
+
+    server = FakeLanguageServer(args.conversations, args.steps, args.latency_ms, args.csrf,
+                                paged=not args.no_paged, proto=not args.no_proto, port=args.port,
+                                paged_offset_field=args.paged_offset_field)
+    print(f"Fake language server on 127.0.0.1:{server.port}  (csrf {args.csrf})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ fetch_conversations.py
 
 Uses the Windsurf/Codeium API key stored locally to fetch the full
 conversation list from server.self-serve.windsurf.com, then writes
-all discovered UUIDs into index.json for export.
+all discovered UUIDs into the conversation index (index.db) for export.
 
 Run:
   python fetch_conversations.py           -- fetch and update index
@@ -16,16 +16,16 @@ import os
 import re
 import sqlite3
 import sys
-from datetime import datetime, timezone
 from pathlib import Path
 
 import requests
 
+import conv_index
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = Path(__file__).parent
-INDEX_FILE = SCRIPT_DIR / "index.json"
 APPDATA = os.environ["APPDATA"]
 GS_DB = Path(APPDATA) / "Windsurf" / "User" / "globalStorage" / "state.vscdb"
 
@@ -152,40 +152,24 @@ def slugify(text: str) -> str:
     return text[:60]
 
 
-def load_index() -> dict:
-    if INDEX_FILE.exists():
-        with open(INDEX_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    return {"conversations": {}, "last_updated": None}
-
-
-def save_index(index: dict) -> None:
-    index["last_updated"] = datetime.now(timezone.utc).isoformat()
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
-    print(f"Index saved → {INDEX_FILE}")
-
-
 def update_index_from_conversations(convos: list[dict]) -> None:
-    index = load_index()
-    new_count = 0
+    entries: dict[str, dict] = {}
     for c in convos:
         uuid = c.get("id") or c.get("uuid") or c.get("conversation_id")
         if not uuid:
             continue
-        if uuid not in index["conversations"]:
-            index["conversations"][uuid] = {
-                "uuid": uuid,
-                "title": c.get("title") or c.get("name") or "Untitled",
-                "category": "cascade",
-                "created_at": c.get("created_at") or c.get("createdAt"),
-                "exported": False,
-                "export_path": None,
-            }
-            new_count += 1
-    save_index(index)
-    total = len(index["conversations"])
-    pending = sum(1 for v in index["conversations"].values() if not v["exported"])
+        entries.setdefault(uuid, {
+            "uuid": uuid,
+            "title": c.get("title") or c.get("name") or "Untitled",
+            "category": "cascade",
+            "created_at": c.get("created_at") or c.get("createdAt"),
+            "exported": False,
+            "export_path": None,
+        })
+    with conv_index.open_index() as index:
+        new_count = index.add_many(entries)
+        print(f"Index saved → {index.path}")
+        total, pending = index.counts()
     print(f"Index: {total} total, {pending} pending, {new_count} newly added.")
 
 
@@ -24,6 +24,9 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+import conv_index
+from note_writer import write_if_changed
+
 # ---------------------------------------------------------------------------
 # Configuration — override via environment variables for portability
 # ---------------------------------------------------------------------------
@@ -64,9 +67,6 @@ def get_vault_chats_dir() -> Path:
     return Path(DEFAULT_VAULT_PATH_POSIX) / "Chats"
 
 
-# Index file lives alongside this script
-INDEX_FILE = Path(__file__).parent / "index.json"
-
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -78,101 +78,101 @@ def slugify(text: str) -> str:
     return text[:60]
 
 
-def load_index() -> dict:
-    if INDEX_FILE.exists():
-        with open(INDEX_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    return {"conversations": {}, "last_updated": None}
+# ---------------------------------------------------------------------------
+# Transcript parsing
+# ---------------------------------------------------------------------------
 
+# How much of each list the note shows; the parser keeps no more than this
+PROMPTS_SHOWN  = 3
+FILES_SHOWN    = 10
+COMMANDS_SHOWN = 5
 
-def save_index(index: dict) -> None:
-    index["last_updated"] = datetime.now(timezone.utc).isoformat()
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
 
+def iter_steps(path: Path):
+    """Yield the transcript's steps one at a time, skipping blank and
+    malformed lines, so a huge transcript is never held in memory."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
 
-# ---------------------------------------------------------------------------
-# Transcript parsing
-# ---------------------------------------------------------------------------
 
 def parse_transcript(jsonl_path: str) -> dict:
-    """Parse the Windsurf JSONL transcript file.
+    """Parse the Windsurf JSONL transcript file in one streaming pass.
+
+    Only what build_note() shows is kept — the first few prompts, the last
+    AI response, the first few distinct files/commands — plus counts, so
+    memory stays flat however long the transcript is.  Files and commands
+    are de-duplicated with sets.
 
     Returns a dict with:
-      trajectory_id  — derived from filename
-      steps          — list of raw step dicts
-      user_messages  — list of user prompt strings
-      ai_responses   — list of planner response strings
-      files_changed  — list of file paths written
-      commands_run   — list of command strings executed
-      first_ts       — ISO timestamp of first step (if available)
-      title          — best-effort title from first user message
+      trajectory_id      — derived from filename
+      step_count         — number of steps parsed
+      user_messages      — first PROMPTS_SHOWN user prompt strings
+      user_message_count — total user prompts
+      last_ai_response   — final planner response string ("" if none)
+      files_changed      — first FILES_SHOWN distinct file paths written
+      files_changed_count
+      commands_run       — first COMMANDS_SHOWN distinct commands executed
+      commands_run_count
+      first_ts           — ISO timestamp of first step (if available)
+      title              — best-effort title from first user message
     """
     path = Path(jsonl_path)
     trajectory_id = path.stem  # filename without .jsonl
 
-    steps = []
+    step_count = 0
     user_messages = []
-    ai_responses = []
+    user_message_count = 0
+    last_ai_response = ""
+    files_seen: set[str] = set()
     files_changed = []
+    commands_seen: set[str] = set()
     commands_run = []
     first_ts = None
 
-    if not path.exists():
-        return {
-            "trajectory_id": trajectory_id,
-            "steps": [],
-            "user_messages": [],
-            "ai_responses": [],
-            "files_changed": [],
-            "commands_run": [],
-            "first_ts": None,
-            "title": "Untitled Conversation",
-        }
+    for step in (iter_steps(path) if path.exists() else ()):
+        step_count += 1
+        step_type = step.get("type", "")
 
-    with open(path, encoding="utf-8", errors="replace") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                step = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            steps.append(step)
-            step_type = step.get("type", "")
+        # Extract timestamp (not always present)
+        if first_ts is None and step.get("timestamp"):
+            first_ts = step["timestamp"]
 
-            # Extract timestamp (not always present)
-            if first_ts is None and step.get("timestamp"):
-                first_ts = step["timestamp"]
-
-            # User input
-            if step_type == "user_input":
-                ui = step.get("user_input", {})
-                prompt = ui.get("user_response", "")
-                if prompt:
+        # User input
+        if step_type == "user_input":
+            prompt = step.get("user_input", {}).get("user_response", "")
+            if prompt:
+                user_message_count += 1
+                if len(user_messages) < PROMPTS_SHOWN:
                     user_messages.append(prompt)
 
-            # AI planner responses
-            elif step_type == "planner_response":
-                pr = step.get("planner_response", {})
-                response = pr.get("response", "")
-                if response:
-                    ai_responses.append(response)
-
-            # File writes
-            elif step_type == "code_action":
-                ca = step.get("code_action", {})
-                fpath = ca.get("path", "")
-                if fpath and fpath not in files_changed:
+        # AI planner responses — the note only uses the last one
+        elif step_type == "planner_response":
+            response = step.get("planner_response", {}).get("response", "")
+            if response:
+                last_ai_response = response
+
+        # File writes
+        elif step_type == "code_action":
+            fpath = step.get("code_action", {}).get("path", "")
+            if fpath and fpath not in files_seen:
+                files_seen.add(fpath)
+                if len(files_changed) < FILES_SHOWN:
                     files_changed.append(fpath)
 
-            # Commands run
-            elif step_type == "terminal_action":
-                ta = step.get("terminal_action", {})
-                cmd = ta.get("command", "") or ta.get("command_line", "")
-                if cmd and cmd not in commands_run:
+        # Commands run
+        elif step_type == "terminal_action":
+            ta = step.get("terminal_action", {})
+            cmd = ta.get("command", "") or ta.get("command_line", "")
+            if cmd and cmd not in commands_seen:
+                commands_seen.add(cmd)
+                if len(commands_run) < COMMANDS_SHOWN:
                     commands_run.append(cmd)
 
     # Derive title from first user message
@@ -188,11 +188,14 @@ def parse_transcript(jsonl_path: str) -> dict:
 
     return {
         "trajectory_id": trajectory_id,
-        "steps": steps,
+        "step_count": step_count,
         "user_messages": user_messages,
-        "ai_responses": ai_responses,
+        "user_message_count": user_message_count,
+        "last_ai_response": last_ai_response,
         "files_changed": files_changed,
+        "files_changed_count": len(files_seen),
         "commands_run": commands_run,
+        "commands_run_count": len(commands_seen),
         "first_ts": first_ts,
         "title": title,
     }
@@ -206,7 +209,7 @@ def build_note(data: dict, uuid: str, workspace: str) -> str:
     """Build the Obsidian markdown note content."""
     title = data["title"]
     trajectory_id = data["trajectory_id"]
-    steps_count = len(data["steps"])
+    steps_count = data["step_count"]
     first_ts = data["first_ts"]
 
     # Date
@@ -238,9 +241,9 @@ def build_note(data: dict, uuid: str, workspace: str) -> str:
     # Summary section — use last AI response as summary if available
     lines.append("## Summary")
     lines.append("")
-    if data["ai_responses"]:
+    if data["last_ai_response"]:
         # Use the final planner response, truncated
-        summary = data["ai_responses"][-1].strip()
+        summary = data["last_ai_response"].strip()
         if len(summary) > 500:
             summary = summary[:500] + "…"
         lines.append(summary)
@@ -252,13 +255,13 @@ def build_note(data: dict, uuid: str, workspace: str) -> str:
     if data["user_messages"]:
         lines.append("## User Prompts")
         lines.append("")
-        for i, msg in enumerate(data["user_messages"][:3], 1):
+        for i, msg in enumerate(data["user_messages"][:PROMPTS_SHOWN], 1):
             short = msg.strip().replace("\n", " ")
             if len(short) > 200:
                 short = short[:200] + "…"
             lines.append(f"{i}. {short}")
-        if len(data["user_messages"]) > 3:
-            lines.append(f"*…and {len(data['user_messages']) - 3} more prompts*")
+        if data["user_message_count"] > PROMPTS_SHOWN:
+            lines.append(f"*…and {data['user_message_count'] - PROMPTS_SHOWN} more prompts*")
         lines.append("")
 
     # Key outcomes
@@ -269,30 +272,32 @@ def build_note(data: dict, uuid: str, workspace: str) -> str:
     if data["files_changed"]:
         has_outcomes = True
         lines.append("**Files changed:**")
-        for f in data["files_changed"][:10]:
+        for f in data["files_changed"][:FILES_SHOWN]:
             lines.append(f"- `{f}`")
-        if len(data["files_changed"]) > 10:
-            lines.append(f"- *…and {len(data['files_changed']) - 10} more*")
+        if data["files_changed_count"] > FILES_SHOWN:
+            lines.append(f"- *…and {data['files_changed_count'] - FILES_SHOWN} more*")
         lines.append("")
 
     if data["commands_run"]:
         has_outcomes = True
         lines.append("**Commands run:**")
-        for cmd in data["commands_run"][:5]:
+        for cmd in data["commands_run"][:COMMANDS_SHOWN]:
             short_cmd = cmd.strip()
             if len(short_cmd) > 120:
                 short_cmd = short_cmd[:120] + "…"
             lines.append(f"- `{short_cmd}`")
-        if len(data["commands_run"]) > 5:
-            lines.append(f"- *…and {len(data['commands_run']) - 5} more*")
+        if data["commands_run_count"] > COMMANDS_SHOWN:
+            lines.append(f"- *…and {data['commands_run_count'] - COMMANDS_SHOWN} more*")
         lines.append("")
 
     if not has_outcomes:
         lines.append("*No file changes or commands captured in transcript.*")
         lines.append("")
 
+    # No timestamp, so an unchanged transcript renders identically and the
+    # write is skipped; the export time is kept in the index.
     lines.append(f"---")
-    lines.append(f"*Auto-exported by Windsurf hook on {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')} UTC*")
+    lines.append(f"*Auto-exported by Windsurf hook*")
 
     return "\n".join(lines)
 
@@ -339,18 +344,20 @@ def main() -> None:
     # Parse transcript
     data = parse_transcript(transcript_path)
     trajectory_id = data["trajectory_id"]
-    dlog(f"transcript parsed: trajectory_id={trajectory_id!r}, steps={len(data['steps'])}, title={data['title']!r}")
+    dlog(f"transcript parsed: trajectory_id={trajectory_id!r}, steps={data['step_count']}, title={data['title']!r}")
 
     # Look up index for this trajectory to get UUID and workspace
-    index = load_index()
     uuid = trajectory_id  # fallback: use trajectory_id as identifier
     workspace = ""
-
-    for uid, conv in index.get("conversations", {}).items():
-        if conv.get("trajectory_id") == trajectory_id or uid == trajectory_id:
-            uuid = uid
-            workspace = conv.get("workspace", "")
-            break
+    existing = None
+    try:
+        with conv_index.open_index() as index:
+            existing = index.find(trajectory_id)
+    except Exception as e:
+        dlog(f"WARNING: index lookup failed: {e}")
+    if existing:
+        uuid = existing["uuid"]
+        workspace = existing.get("workspace", "")
 
     # Build note
     note_content = build_note(data, uuid, workspace)
@@ -368,39 +375,42 @@ def main() -> None:
     filename = f"{slug}_{short_id}.md"
     note_path = vault_chats_dir / filename
 
-    # Write note (overwrite on each response — keeps it updated)
+    # Write note on each response that changed it (atomic replace)
+    known_hash = None
+    if existing and existing.get("export_path") == str(note_path):
+        known_hash = existing.get("note_hash")
     try:
-        with open(note_path, "w", encoding="utf-8") as f:
-            f.write(note_content)
-        dlog(f"Note written: {note_path}")
+        written, note_hash = write_if_changed(note_path, note_content, known_hash)
+        dlog(f"Note {'written' if written else 'unchanged'}: {note_path}")
     except Exception as e:
         dlog(f"ERROR: failed to write note: {e}")
         print(f"[hook_export] ERROR: failed to write note: {e}", file=sys.stderr)
         sys.exit(0)
 
     # Update index
-    step_count = len(data["steps"])
-    if uuid not in index["conversations"]:
-        index["conversations"][uuid] = {
+    step_count = data["step_count"]
+    fields = {
+        "exported": True,
+        "export_path": str(note_path),
+        "step_count": step_count,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "note_hash": note_hash,
+        "search_text": note_content,  # for search_chats.py
+    }
+    if not existing:
+        fields = {
             "uuid": uuid,
             "trajectory_id": trajectory_id,
             "title": data["title"],
             "category": "cascade",
-            "step_count": step_count,
             "workspace": workspace,
             "created_at": data["first_ts"],
-            "exported": True,
-            "export_path": str(note_path),
-            "exported_at": datetime.now(timezone.utc).isoformat(),
+            **fields,
         }
-    else:
-        index["conversations"][uuid]["exported"] = True
-        index["conversations"][uuid]["export_path"] = str(note_path)
-        index["conversations"][uuid]["step_count"] = step_count
-        index["conversations"][uuid]["exported_at"] = datetime.now(timezone.utc).isoformat()
 
     try:
-        save_index(index)
+        with conv_index.open_index() as index:
+            index.upsert(uuid, fields)
     except Exception as e:
         print(f"[hook_export] WARNING: index save failed: {e}", file=sys.stderr)
 
@@ -0,0 +1,348 @@
+"""
+ls_discovery.py
+
+Finds the locally running Windsurf language server: its PID, the loopback
+port its HTTP (Connect) API listens on, and the --csrf_token it was started
+with.
+
+Discovery is one in-process pass, no PowerShell per step:
+  - psutil, when installed (any OS);
+  - otherwise /proc on Linux (cmdline, fd -> socket inodes, /proc/net/tcp);
+  - otherwise, on Windows, a single PowerShell call that returns processes
+    and their listening ports together.
+
+Several Windsurf windows each run their own language server.  discover()
+returns one of them; discover_all() returns every instance that answers.
+
+Each instance's (pid, port, csrf_token) is saved to ls_cache.json.  discover()
+checks the saved entries first — PID still running with the same token,
+plus one small request to the port — so a normal start needs no
+enumeration or port scan.  discover_all() has to enumerate processes to
+find new windows, but probes a saved instance's known port first, so an
+unchanged set of instances costs one request each.
+
+Usage from other scripts:
+  from ls_discovery import discover, discover_all
+  info = discover()            # LSInfo or None
+  infos = discover_all()       # [LSInfo, ...]
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import requests
+
+try:
+    import psutil
+except ImportError:  # optional — /proc or PowerShell is used instead
+    psutil = None
+
+SCRIPT_DIR = Path(__file__).parent
+CACHE_FILE = SCRIPT_DIR / "ls_cache.json"
+
+SERVICE = "exa.language_server_pb.LanguageServerService"
+# language_server_windows_x64.exe, language_server_linux_x64, language_server_macos_arm, ...
+LS_NAME_RE = re.compile(r"language_server_(windows|linux|macos)", re.IGNORECASE)
+CSRF_RE = re.compile(r"--csrf_token[\s=](\S+)")
+
+# Cheap unary call used to recognise the HTTP port and validate the token.
+# An unknown method still gets a Connect JSON error, which is enough to tell
+# the API port apart from the LSP / gRPC ports.
+PROBE_METHOD = "Heartbeat"
+PROBE_TIMEOUT = 3
+
+log = logging.getLogger("ls_discovery")
+
+
+@dataclass
+class LSInfo:
+    pid: int
+    port: int
+    csrf_token: str
+
+
+# ---------------------------------------------------------------------------
+# Probing
+# ---------------------------------------------------------------------------
+
+def probe(port: int, csrf_token: str, session: requests.Session | None = None) -> int | None:
+    """POST the probe method; return the HTTP status if the port speaks
+    Connect JSON, else None."""
+    http = session or requests
+    try:
+        r = http.post(
+            f"http://127.0.0.1:{port}/{SERVICE}/{PROBE_METHOD}",
+            headers={"Content-Type": "application/json", "x-codeium-csrf-token": csrf_token},
+            json={},
+            timeout=PROBE_TIMEOUT,
+        )
+    except requests.exceptions.RequestException:
+        return None
+    if r.status_code == 200 or r.headers.get("Content-Type", "").startswith("application/json"):
+        return r.status_code
+    return None
+
+
+def _token_accepted(status: int | None) -> bool:
+    return status is not None and status not in (401, 403)
+
+
+# ---------------------------------------------------------------------------
+# Process + socket enumeration
+# ---------------------------------------------------------------------------
+
+def _csrf_from_cmdline(cmdline: str) -> str | None:
+    if not LS_NAME_RE.search(cmdline):
+        return None
+    m = CSRF_RE.search(cmdline)
+    return m.group(1) if m else None
+
+
+def _candidates_psutil() -> list[tuple[int, str, list[int]]]:
+    found = []
+    for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+        try:
+            cmdline = " ".join(proc.info["cmdline"] or [])
+            csrf = _csrf_from_cmdline(cmdline)
+            if not csrf:
+                continue
+            conns = proc.net_connections(kind="tcp") if hasattr(proc, "net_connections") \
+                else proc.connections(kind="tcp")
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        ports = sorted({
+            c.laddr.port for c in conns
+            if c.status == psutil.CONN_LISTEN and c.laddr.ip in ("127.0.0.1", "::1")
+        })
+        found.append((proc.info["pid"], csrf, ports))
+    return found
+
+
+def _proc_listening_inodes() -> dict[str, int]:
+    """{socket inode: port} for loopback TCP sockets in LISTEN state."""
+    inodes: dict[str, int] = {}
+    for table, loopback in (("/proc/net/tcp", "0100007F"), ("/proc/net/tcp6", "00000000000000000000000001000000")):
+        try:
+            with open(table, encoding="ascii") as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    local, state, inode = fields[1], fields[3], fields[9]
+                    addr, port_hex = local.split(":")
+                    if state == "0A" and addr == loopback:
+                        inodes[inode] = int(port_hex, 16)
+        except OSError:
+            continue
+    return inodes
+
+
+def _candidates_proc() -> list[tuple[int, str, list[int]]]:
+    found = []
+    listening = None
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+        except OSError:
+            continue
+        csrf = _csrf_from_cmdline(cmdline)
+        if not csrf:
+            continue
+        if listening is None:
+            listening = _proc_listening_inodes()
+        ports = set()
+        try:
+            for fd in os.scandir(f"/proc/{entry.name}/fd"):
+                try:
+                    target = os.readlink(fd.path)
+                except OSError:
+                    continue
+                if target.startswith("socket:["):
+                    port = listening.get(target[8:-1])
+                    if port:
+                        ports.add(port)
+        except OSError:
+            continue
+        found.append((int(entry.name), csrf, sorted(ports)))
+    return found
+
+
+_PS_SCRIPT = (
+    "Get-CimInstance Win32_Process -Filter \"Name LIKE 'language_server%'\" | ForEach-Object { "
+    "[pscustomobject]@{ ProcessId = $_.ProcessId; CommandLine = $_.CommandLine; "
+    "Ports = @(Get-NetTCPConnection -OwningProcess $_.ProcessId -State Listen "
+    "-ErrorAction SilentlyContinue | Where-Object { $_.LocalAddress -eq '127.0.0.1' } "
+    "| Select-Object -ExpandProperty LocalPort) } } | ConvertTo-Json -Depth 3"
+)
+
+
+def _candidates_powershell() -> list[tuple[int, str, list[int]]]:
+    ps = subprocess.run(
+        ["powershell", "-NoProfile", "-Command", _PS_SCRIPT],
+        capture_output=True, text=True, timeout=20,
+    )
+    if not ps.stdout.strip():
+        return []
+    procs = json.loads(ps.stdout)
+    if isinstance(procs, dict):
+        procs = [procs]
+    found = []
+    for p in procs:
+        csrf = _csrf_from_cmdline(p.get("CommandLine") or "")
+        if csrf:
+            found.append((int(p["ProcessId"]), csrf, sorted(int(x) for x in p.get("Ports") or [])))
+    return found
+
+
+def find_candidates() -> list[tuple[int, str, list[int]]]:
+    """Every running language server as (pid, csrf_token, loopback listening ports)."""
+    if psutil is not None:
+        return _candidates_psutil()
+    if sys.platform.startswith("linux") and os.path.isdir("/proc"):
+        return _candidates_proc()
+    if sys.platform == "win32":
+        return _candidates_powershell()
+    raise RuntimeError("Language server discovery needs psutil on this platform (pip install psutil).")
+
+
+def _cmdline_of(pid: int) -> str | None:
+    """Command line of a running PID, or None if it's gone / unreadable."""
+    if psutil is not None:
+        try:
+            return " ".join(psutil.Process(pid).cmdline())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+    except OSError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def load_cached_all() -> list[LSInfo]:
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, dict):
+        return []
+    # Older caches held a single instance
+    entries = data.get("instances", []) if "instances" in data else [data]
+    infos = []
+    for entry in entries:
+        try:
+            infos.append(LSInfo(**entry))
+        except TypeError:
+            continue
+    return infos
+
+
+def load_cached() -> LSInfo | None:
+    cached = load_cached_all()
+    return cached[0] if cached else None
+
+
+def save_cached_all(infos: list[LSInfo]) -> None:
+    try:
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"instances": [asdict(i) for i in infos]}, f)
+    except OSError as e:
+        log.warning(f"Could not write {CACHE_FILE.name}: {e}")
+
+
+def save_cached(info: LSInfo) -> None:
+    """Record info, replacing any saved entry for the same PID."""
+    others = [i for i in load_cached_all() if i.pid != info.pid]
+    save_cached_all([info, *others])
+
+
+def _still_valid(info: LSInfo, session: requests.Session | None) -> bool:
+    # Without psutil or /proc the PID can't be checked cheaply; the probe
+    # (which needs the exact token) is enough on its own.
+    cmdline = _cmdline_of(info.pid) if (psutil is not None or os.path.isdir("/proc")) else ""
+    if cmdline is None or (cmdline and info.csrf_token not in cmdline):
+        return False
+    return _token_accepted(probe(info.port, info.csrf_token, session))
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _find_port(pid: int, csrf: str, ports: list[int], session: requests.Session | None,
+               hint: int | None = None) -> LSInfo | None:
+    """Probe pid's ports (hint first) for the Connect API."""
+    if hint in ports:
+        ports = [hint] + [p for p in ports if p != hint]
+    for port in ports:
+        status = probe(port, csrf, session)
+        if status is None:
+            continue
+        if not _token_accepted(status):
+            log.warning(f"LS pid {pid} port {port} rejected its own CSRF token (HTTP {status})")
+        return LSInfo(pid, port, csrf)
+    return None
+
+
+def discover(session: requests.Session | None = None, use_cache: bool = True) -> LSInfo | None:
+    """
+    Return a running language server, or None.  Tries the cached entries
+    first, then enumerates processes once and probes only each process's
+    loopback listening ports.
+    """
+    if use_cache:
+        for cached in load_cached_all():
+            if _still_valid(cached, session):
+                return cached
+
+    try:
+        candidates = find_candidates()
+    except Exception as e:
+        log.warning(f"Process enumeration failed: {e}")
+        return None
+
+    for pid, csrf, ports in candidates:
+        info = _find_port(pid, csrf, ports, session)
+        if info:
+            save_cached(info)
+            return info
+    return None
+
+
+def discover_all(session: requests.Session | None = None, use_cache: bool = True) -> list[LSInfo]:
+    """
+    Every running language server that answers, ordered by PID.  With
+    use_cache, a saved instance's port is probed first; without it (e.g.
+    after that instance failed) all of its ports are probed afresh.  If
+    processes can't be enumerated, falls back to the saved instances that
+    still answer.
+    """
+    cached = {i.pid: i for i in load_cached_all()}
+    try:
+        candidates = find_candidates()
+    except Exception as e:
+        log.warning(f"Process enumeration failed: {e}")
+        return [i for i in cached.values() if _still_valid(i, session)] if use_cache else []
+
+    found = []
+    for pid, csrf, ports in sorted(candidates):
+        hit = cached.get(pid) if use_cache else None
+        hint = hit.port if hit and hit.csrf_token == csrf else None
+        info = _find_port(pid, csrf, ports, session, hint)
+        if info:
+            found.append(info)
+    save_cached_all(found)
+    return found
@@ -0,0 +1,253 @@
+"""
+ls_proto.py
+
+Protobuf layouts of the language server's Cascade messages, and decoders
+that turn them into the same dicts its JSON API returns.  Used for:
+
+  - export_offline.py: the <cascade id>.pb files on disk (a serialized
+    trajectory);
+  - watcher.py's binary transport: GetAllCascadeTrajectories and
+    GetCascadeTrajectory called with Content-Type application/proto
+    instead of JSON (--transport proto).
+
+Windsurf publishes no schema.  FIELD_MAP is the layout these scripts were
+written against; if an update moves a field, `export_offline.py --dump`
+prints the decoded tree of a stored trajectory, and pb_fields.json (same
+shape as FIELD_MAP, next to this script) overrides any top-level key
+without code changes.
+
+Shapes map field numbers to JSON keys:
+  "key"                   string field
+  ["key", "int"]          varint field
+  ["key", "time"]         google.protobuf.Timestamp → RFC 3339 string
+  ["key", {shape}]        sub-message
+  ["key", [{shape}]]      repeated sub-message → list
+
+Enums don't survive the trip: a step's type is recovered from which payload
+field it carries, and summary fields that are enums in the schema (e.g.
+lastGeneratorModelUid) are left out.  watcher.py therefore checks its first
+binary replies against the JSON ones and stays on JSON when they differ
+(a field map that doesn't fit, or a server that reports such a field).
+
+Usage:
+  import ls_proto
+  field_map = ls_proto.load_field_map()
+  data = ls_proto.decode_all_trajectories(body, field_map)   # {"trajectorySummaries": {...}}
+  data = ls_proto.decode_get_trajectory(body, field_map)     # {"trajectory": {"steps": [...]}}
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pb_wire import Message, encode_len, encode_varint_field
+
+SCRIPT_DIR = Path(__file__).parent
+FIELD_MAP_FILE = SCRIPT_DIR / "pb_fields.json"
+
+# trajectory_id / trajectory_steps: fields of a trajectory message.
+# steps: {step payload field: [step type, JSON key, payload shape]} — a step's
+#   type is taken from which payload field it carries.
+# cascade_id: the request field of GetCascadeTrajectory.
+# trajectory: the trajectory field of GetCascadeTrajectory's response.
+# trajectory_summaries: the map<cascade id, summary> field of
+#   GetAllCascadeTrajectories' response; summary is the summary's shape.
+FIELD_MAP = {
+    "trajectory_id": 1,
+    "trajectory_steps": 2,
+    "steps": {
+        "19": ["CORTEX_STEP_TYPE_USER_INPUT", "userInput", {"2": "userResponse"}],
+        "20": ["CORTEX_STEP_TYPE_PLANNER_RESPONSE", "plannerResponse",
+               {"1": "response", "8": "modifiedResponse"}],
+        "10": ["CORTEX_STEP_TYPE_CODE_ACTION", "codeAction",
+               {"1": ["actionSpec", {"1": "absoluteUri", "2": "path"}]}],
+        "28": ["CORTEX_STEP_TYPE_RUN_COMMAND", "runCommand",
+               {"23": "commandLine", "25": "proposedCommandLine"}],
+    },
+    "cascade_id": 1,
+    "trajectory": 1,
+    "trajectory_summaries": 1,
+    "summary": {
+        "1": "summary",
+        "2": ["stepCount", "int"],
+        "3": ["lastModifiedTime", "time"],
+        "4": "trajectoryId",
+        "7": ["createdTime", "time"],
+        "9": ["workspaces", [{"1": "workspaceFolderAbsoluteUri",
+                              "4": ["repository", {"1": "computedName"}]}]],
+        "10": ["lastUserInputTime", "time"],
+    },
+}
+
+_RFC3339_RE = re.compile(r"^(.*?)(?:\.(\d{1,9}))?(Z|[+-]\d\d:\d\d)$")
+
+
+def load_field_map() -> dict:
+    if FIELD_MAP_FILE.exists():
+        with open(FIELD_MAP_FILE, encoding="utf-8") as f:
+            return {**FIELD_MAP, **json.load(f)}
+    return FIELD_MAP
+
+
+# ---------------------------------------------------------------------------
+# Timestamps
+# ---------------------------------------------------------------------------
+
+def _format_timestamp(msg: Message) -> str:
+    """RFC 3339 the way Connect's JSON encoding writes it: UTC, Z suffix,
+    0, 3, 6 or 9 fractional digits."""
+    dt = datetime.fromtimestamp(msg.varint(1), tz=timezone.utc)
+    text = dt.strftime("%Y-%m-%dT%H:%M:%S")
+    nanos = msg.varint(2)
+    if nanos:
+        frac = f"{nanos:09d}"
+        while frac.endswith("000"):
+            frac = frac[:-3]
+        text += "." + frac
+    return text + "Z"
+
+
+def _encode_timestamp(text: str) -> bytes:
+    m = _RFC3339_RE.match(text)
+    if not m:
+        raise ValueError(f"not an RFC 3339 timestamp: {text!r}")
+    base, frac, zone = m.groups()
+    dt = datetime.fromisoformat(base + ("+00:00" if zone == "Z" else zone))
+    nanos = int((frac or "0").ljust(9, "0"))
+    out = encode_varint_field(1, int(dt.timestamp())) if dt.timestamp() else b""
+    return out + (encode_varint_field(2, nanos) if nanos else b"")
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+
+def convert(msg: Message, shape: dict) -> dict:
+    """JSON-shaped dict of msg's fields that shape names."""
+    out = {}
+    for field, spec in shape.items():
+        field = int(field)
+        if field not in msg:
+            continue
+        if isinstance(spec, str):
+            out[spec] = msg.string(field)
+            continue
+        key, kind = spec
+        if kind == "int":
+            out[key] = msg.varint(field)
+        elif kind == "time":
+            sub = msg.message(field)
+            if sub is not None:
+                out[key] = _format_timestamp(sub)
+        elif isinstance(kind, list):
+            out[key] = [convert(sub, kind[0]) for sub in msg.messages(field)]
+        else:
+            sub = msg.message(field)
+            if sub is not None:
+                out[key] = convert(sub, kind)
+    return out
+
+
+def decode_trajectory(data: bytes | memoryview, field_map: dict) -> tuple[str, list[dict]]:
+    """(trajectory id, step dicts in LS JSON shape) for a serialized
+    trajectory.  Steps of a type the map doesn't cover become {"type": ""}
+    so step counts and synced_steps still line up with the live API.
+    Raises DecodeError if data isn't protobuf."""
+    trajectory = Message.parse(data)
+    step_map = {int(k): v for k, v in field_map["steps"].items()}
+    steps = []
+    for step_msg in trajectory.messages(field_map["trajectory_steps"]):
+        step = {"type": ""}
+        for field, (step_type, key, shape) in step_map.items():
+            payload = step_msg.message(field)
+            if payload is not None:
+                step = {"type": step_type, key: convert(payload, shape)}
+                break
+        steps.append(step)
+    return trajectory.string(field_map["trajectory_id"]), steps
+
+
+def decode_get_trajectory(data: bytes, field_map: dict) -> dict:
+    """GetCascadeTrajectory response → {"trajectory": {"trajectoryId", "steps"}}."""
+    response = Message.parse(data)
+    raw = [v for v in response.raw(field_map["trajectory"]) if isinstance(v, memoryview)]
+    trajectory_id, steps = decode_trajectory(raw[-1], field_map) if raw else ("", [])
+    return {"trajectory": {"trajectoryId": trajectory_id, "steps": steps}}
+
+
+def decode_all_trajectories(data: bytes, field_map: dict) -> dict:
+    """GetAllCascadeTrajectories response → {"trajectorySummaries": {uuid: summary}}."""
+    response = Message.parse(data)
+    shape = field_map["summary"]
+    summaries = {}
+    # map<string, Summary> is a repeated entry message {1: key, 2: value}
+    for entry in response.messages(field_map["trajectory_summaries"]):
+        value = entry.message(2)
+        summaries[entry.string(1)] = convert(value, shape) if value is not None else {}
+    return {"trajectorySummaries": summaries}
+
+
+# ---------------------------------------------------------------------------
+# Encoding (request bodies; fake_ls.py's responses)
+# ---------------------------------------------------------------------------
+
+def encode(obj: dict, shape: dict) -> bytes:
+    """Inverse of convert(): serialize the keys of obj that shape names."""
+    out = bytearray()
+    for field, spec in shape.items():
+        field = int(field)
+        if isinstance(spec, str):
+            if obj.get(spec):
+                out += encode_len(field, obj[spec])
+            continue
+        key, kind = spec
+        value = obj.get(key)
+        if value is None:
+            continue
+        if kind == "int":
+            if value:
+                out += encode_varint_field(field, int(value))
+        elif kind == "time":
+            if value:
+                out += encode_len(field, _encode_timestamp(value))
+        elif isinstance(kind, list):
+            for sub in value:
+                out += encode_len(field, encode(sub, kind[0]))
+        else:
+            out += encode_len(field, encode(value, kind))
+    return bytes(out)
+
+
+def encode_trajectory(trajectory_id: str, steps: list[dict], field_map: dict) -> bytes:
+    """Inverse of decode_trajectory().  Steps of unmapped types are written
+    as empty step messages."""
+    by_type = {step_type: (int(field), key, shape)
+               for field, (step_type, key, shape) in field_map["steps"].items()}
+    out = bytearray(encode_len(field_map["trajectory_id"], trajectory_id) if trajectory_id else b"")
+    for step in steps:
+        mapped = by_type.get(step.get("type", ""))
+        body = b""
+        if mapped:
+            field, key, shape = mapped
+            body = encode_len(field, encode(step.get(key, {}), shape))
+        out += encode_len(field_map["trajectory_steps"], body)
+    return bytes(out)
+
+
+def encode_get_trajectory_request(cascade_id: str, field_map: dict) -> bytes:
+    return encode_len(field_map["cascade_id"], cascade_id)
+
+
+def encode_get_trajectory_response(trajectory_id: str, steps: list[dict], field_map: dict) -> bytes:
+    return encode_len(field_map["trajectory"], encode_trajectory(trajectory_id, steps, field_map))
+
+
+def encode_all_trajectories_response(summaries: dict[str, dict], field_map: dict) -> bytes:
+    shape = field_map["summary"]
+    out = bytearray()
+    for uuid, summary in summaries.items():
+        entry = encode_len(1, uuid) + encode_len(2, encode(summary, shape))
+        out += encode_len(field_map["trajectory_summaries"], entry)
+    return bytes(out)
+
@@ -0,0 +1,66 @@
+"""
+note_writer.py
+
+Writes exported notes only when their content actually changed.
+
+Notes carry no export timestamp (that lives in the index as exported_at),
+so the same conversation always renders to the same bytes and a SHA-256 of
+the note is a reliable "did anything change" check.  The hash of the last
+written note is kept in the index entry (note_hash); when the freshly
+rendered note hashes the same and the file is still there, nothing is
+written — no mtime bump, no OneDrive/Obsidian sync.
+
+Changed notes are written to a temporary file in the same folder and moved
+into place with os.replace, so a reader (or a sync client) never sees a
+half-written note.
+
+Usage from other scripts:
+  from note_writer import write_if_changed
+  written, note_hash = write_if_changed(path, content, entry.get("note_hash"))
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Replace path with content in one step (temp file + os.replace)."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path: Path, content: str, known_hash: str | None = None) -> tuple[bool, str]:
+    """
+    Write content to path unless the note there already matches it.
+    Returns (written, hash of content).
+
+    known_hash is the hash recorded for path when it was last written; it
+    saves reading the file back.  Without it, an existing file is hashed
+    instead.
+    """
+    new_hash = content_hash(content)
+    if path.exists():
+        if known_hash is None:
+            try:
+                known_hash = content_hash(path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError):
+                known_hash = None
+        if known_hash == new_hash:
+            return False, new_hash
+    write_atomic(path, content)
+    return True, new_hash
@@ -0,0 +1,218 @@
+"""
+pb_wire.py
+
+Schema-less decoder (and minimal encoder) for the protobuf wire format.
+
+Windsurf ships no .proto files for its on-disk trajectory storage, so
+messages are decoded structurally: a Message is the list of
+(field number, wire type, value) records in the buffer.  Length-delimited
+values are kept as raw bytes and only interpreted when asked — as a string
+with .string(n), as a nested message with .message(n) — because the wire
+format alone can't tell a string from a sub-message.
+
+encode_varint / encode_len / encode_varint_field build messages field by
+field — enough for request bodies and test fixtures.
+
+dump() renders a best-guess tree (printable UTF-8 → string, cleanly
+parsing bytes → message, else hex) for working out field numbers.
+
+Usage:
+  from pb_wire import Message
+  msg = Message.parse(data)
+  for step in msg.messages(2): ...
+"""
+
+import struct
+
+VARINT, I64, LEN, SGROUP, EGROUP, I32 = 0, 1, 2, 3, 4, 5
+
+MAX_DEPTH = 64
+
+
+class DecodeError(ValueError):
+    pass
+
+
+def read_varint(buf: bytes | memoryview, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    end = len(buf)
+    while True:
+        if pos >= end:
+            raise DecodeError("truncated varint")
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 70:
+            raise DecodeError("varint too long")
+
+
+def iter_fields(buf: bytes | memoryview):
+    """Yield (field number, wire type, value) for each record in buf.
+    VARINT/I64/I32 values are ints; LEN values are memoryview slices of buf
+    (no copy).  Raises DecodeError on anything that isn't valid wire format."""
+    view = memoryview(buf)
+    pos, end = 0, len(view)
+    while pos < end:
+        # Single-byte keys and lengths are the norm; skip the call for them
+        key = view[pos]
+        if key < 0x80:
+            pos += 1
+        else:
+            key, pos = read_varint(view, pos)
+        field, wire = key >> 3, key & 7
+        if field == 0:
+            raise DecodeError("field number 0")
+        if wire == VARINT:
+            value, pos = read_varint(view, pos)
+        elif wire == I64:
+            if pos + 8 > end:
+                raise DecodeError("truncated fixed64")
+            value = struct.unpack_from("<Q", view, pos)[0]
+            pos += 8
+        elif wire == I32:
+            if pos + 4 > end:
+                raise DecodeError("truncated fixed32")
+            value = struct.unpack_from("<I", view, pos)[0]
+            pos += 4
+        elif wire == LEN:
+            length = view[pos] if pos < end else 0x80
+            if length < 0x80:
+                pos += 1
+            else:
+                length, pos = read_varint(view, pos)
+            if pos + length > end:
+                raise DecodeError("truncated length-delimited field")
+            value = view[pos:pos + length]
+            pos += length
+        elif wire in (SGROUP, EGROUP):
+            # Deprecated groups: not produced by anything proto3; keep the
+            # marker so the rest of the buffer still decodes.
+            value = None
+        else:
+            raise DecodeError(f"invalid wire type {wire}")
+        yield field, wire, value
+
+
+class Message:
+    """Decoded records of one message, with typed accessors by field number."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict[int, list]):
+        self.fields = fields
+
+    @classmethod
+    def parse(cls, buf: bytes | memoryview) -> "Message":
+        fields: dict[int, list] = {}
+        for field, _wire, value in iter_fields(buf):
+            fields.setdefault(field, []).append(value)
+        return cls(fields)
+
+    def __contains__(self, field: int) -> bool:
+        return field in self.fields
+
+    def raw(self, field: int) -> list:
+        return self.fields.get(field, [])
+
+    def varint(self, field: int, default: int = 0) -> int:
+        # proto3: last value wins for scalars
+        for value in reversed(self.raw(field)):
+            if isinstance(value, int):
+                return value
+        return default
+
+    def string(self, field: int, default: str = "") -> str:
+        for value in reversed(self.raw(field)):
+            if isinstance(value, memoryview):
+                return bytes(value).decode("utf-8", "replace")
+        return default
+
+    def strings(self, field: int) -> list[str]:
+        return [bytes(v).decode("utf-8", "replace") for v in self.raw(field) if isinstance(v, memoryview)]
+
+    def message(self, field: int) -> "Message | None":
+        """Sub-message in field (proto3 merges repeated occurrences; the
+        last one is used here), or None if absent / not a message."""
+        for value in reversed(self.raw(field)):
+            if isinstance(value, memoryview):
+                try:
+                    return Message.parse(value)
+                except DecodeError:
+                    return None
+        return None
+
+    def messages(self, field: int) -> list["Message"]:
+        """Every occurrence of a repeated message field that parses."""
+        found = []
+        for value in self.raw(field):
+            if isinstance(value, memoryview):
+                try:
+                    found.append(Message.parse(value))
+                except DecodeError:
+                    continue
+        return found
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+def encode_varint(value: int) -> bytes:
+    if value < 0:
+        value &= (1 << 64) - 1  # int32/int64 negatives are 10-byte varints
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def encode_varint_field(field: int, value: int) -> bytes:
+    return encode_varint(field << 3 | VARINT) + encode_varint(value)
+
+
+def encode_len(field: int, data: bytes | str) -> bytes:
+    """A length-delimited record: string, bytes or serialized sub-message."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return encode_varint(field << 3 | LEN) + encode_varint(len(data)) + data
+
+
+# ---------------------------------------------------------------------------
+# Inspection
+# ---------------------------------------------------------------------------
+
+def _printable(data: bytes) -> str | None:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    if all(c.isprintable() or c in "\n\r\t" for c in text):
+        return text
+    return None
+
+
+def dump(buf: bytes | memoryview, max_string: int = 80, depth: int = 0) -> list:
+    """Best-guess JSON-able tree of buf: [[field, value], ...]."""
+    out = []
+    for field, wire, value in iter_fields(buf):
+        if wire != LEN:
+            out.append([field, value])
+            continue
+        data = bytes(value)
+        text = _printable(data) if data else ""
+        if text is not None:
+            out.append([field, text if len(text) <= max_string else text[:max_string] + "…"])
+            continue
+        if depth < MAX_DEPTH:
+            try:
+                out.append([field, dump(data, max_string, depth + 1)])
+                continue
+            except DecodeError:
+                pass
+        out.append([field, f"<{len(data)} bytes {data[:16].hex()}…>"])
+    return out
@@ -0,0 +1,122 @@
+"""
+search_chats.py
+
+Full-text search over exported Windsurf conversations: their threads, the
+files they changed and the commands they ran, ranked by relevance (bm25).
+
+The index lives in index.db next to the conversation index (see
+conv_index.py) and is kept current by whatever exports notes — watcher.py,
+export_offline.py and hook_export.py update a conversation's entry as they
+write its note, so queries never scan the vault.
+
+Every word must match; a trailing * matches a prefix.  Punctuation is taken
+literally, so file names and command lines can be pasted as-is.
+
+Usage:
+  python search_chats.py pytest conv_index.py
+  python search_chats.py "GetCascadeTrajectory" --limit 5
+  python search_chats.py refactor* --json
+  python search_chats.py --raw 'files:watcher NOT commands:pytest'   # FTS5 query syntax
+  python search_chats.py --backfill      # index notes exported before search existed
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import conv_index
+
+BACKFILL_BATCH = 200  # conversations per index transaction
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+def cmd_search(query: str, limit: int, raw: bool, as_json: bool) -> None:
+    started = time.perf_counter()
+    with conv_index.open_index() as index:
+        try:
+            hits = index.search(query, limit, raw=raw)
+        except RuntimeError as e:
+            sys.exit(f"ERROR: {e}")
+        except sqlite3.OperationalError as e:
+            sys.exit(f"ERROR: bad query: {e}")
+        searched = index.search_count()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if as_json:
+        json.dump(hits, sys.stdout, indent=1, ensure_ascii=False)
+        print()
+        return
+
+    if not hits:
+        print(f"No matches in {searched} conversation(s) ({elapsed_ms:.1f} ms).")
+        return
+    for n, hit in enumerate(hits, 1):
+        workspace = f"  [{hit['workspace']}]" if hit["workspace"] else ""
+        print(f"{n:>3}. {hit['title']}{workspace}")
+        print(f"     {hit['uuid']}  {(hit['last_modified'] or '')[:10]}")
+        print(f"     {' '.join(hit['snippet'].split())}")
+        if hit["export_path"]:
+            print(f"     {hit['export_path']}")
+    print(f"\n{len(hits)} hit(s) of {searched} conversation(s) in {elapsed_ms:.1f} ms.")
+
+
+def cmd_backfill() -> None:
+    """Index exported conversations that aren't in the search index yet,
+    from the text of their notes."""
+    with conv_index.open_index() as index:
+        missing = index.search_missing()
+        if not missing:
+            print(f"All exported conversations are indexed ({index.search_count()}).")
+            return
+
+        done = skipped = 0
+        batch: dict[str, dict] = {}
+        for entry in missing:
+            path = entry.get("export_path")
+            try:
+                text = Path(path).read_text(encoding="utf-8") if path else None
+            except OSError:
+                text = None
+            if text is None:
+                skipped += 1
+                continue
+            batch[entry["uuid"]] = {"search_text": text}
+            if len(batch) >= BACKFILL_BATCH:
+                index.upsert_many(batch)
+                done += len(batch)
+                batch = {}
+        index.upsert_many(batch)
+        done += len(batch)
+    print(f"Indexed {done} conversation(s); {skipped} skipped (note missing).")
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full-text search across exported Windsurf chats")
+    parser.add_argument("query", nargs="*", help="Words to search for")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum hits (default: %(default)s)")
+    parser.add_argument("--raw", action="store_true", help="Pass the query to SQLite FTS5 unchanged")
+    parser.add_argument("--json", action="store_true", help="Print hits as JSON")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Index exported conversations missing from the search index")
+    args = parser.parse_args()
+
+    if args.backfill:
+        cmd_backfill()
+    elif args.query:
+        cmd_search(" ".join(args.query), args.limit, args.raw, args.json)
+    else:
+        parser.error("give a query, or --backfill")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+step_archive.py
+
+Local archive of the raw trajectory steps the watcher fetches, so notes can
+be re-rendered (watcher.py --rerender) after a layout change without the
+language server — and for conversations it no longer has.
+
+One file per conversation in archive/ (STEP_ARCHIVE_DIR to override):
+<uuid>.jsonl.zst, JSON lines compressed with zstd (gzip, .jsonl.gz, when
+the zstandard package isn't installed).  Each sync appends one compressed
+frame — both formats allow concatenated frames — holding records of two
+kinds:
+
+  {"i": <step index>, "step": {...}}     a raw step as the LS returned it
+  {"item": {...}}                        the conversation's summary
+
+Later records win: the watcher re-fetches the last synced step every time
+(it may have still been streaming), and its newer copy replaces the old one
+on load.  A full re-sync rewrites the file.
+
+Usage from other scripts:
+  import step_archive
+  step_archive.append(uuid, first_index, steps, item)
+  item, steps = step_archive.load(uuid)
+"""
+
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # optional — gzip is used instead
+    zstandard = None
+
+SCRIPT_DIR  = Path(__file__).parent
+ARCHIVE_DIR = Path(os.environ.get("STEP_ARCHIVE_DIR") or SCRIPT_DIR / "archive")
+
+ZSTD_LEVEL = 10
+SUFFIXES = (".jsonl.zst", ".jsonl.gz")
+
+
+def _path(uuid: str, suffix: str | None = None) -> Path:
+    if suffix is None:
+        suffix = SUFFIXES[0] if zstandard is not None else SUFFIXES[1]
+    return ARCHIVE_DIR / f"{uuid}{suffix}"
+
+
+def _existing(uuid: str) -> Path | None:
+    for suffix in SUFFIXES:
+        path = _path(uuid, suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".jsonl.zst":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data)
+
+
+def _decompress(raw: bytes, suffix: str) -> bytes:
+    if suffix == ".jsonl.zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is needed to read .zst archives (pip install zstandard)")
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(raw), read_across_frames=True)
+        return reader.read()
+    return gzip.decompress(raw)
+
+
+def append(uuid: str, first_index: int, steps: list[dict], item: dict | None = None) -> Path:
+    """Archive steps (the first being step first_index) and the item.
+    first_index 0 means a full fetch and replaces the conversation's file."""
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    existing = _existing(uuid)
+    path = existing if existing and first_index > 0 else _path(uuid)
+    suffix = SUFFIXES[0] if path.name.endswith(SUFFIXES[0]) else SUFFIXES[1]
+    if suffix == SUFFIXES[0] and zstandard is None:
+        # An old .zst archive but no zstandard now: start a gzip one
+        path, suffix = _path(uuid, SUFFIXES[1]), SUFFIXES[1]
+        first_index = 0
+
+    lines = [json.dumps({"i": first_index + n, "step": step}, ensure_ascii=False) for n, step in enumerate(steps)]
+    if item is not None:
+        lines.append(json.dumps({"item": item}, ensure_ascii=False))
+    frame = _compress(("\n".join(lines) + "\n").encode("utf-8"), suffix)
+
+    if first_index == 0:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(frame)
+        os.replace(tmp, path)
+        for other in SUFFIXES:
+            if other != suffix and _path(uuid, other).exists():
+                _path(uuid, other).unlink()
+    else:
+        with open(path, "ab") as f:
+            f.write(frame)
+    return path
+
+
+def load(uuid: str) -> tuple[dict, list[dict]] | None:
+    """(latest item, steps in index order) for an archived conversation, or
+    None if there's no archive.  Missing indexes (shouldn't happen) are
+    filled with {"type": ""} so positions match the live trajectory."""
+    path = _existing(uuid)
+    if path is None:
+        return None
+    suffix = SUFFIXES[0] if path.name.endswith(SUFFIXES[0]) else SUFFIXES[1]
+    data = _decompress(path.read_bytes(), suffix)
+
+    item: dict = {}
+    by_index: dict[int, dict] = {}
+    for line in data.splitlines():
+        if not line:
+            continue
+        record = json.loads(line)
+        if "step" in record:
+            by_index[record["i"]] = record["step"]
+        elif "item" in record:
+            item = record["item"]
+    count = max(by_index) + 1 if by_index else 0
+    return item, [by_index.get(i, {"type": ""}) for i in range(count)]
+
+
+def archived_ids() -> list[str]:
+    """UUIDs with an archive, sorted."""
+    if not ARCHIVE_DIR.is_dir():
+        return []
+    ids = set()
+    for path in ARCHIVE_DIR.iterdir():
+        for suffix in SUFFIXES:
+            if path.name.endswith(suffix):
+                ids.add(path.name[: -len(suffix)])
+    return sorted(ids)
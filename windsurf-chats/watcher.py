@@ -1,8 +1,18 @@
 """
 watcher.py
 
-Polls the Windsurf language server every 60 seconds, detects conversations
-that have been modified since last export, and writes/updates Obsidian notes.
+Polls the Windsurf language server, detects conversations that have been
+modified since last export, and writes/updates Obsidian notes.
+
+Polling is adaptive: every poll that finds changes drops the interval to
+--min-interval, and each quiet poll doubles it, up to --max-interval.
+When Windsurf's Cascade storage directory exists, a change there wakes the
+watcher straight away (watchdog if installed, else a cheap mtime scan).
+
+Every Windsurf window runs its own language server.  All of them are
+polled concurrently each cycle and their conversation lists merged by
+uuid; one that stops answering is dropped until the next rediscovery
+without holding up the rest.
 
 Replaces the broken post_cascade_response_with_transcript hook which stopped
 firing after Windsurf moved from JSONL transcripts to protobuf storage.
@@ -11,9 +21,14 @@ Run once at login via Task Scheduler:
   python watcher.py
 
 Or run manually:
-  python watcher.py              # poll loop (default 60s interval)
+  python watcher.py              # adaptive poll loop (starts at 60s)
   python watcher.py --once       # single pass, then exit
   python watcher.py --interval 30
+  python watcher.py --min-interval 5 --max-interval 900
+  python watcher.py --workers 16  # fetch up to 16 changed conversations at once
+  python watcher.py --rerender    # rebuild every note from the step archive (no LS)
+  python watcher.py --transport proto  # binary protobuf LS calls, JSON if unsupported
+  python watcher.py --metrics-port 9477  # Prometheus metrics (also in watcher_metrics.prom)
 """
 
 import argparse
@@ -21,20 +36,36 @@ import json
 import logging
 import os
 import re
-import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
 import requests
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional — storage is scanned for mtime changes instead
+    Observer = None
+    FileSystemEventHandler = object
+
+import conv_index
+import ls_discovery
+import ls_proto
+import step_archive
+from note_writer import write_if_changed
+from pb_wire import DecodeError
+from watcher_metrics import Metrics
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 SCRIPT_DIR   = Path(__file__).parent
-INDEX_FILE   = SCRIPT_DIR / "index.json"
 LOG_FILE     = SCRIPT_DIR / "watcher.log"
+METRICS_FILE = SCRIPT_DIR / "watcher_metrics.prom"
 
 
 def _load_dotenv() -> dict[str, str]:
@@ -63,10 +94,29 @@ if not _vault_path:
     )
 VAULT_CHATS_DIR = Path(_vault_path) / "Chats"
 
-LS_BINARY = "language_server_windows_x64"
-SERVICE   = "exa.language_server_pb.LanguageServerService"
+# Where the language server keeps one <cascade id>.pb per conversation
+CASCADE_DIR = Path(
+    _DOTENV.get("WINDSURF_CASCADE_DIR")
+    or os.environ.get("WINDSURF_CASCADE_DIR")
+    or Path.home() / ".codeium" / "windsurf" / "cascade"
+)
+
+SERVICE   = ls_discovery.SERVICE
+
+POLL_INTERVAL = 60  # seconds — first interval, and the one used after an error
+MIN_INTERVAL  = 5   # seconds between polls while conversations are changing
+MAX_INTERVAL  = 600 # seconds between polls after a long quiet spell
+FETCH_WORKERS = 8   # conversations fetched + rendered in parallel per poll
+REDISCOVER_INTERVAL = 300  # seconds between scans for newly opened Windsurf windows
 
-POLL_INTERVAL = 60  # seconds
+# Encoding for GetAllCascadeTrajectories / GetCascadeTrajectory: "json", or
+# "proto" for binary protobuf (falls back to JSON if the LS refuses it or its
+# replies don't match the JSON ones — see _call)
+TRANSPORTS = ("json", "proto")
+TRANSPORT  = _DOTENV.get("LS_TRANSPORT") or os.environ.get("LS_TRANSPORT") or "json"
+
+STORAGE_SCAN_INTERVAL = 2    # seconds between mtime scans when watchdog is missing
+STORAGE_SETTLE        = 1.0  # seconds to let a burst of storage writes finish
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -82,154 +132,239 @@ logging.basicConfig(
 )
 log = logging.getLogger("watcher")
 
+# Health / performance counters (watcher_metrics.py), written after each poll
+metrics = Metrics()
+
 # ---------------------------------------------------------------------------
-# Language server discovery (same logic as fetch_trajectories.py)
+# Language server discovery (see ls_discovery.py)
 # ---------------------------------------------------------------------------
 
-def get_ls_info() -> tuple[int, str] | None:
-    """Return (port, csrf_token) or None if LS is not running."""
-    try:
-        ps = subprocess.run(
-            [
-                "powershell", "-NoProfile", "-Command",
-                f"Get-CimInstance Win32_Process -Filter \"Name LIKE '%language_server%'\" "
-                "| Select-Object -ExpandProperty CommandLine",
-            ],
-            capture_output=True, text=True, timeout=15,
-        )
-    except Exception as e:
-        log.warning(f"WMI query failed: {e}")
-        return None
-
-    for line in ps.stdout.strip().splitlines():
-        if LS_BINARY not in line:
-            continue
-        csrf_m = re.search(r"--csrf_token\s+(\S+)", line)
-        if not csrf_m:
-            continue
-        csrf_token = csrf_m.group(1)
-        port = _find_ls_port(csrf_token)
-        if port:
-            return port, csrf_token
-
-    return None
-
-
-def _find_ls_port(csrf_token: str) -> int | None:
-    try:
-        ps = subprocess.run(
-            [
-                "powershell", "-NoProfile", "-Command",
-                f"Get-CimInstance Win32_Process -Filter \"Name LIKE '%language_server%'\" "
-                "| Select-Object ProcessId, CommandLine | ConvertTo-Json",
-            ],
-            capture_output=True, text=True, timeout=15,
-        )
-        procs = json.loads(ps.stdout)
-        if isinstance(procs, dict):
-            procs = [procs]
-    except Exception:
-        return None
-
-    pid = None
-    for p in procs:
-        cl = p.get("CommandLine", "")
-        if LS_BINARY in cl and "--csrf_token" in cl:
-            pid = p.get("ProcessId")
-            break
-    if not pid:
-        return None
-
-    try:
-        ps2 = subprocess.run(
-            [
-                "powershell", "-NoProfile", "-Command",
-                f"Get-NetTCPConnection -OwningProcess {pid} -State Listen "
-                "-ErrorAction SilentlyContinue | Where-Object {{ $_.LocalAddress -eq '127.0.0.1' }} "
-                "| Select-Object -ExpandProperty LocalPort",
-            ],
-            capture_output=True, text=True, timeout=15,
-        )
-    except Exception:
-        return None
-
-    ports = sorted(
-        [int(x.strip()) for x in ps2.stdout.strip().splitlines() if x.strip().isdigit()]
-    )
-    for port in ports:
-        try:
-            r = requests.post(
-                f"http://127.0.0.1:{port}/{SERVICE}/GetAllCascadeTrajectories",
-                headers={"Content-Type": "application/json", "x-codeium-csrf-token": csrf_token},
-                json={},
-                timeout=5,
-            )
-            if r.status_code == 200:
-                return port
-            if r.status_code in (401, 403) and "application/json" in r.headers.get("Content-Type", ""):
-                return port
-        except requests.exceptions.ConnectionError:
-            continue
-        except Exception:
-            continue
-    return None
+def get_ls_instances(use_cache: bool = True) -> list[ls_discovery.LSInfo]:
+    """Every running language server (one per Windsurf window)."""
+    return ls_discovery.discover_all(get_session(), use_cache=use_cache)
 
 
 # ---------------------------------------------------------------------------
 # API calls
 # ---------------------------------------------------------------------------
 
-def fetch_trajectories(port: int, csrf_token: str) -> dict:
-    url = f"http://127.0.0.1:{port}/{SERVICE}/GetAllCascadeTrajectories"
-    r = requests.post(
-        url,
+_session: requests.Session | None = None
+
+
+def get_session(pool_size: int = FETCH_WORKERS) -> requests.Session:
+    """Keep-alive session shared by every LS call (and every fetch worker).
+    pool_size only matters on the first call, which creates it."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        _session.mount("http://", adapter)
+    return _session
+
+
+# None = not tried yet; False once the LS has refused application/proto, or
+# its binary replies didn't decode to what its JSON replies say
+_proto_supported: bool | None = None
+_proto_fields: dict | None = None
+# Methods whose binary replies have been checked against the JSON ones
+_proto_verified: set[str] = set()
+
+# Summary keys a note or the index is built from; the binary decode must
+# reproduce them exactly, or notes would differ between transports
+NOTE_SUMMARY_KEYS = ("summary", "title", "stepCount", "createdTime", "lastModifiedTime",
+                     "lastUserInputTime", "trajectoryId", "lastGeneratorModelUid")
+
+
+def proto_fields() -> dict:
+    global _proto_fields
+    if _proto_fields is None:
+        _proto_fields = ls_proto.load_field_map()
+    return _proto_fields
+
+
+def _call_proto(port: int, csrf_token: str, method: str, body: bytes, decode) -> dict | None:
+    """One Connect unary call with binary protobuf bodies, decoded to the
+    JSON API's dict shape.  Returns None if the LS doesn't speak
+    application/proto (every later call then uses JSON); other HTTP errors
+    raise as they would for JSON."""
+    global _proto_supported
+    r = get_session().post(
+        f"http://127.0.0.1:{port}/{SERVICE}/{method}",
+        headers={
+            "Content-Type": "application/proto",
+            "Connect-Protocol-Version": "1",
+            "x-codeium-csrf-token": csrf_token,
+        },
+        data=body,
+        timeout=30,
+    )
+    reason = ""
+    if r.status_code in (404, 415, 501):
+        reason = f"HTTP {r.status_code}"
+    elif r.ok and not r.headers.get("Content-Type", "").startswith("application/proto"):
+        reason = f"answered with {r.headers.get('Content-Type') or 'no content type'}"
+    else:
+        r.raise_for_status()
+        try:
+            data = decode(r.content, proto_fields())
+        except DecodeError as e:
+            reason = f"undecodable response ({e})"
+    if reason:
+        if _proto_supported is not False:
+            log.info(f"Binary transport unavailable for {method}: {reason} — using JSON.")
+        _proto_supported = False
+        return None
+    _proto_supported = True
+    return data
+
+
+def _proto_mismatch(method: str, binary: dict, data: dict) -> str | None:
+    """How the binary reply to method differs from the JSON one: a
+    description, "" if they agree, or None if the sample is too thin to tell
+    (no conversations, or no step of a mapped type).
+
+    Protobuf decodes without error under any field map, so a map that doesn't
+    fit this language server only shows up here."""
+    if method == "GetAllCascadeTrajectories":
+        ours = binary.get("trajectorySummaries", {})
+        theirs = data.get("trajectorySummaries", {})
+        if set(ours) != set(theirs):
+            return f"{len(ours)} conversations decoded, JSON lists {len(theirs)}"
+        for uuid, item in theirs.items():
+            for key in NOTE_SUMMARY_KEYS:
+                if ours[uuid].get(key) != item.get(key):
+                    return f"{key} of {uuid[:8]} is {ours[uuid].get(key)!r}, JSON says {item.get(key)!r}"
+            if workspace_name(ours[uuid]) != workspace_name(item):
+                return f"workspace of {uuid[:8]} differs"
+        return "" if theirs else None
+
+    ours = binary.get("trajectory", {}).get("steps", [])
+    theirs = data.get("trajectory", {}).get("steps", [])
+    mapped = {step_type for step_type, _key, _shape in proto_fields()["steps"].values()}
+    if len(ours) != len(theirs):
+        return f"{len(ours)} steps decoded, JSON has {len(theirs)}"
+    if [s.get("type") for s in ours] != [s.get("type") if s.get("type") in mapped else "" for s in theirs]:
+        return "step types differ"
+    if render_conversation(ours) != render_conversation(theirs):
+        return "steps render differently"
+    return "" if any(s.get("type") in mapped for s in theirs) else None
+
+
+def _call(port: int, csrf_token: str, method: str, body: dict, proto_body: bytes, decode) -> dict:
+    """POST method in the configured TRANSPORT; raises on HTTP errors.
+
+    The first binary replies of each method are also fetched as JSON and
+    compared (_proto_mismatch); the JSON reply is used until they have agreed
+    once, and on any disagreement every later call uses JSON."""
+    global _proto_supported
+    if TRANSPORT == "proto" and _proto_supported is not False:
+        binary = _call_proto(port, csrf_token, method, proto_body, decode)
+        if binary is not None and method in _proto_verified:
+            return binary
+        if binary is not None:
+            data = _call_json(port, csrf_token, method, body)
+            problem = _proto_mismatch(method, binary, data)
+            if problem:
+                if _proto_supported is not False:
+                    log.warning(f"Binary transport disagrees with JSON for {method} ({problem}) "
+                                f"— field map doesn't fit this language server; using JSON.")
+                _proto_supported = False
+            elif problem == "":
+                _proto_verified.add(method)
+            return data
+    return _call_json(port, csrf_token, method, body)
+
+
+def _call_json(port: int, csrf_token: str, method: str, body: dict) -> dict:
+    r = get_session().post(
+        f"http://127.0.0.1:{port}/{SERVICE}/{method}",
         headers={"Content-Type": "application/json", "x-codeium-csrf-token": csrf_token},
-        json={},
+        json=body,
         timeout=30,
     )
     r.raise_for_status()
     return r.json()
 
 
-def fetch_full_trajectory(port: int, csrf_token: str, cascade_id: str) -> list[dict]:
+def fetch_trajectories(port: int, csrf_token: str) -> dict:
+    return _call(port, csrf_token, "GetAllCascadeTrajectories", {}, b"", ls_proto.decode_all_trajectories)
+
+
+def fetch_full_trajectory(port: int, csrf_token: str, cascade_id: str) -> list[dict] | None:
     """Fetch all steps for a conversation via GetCascadeTrajectory.
-    Returns the steps list, or empty list on failure."""
-    url = f"http://127.0.0.1:{port}/{SERVICE}/GetCascadeTrajectory"
+    Returns the steps list, or None on failure."""
     try:
-        r = requests.post(
-            url,
-            headers={"Content-Type": "application/json", "x-codeium-csrf-token": csrf_token},
-            json={"cascadeId": cascade_id},
-            timeout=30,
+        data = _call(
+            port, csrf_token, "GetCascadeTrajectory", {"cascadeId": cascade_id},
+            ls_proto.encode_get_trajectory_request(cascade_id, proto_fields()),
+            ls_proto.decode_get_trajectory,
         )
-        r.raise_for_status()
-        return r.json().get("trajectory", {}).get("steps", [])
+        return data.get("trajectory", {}).get("steps", [])
     except Exception as e:
         log.warning(f"fetch_full_trajectory({cascade_id[:8]}): {e}")
-        return []
+        return None
 
 
-# ---------------------------------------------------------------------------
-# Index helpers
-# ---------------------------------------------------------------------------
+# None = not tried yet; flips to False the first time the LS doesn't know it
+_paged_steps_supported: bool | None = None
 
-def load_index() -> dict:
-    if INDEX_FILE.exists():
-        with open(INDEX_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    return {"conversations": {}, "last_updated": None}
 
+def fetch_steps_since(
+    port: int, csrf_token: str, cascade_id: str, offset: int, step_count: int | None = None
+) -> tuple[list[dict], int] | None:
+    """Fetch a conversation's steps from index `offset` on.
 
-def save_index(index: dict) -> None:
-    index["last_updated"] = datetime.now(timezone.utc).isoformat()
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
+    Uses GetCascadeTrajectorySteps with a stepOffset when the language server
+    has it, so only new steps cross the wire.  Otherwise falls back to the
+    full GetCascadeTrajectory.  Returns (steps, first_index) — first_index is
+    offset for a paged fetch and 0 for a full one — or None on failure.
+
+    The paged method isn't documented, and Connect's JSON decoding drops
+    fields it doesn't know, so a wrong offset field name would quietly return
+    steps from 0.  A paged reply is therefore only trusted when
+    offset + len(steps) equals step_count (the summary's stepCount);
+    without step_count the full trajectory is fetched.
+    """
+    global _paged_steps_supported
+    if offset > 0 and step_count and _paged_steps_supported is not False:
+        try:
+            r = get_session().post(
+                f"http://127.0.0.1:{port}/{SERVICE}/GetCascadeTrajectorySteps",
+                headers={"Content-Type": "application/json", "x-codeium-csrf-token": csrf_token},
+                json={"cascadeId": cascade_id, "stepOffset": offset},
+                timeout=30,
+            )
+        except Exception as e:
+            log.warning(f"fetch_steps_since({cascade_id[:8]}): {e}")
+            return None
+        try:
+            data = r.json() if r.status_code == 200 else None
+        except ValueError:
+            data = None
+        steps = data.get("steps") if isinstance(data, dict) else None
+        if isinstance(steps, list) and offset + len(steps) == step_count:
+            _paged_steps_supported = True
+            return steps, offset
+        if steps is None or len(steps) >= step_count:
+            # Unknown method, or it ignored stepOffset and started from 0
+            if _paged_steps_supported is not False:
+                log.info("GetCascadeTrajectorySteps unavailable or ignores stepOffset — "
+                         "diffing full trajectories locally.")
+            _paged_steps_supported = False
+        # else: the conversation moved on since the summary; diff this one locally
+
+    steps = fetch_full_trajectory(port, csrf_token, cascade_id)
+    return (steps, 0) if steps is not None else None
 
 
 # ---------------------------------------------------------------------------
 # Note building
 # ---------------------------------------------------------------------------
 
+CONVERSATION_HEADING = "## Conversation\n\n"
+OUTCOMES_HEADING     = "## Key Outcomes\n"
+
+
 def slugify(text: str) -> str:
     text = text.lower()
     text = re.sub(r"[^a-z0-9\s-]", "", text)
@@ -237,88 +372,86 @@ def slugify(text: str) -> str:
     return text[:60]
 
 
-def parse_steps(steps: list[dict]) -> dict:
-    """Extract user prompts, AI responses, files changed, and commands from steps."""
-    user_messages = []
-    ai_responses  = []
-    files_changed = []
-    commands_run  = []
-
-    for step in steps:
-        t = step.get("type", "")
-
-        if t == "CORTEX_STEP_TYPE_USER_INPUT":
-            text = step.get("userInput", {}).get("userResponse", "").strip()
-            if text:
-                user_messages.append(text)
-
-        elif t == "CORTEX_STEP_TYPE_PLANNER_RESPONSE":
-            # Prefer modifiedResponse (post-edit), fall back to response
-            pr = step.get("plannerResponse", {})
-            text = (pr.get("modifiedResponse") or pr.get("response") or "").strip()
-            if text:
-                ai_responses.append(text)
-
-        elif t == "CORTEX_STEP_TYPE_CODE_ACTION":
-            spec = step.get("codeAction", {}).get("actionSpec", {})
-            path = spec.get("absoluteUri", "") or spec.get("path", "")
-            if path:
-                path = path.replace("file:///", "").replace("/", "\\")
-                if path not in files_changed:
-                    files_changed.append(path)
-
-        elif t == "CORTEX_STEP_TYPE_RUN_COMMAND":
-            rc = step.get("runCommand", {})
-            cmd = rc.get("commandLine") or rc.get("proposedCommandLine", "")
-            if cmd and cmd not in commands_run:
-                commands_run.append(cmd)
-
-    return {
-        "user_messages": user_messages,
-        "ai_responses":  ai_responses,
-        "files_changed": files_changed,
-        "commands_run":  commands_run,
-    }
-
-
-def build_thread(steps: list[dict]) -> list[tuple[str, str]]:
-    """Build an interleaved [(role, text)] list from steps for the full conversation.
-    role is 'user' or 'cascade'. Truncates each turn to 800 chars."""
-    thread = []
+def render_step(step: dict) -> str:
+    """Markdown for one step's contribution to the Conversation section
+    ("" for steps that aren't user input or a Cascade reply).
+    Truncates each turn to 800 chars."""
+    t = step.get("type", "")
+    if t == "CORTEX_STEP_TYPE_USER_INPUT":
+        text = step.get("userInput", {}).get("userResponse", "").strip()
+        if not text:
+            return ""
+        text = text.replace("\n", " ")
+        if len(text) > 800:
+            text = text[:800] + "…"
+        return f"**User:** {text}\n\n"
+    if t == "CORTEX_STEP_TYPE_PLANNER_RESPONSE":
+        # Prefer modifiedResponse (post-edit), fall back to response
+        pr = step.get("plannerResponse", {})
+        text = (pr.get("modifiedResponse") or pr.get("response") or "").strip()
+        if not text:
+            return ""
+        if len(text) > 800:
+            text = text[:800] + "…"
+        return f"**Cascade:** {text}\n\n"
+    return ""
+
+
+def render_conversation(steps: list[dict]) -> tuple[str, int, list[str], list[str]]:
+    """(Conversation section, chars of its last step, files changed,
+    commands run) for a whole trajectory."""
+    conversation_md = ""
+    tail_chars = 0
+    files_changed: list[str] = []
+    commands_run: list[str] = []
     for step in steps:
-        t = step.get("type", "")
-        if t == "CORTEX_STEP_TYPE_USER_INPUT":
-            text = step.get("userInput", {}).get("userResponse", "").strip()
-            if not text:
-                continue
-            text = text.replace("\n", " ")
-            if len(text) > 800:
-                text = text[:800] + "\u2026"
-            thread.append(("user", text))
-        elif t == "CORTEX_STEP_TYPE_PLANNER_RESPONSE":
-            pr = step.get("plannerResponse", {})
-            text = (pr.get("modifiedResponse") or pr.get("response") or "").strip()
-            if not text:
-                continue
-            if len(text) > 800:
-                text = text[:800] + "\u2026"
-            thread.append(("cascade", text))
-    return thread
-
-
-def build_note(uuid: str, item: dict, steps: list[dict]) -> str:
+        block = render_step(step)
+        conversation_md += block
+        tail_chars = len(block)
+        collect_outcomes(step, files_changed, commands_run)
+    return conversation_md, tail_chars, files_changed, commands_run
+
+
+def collect_outcomes(step: dict, files_changed: list[str], commands_run: list[str]) -> None:
+    """Add the file a step changed / the command it ran (deduplicated, in order)."""
+    t = step.get("type", "")
+    if t == "CORTEX_STEP_TYPE_CODE_ACTION":
+        spec = step.get("codeAction", {}).get("actionSpec", {})
+        path = spec.get("absoluteUri", "") or spec.get("path", "")
+        if path:
+            path = path.replace("file:///", "").replace("/", "\\")
+            if path not in files_changed:
+                files_changed.append(path)
+
+    elif t == "CORTEX_STEP_TYPE_RUN_COMMAND":
+        rc = step.get("runCommand", {})
+        cmd = rc.get("commandLine") or rc.get("proposedCommandLine", "")
+        if cmd and cmd not in commands_run:
+            commands_run.append(cmd)
+
+
+def workspace_name(item: dict) -> str:
+    """Repository name, else folder URI, of a summary's first workspace."""
+    ws_list = item.get("workspaces", [])
+    if not ws_list:
+        return ""
+    repo = ws_list[0].get("repository", {})
+    return repo.get("computedName", "") or ws_list[0].get("workspaceFolderAbsoluteUri", "")
+
+
+def build_note(
+    uuid: str,
+    item: dict,
+    conversation_md: str,
+    files_changed: list[str],
+    commands_run: list[str],
+) -> str:
     title         = item.get("summary") or item.get("title") or "Untitled Conversation"
     step_count    = item.get("stepCount", 0)
     created_at    = item.get("createdTime", "")
     model         = item.get("lastGeneratorModelUid", "")
     trajectory_id = item.get("trajectoryId", "")
-    status        = item.get("status", "")
-
-    workspace = ""
-    ws_list = item.get("workspaces", [])
-    if ws_list:
-        repo = ws_list[0].get("repository", {})
-        workspace = repo.get("computedName", "") or ws_list[0].get("workspaceFolderAbsoluteUri", "")
+    workspace     = workspace_name(item)
 
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     if created_at:
@@ -337,9 +470,6 @@ def build_note(uuid: str, item: dict, steps: list[dict]) -> str:
         except Exception:
             pass
 
-    parsed = parse_steps(steps)
-    thread  = build_thread(steps)
-
     lines = [
         f"# {title}",
         "",
@@ -355,128 +485,258 @@ def build_note(uuid: str, item: dict, steps: list[dict]) -> str:
     if last_input_str:
         lines.append(f"**Last Activity:** {last_input_str}")
     lines.append("")
+    header = "\n".join(lines) + "\n"
 
-    # --- Conversation thread ---
-    lines.append("## Conversation")
-    lines.append("")
-    if thread:
-        for role, text in thread:
-            if role == "user":
-                lines.append(f"**User:** {text}")
-            else:
-                lines.append(f"**Cascade:** {text}")
-            lines.append("")
-    else:
-        lines.append("*No conversation content captured.*")
-        lines.append("")
+    # --- Conversation thread (rendered incrementally by sync_conversation) ---
+    conversation = conversation_md or "*No conversation content captured.*\n\n"
 
     # --- Key Outcomes ---
-    lines.append("## Key Outcomes")
-    lines.append("")
+    lines = [OUTCOMES_HEADING.rstrip("\n"), ""]
     has_outcomes = False
 
-    if parsed["files_changed"]:
+    if files_changed:
         has_outcomes = True
         lines.append("**Files changed:**")
-        for f in parsed["files_changed"][:15]:
+        for f in files_changed[:15]:
             lines.append(f"- `{f}`")
-        if len(parsed["files_changed"]) > 15:
-            lines.append(f"- *\u2026and {len(parsed['files_changed']) - 15} more*")
+        if len(files_changed) > 15:
+            lines.append(f"- *…and {len(files_changed) - 15} more*")
         lines.append("")
 
-    if parsed["commands_run"]:
+    if commands_run:
         has_outcomes = True
         lines.append("**Commands run:**")
-        for cmd in parsed["commands_run"][:8]:
+        for cmd in commands_run[:8]:
             short_cmd = cmd.strip()
             if len(short_cmd) > 120:
-                short_cmd = short_cmd[:120] + "\u2026"
+                short_cmd = short_cmd[:120] + "…"
             lines.append(f"- `{short_cmd}`")
-        if len(parsed["commands_run"]) > 8:
-            lines.append(f"- *\u2026and {len(parsed['commands_run']) - 8} more*")
+        if len(commands_run) > 8:
+            lines.append(f"- *…and {len(commands_run) - 8} more*")
         lines.append("")
 
     if not has_outcomes:
         lines.append("*No file changes or commands captured.*")
         lines.append("")
 
-    now_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    # No timestamp: an unchanged conversation must render to the same bytes
+    # (see note_writer.py); the export time is kept in the index.
     lines.append("---")
-    lines.append(f"*Auto-exported by Windsurf watcher on {now_str}*")
+    lines.append("*Auto-exported by Windsurf watcher*")
+
+    return header + CONVERSATION_HEADING + conversation + "\n".join(lines)
 
-    return "\n".join(lines)
+
+def read_conversation_section(note_path: Path, expected_chars: int) -> str | None:
+    """Return the rendered Conversation section of an exported note, or None
+    if the note is missing or no longer has the layout the index recorded
+    (e.g. it was edited by hand), in which case it is rebuilt from scratch."""
+    try:
+        text = note_path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    start = text.find("\n" + CONVERSATION_HEADING)
+    if start == -1:
+        return None
+    start += 1 + len(CONVERSATION_HEADING)
+    end = start + expected_chars
+    if not text.startswith(OUTCOMES_HEADING, end):
+        return None
+    return text[start:end]
 
 
 # ---------------------------------------------------------------------------
 # Export logic
 # ---------------------------------------------------------------------------
 
-def export_conversation(uuid: str, item: dict, steps: list[dict], index: dict) -> str | None:
-    """Build and write note. Returns note path or None on failure."""
-    VAULT_CHATS_DIR.mkdir(parents=True, exist_ok=True)
+def sync_conversation(
+    uuid: str, item: dict, conv: dict, ls_port: int, csrf_token: str
+) -> dict | None:
+    """Bring one conversation's note up to date.
+
+    conv is the conversation's current index entry (empty if new); it is not
+    modified.  Returns the updated entry, or None on failure, so several
+    conversations can sync in parallel and the caller commits the index once.
+
+    The index records how many steps are already rendered into the note
+    (synced_steps), so only steps after that are fetched and parsed, and
+    their markdown is appended to the existing Conversation section.  The
+    last synced step is always re-rendered because it may still have been
+    streaming at the previous poll; tail_chars is how much of the section it
+    produced.  Key Outcomes comes from the files/commands lists kept in the
+    index, extended with the new steps.
+    """
+    synced = conv.get("synced_steps", 0)
+    conversation_md = None
+    if synced and conv.get("conversation_chars") and conv.get("export_path"):
+        conversation_md = read_conversation_section(Path(conv["export_path"]), conv["conversation_chars"])
+
+    if conversation_md is None:
+        synced, tail_chars, conversation_md = 0, 0, ""
+        files_changed, commands_run = [], []
+    else:
+        tail_chars = conv.get("tail_chars", 0)
+        files_changed = list(conv.get("files_changed", []))
+        commands_run  = list(conv.get("commands_run", []))
 
-    title = item.get("summary") or item.get("title") or "Untitled Conversation"
-    slug = slugify(title)
-    short_id = uuid[:8]
-    filename = f"{slug}_{short_id}.md"
-    note_path = VAULT_CHATS_DIR / filename
+    start = max(synced - 1, 0)
+    fetched = fetch_steps_since(ls_port, csrf_token, uuid, start, item.get("stepCount"))
+    if fetched is None:
+        return None
+    steps, first = fetched
+    new_steps = steps[start - first:]
 
-    content = build_note(uuid, item, steps)
+    if synced and not new_steps:
+        # The conversation shrank (reverted?) — start over from a full fetch
+        return sync_conversation(uuid, item, {**conv, "synced_steps": 0}, ls_port, csrf_token)
+
+    # Keep the raw steps so notes can be re-rendered without the LS
     try:
-        note_path.write_text(content, encoding="utf-8")
+        step_archive.append(uuid, start, new_steps, item)
     except Exception as e:
-        log.error(f"Failed to write {note_path}: {e}")
+        log.warning(f"Step archive write failed [{uuid[:8]}]: {e}")
+
+    if synced:
+        conversation_md = conversation_md[: len(conversation_md) - tail_chars]
+    for step in new_steps:
+        block = render_step(step)
+        conversation_md += block
+        tail_chars = len(block)
+        collect_outcomes(step, files_changed, commands_run)
+
+    exported = export_conversation(
+        uuid, item, conversation_md, files_changed, commands_run, conv.get("note_hash")
+    )
+    if not exported:
         return None
+    note_path, note_hash, _written = exported
 
-    # Update index
-    trajectory_id = item.get("trajectoryId", "")
-    workspace = ""
-    ws_list = item.get("workspaces", [])
-    if ws_list:
-        repo = ws_list[0].get("repository", {})
-        workspace = repo.get("computedName", "") or ws_list[0].get("workspaceFolderAbsoluteUri", "")
-
-    now_iso = datetime.now(timezone.utc).isoformat()
-    if uuid not in index["conversations"]:
-        index["conversations"][uuid] = {}
-    conv = index["conversations"][uuid]
-    conv.update({
+    return {
+        **conv,
         "uuid": uuid,
-        "trajectory_id": trajectory_id,
-        "title": title,
+        "trajectory_id": item.get("trajectoryId", ""),
+        "title": item.get("summary") or item.get("title") or "Untitled Conversation",
         "category": "cascade",
         "step_count": item.get("stepCount", 0),
-        "workspace": workspace,
+        "workspace": workspace_name(item),
         "created_at": item.get("createdTime"),
         "last_modified": item.get("lastModifiedTime"),
         "exported": True,
-        "export_path": str(note_path),
-        "exported_at": now_iso,
-    })
+        "export_path": note_path,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "note_hash": note_hash,
+        "synced_steps": start + len(new_steps),
+        "tail_chars": tail_chars,
+        "conversation_chars": len(conversation_md),
+        "files_changed": files_changed,
+        "commands_run": commands_run,
+        "search_text": conversation_md,  # goes to the full-text index, not the entry
+    }
 
-    return str(note_path)
 
+def export_conversation(
+    uuid: str,
+    item: dict,
+    conversation_md: str,
+    files_changed: list[str],
+    commands_run: list[str],
+    note_hash: str | None = None,
+) -> tuple[str, str, bool] | None:
+    """Build the note and write it if it changed.  note_hash is the hash
+    recorded at the last export.  Returns (note path, new hash, whether the
+    file was written) or None on failure."""
+    VAULT_CHATS_DIR.mkdir(parents=True, exist_ok=True)
 
-# ---------------------------------------------------------------------------
-# Poll cycle
-# ---------------------------------------------------------------------------
+    title = item.get("summary") or item.get("title") or "Untitled Conversation"
+    slug = slugify(title)
+    short_id = uuid[:8]
+    filename = f"{slug}_{short_id}.md"
+    note_path = VAULT_CHATS_DIR / filename
 
-def poll_once(ls_port: int, csrf_token: str) -> int:
-    """Fetch trajectories, export any new/updated ones. Returns count exported."""
+    content = build_note(uuid, item, conversation_md, files_changed, commands_run)
     try:
-        data = fetch_trajectories(ls_port, csrf_token)
+        written, note_hash = write_if_changed(note_path, content, note_hash)
     except Exception as e:
-        log.warning(f"fetch_trajectories failed: {e}")
-        return 0
+        log.error(f"Failed to write {note_path}: {e}")
+        return None
+    if not written:
+        log.debug(f"Unchanged, not rewritten: {note_path.name}  [{short_id}]")
 
-    summaries: dict = data.get("trajectorySummaries", {})
-    index = load_index()
-    exported = 0
+    return str(note_path), note_hash, written
+
+
+# ---------------------------------------------------------------------------
+# Poll cycle
+# ---------------------------------------------------------------------------
 
+def merge_summaries(
+    per_instance: list[tuple[ls_discovery.LSInfo, dict]]
+) -> tuple[dict, dict[str, tuple[int, str]]]:
+    """Combine several instances' trajectorySummaries.  A conversation listed
+    by more than one instance (they share Cascade storage) is taken from the
+    one with the newest lastModifiedTime, then the most steps.  Returns
+    ({uuid: item}, {uuid: (port, csrf_token) of the instance it came from})."""
+    summaries: dict = {}
+    owners: dict[str, tuple[int, str]] = {}
+    for info, items in sorted(per_instance, key=lambda pair: pair[0].pid):
+        for uuid, item in items.items():
+            current = summaries.get(uuid)
+            if current is None or (item.get("lastModifiedTime", ""), item.get("stepCount", 0)) > \
+                    (current.get("lastModifiedTime", ""), current.get("stepCount", 0)):
+                summaries[uuid] = item
+                owners[uuid] = (info.port, info.csrf_token)
+    return summaries, owners
+
+
+def poll_instances(instances: list[ls_discovery.LSInfo], workers: int = FETCH_WORKERS) -> tuple[int, list]:
+    """One poll across several language servers.  Their summaries are
+    fetched concurrently and merged (merge_summaries); each changed
+    conversation is then synced from the instance it was taken from.  An
+    instance that fails doesn't stop the others.  Returns (notes written,
+    instances whose summaries couldn't be fetched)."""
+    fetched: list[tuple[ls_discovery.LSInfo, dict]] = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, len(instances))) as pool:
+        futures = {pool.submit(fetch_trajectories, i.port, i.csrf_token): i for i in instances}
+        for future in as_completed(futures):
+            info = futures[future]
+            try:
+                fetched.append((info, future.result().get("trajectorySummaries", {})))
+            except Exception as e:
+                log.error(f"Poll error (LS pid {info.pid}, port {info.port}): {e}")
+                failed.append(info)
+    metrics.inc("ls_poll_failures_total", len(failed))
+    if not fetched:
+        return 0, failed
+    summaries, owners = merge_summaries(fetched)
+    return export_changed(summaries, owners, workers), failed
+
+
+def poll_once(ls_port: int, csrf_token: str, workers: int = FETCH_WORKERS) -> int:
+    """Poll a single language server; export any new/updated conversations.
+    Returns count of notes written.  Errors fetching the summaries propagate
+    so the caller can rediscover the language server."""
+    summaries = fetch_trajectories(ls_port, csrf_token).get("trajectorySummaries", {})
+    return export_changed(summaries, dict.fromkeys(summaries, (ls_port, csrf_token)), workers)
+
+
+def export_changed(summaries: dict, owners: dict[str, tuple[int, str]], workers: int = FETCH_WORKERS) -> int:
+    """Export conversations in summaries that are new or modified since their
+    last export, each fetched from owners[uuid] = (port, csrf_token).
+    Returns count of notes written (conversations whose note came out
+    unchanged don't count).
+
+    Changed conversations are fetched and rendered on up to `workers`
+    threads sharing one keep-alive session; their index entries are upserted
+    in one transaction once every conversation in the cycle has finished.
+    """
+    with conv_index.open_index() as index:
+        known = index.get_many(summaries)
+
+    due = []
     for uuid, item in summaries.items():
         last_modified = item.get("lastModifiedTime", "")
-        existing = index.get("conversations", {}).get(uuid, {})
-        prev_modified = existing.get("last_modified", "")
+        existing = known.get(uuid, {})
         prev_exported = existing.get("exported", False)
 
         # Export if: never exported OR conversation was modified after the last export
@@ -486,67 +746,379 @@ def poll_once(ls_port: int, csrf_token: str) -> int:
             needs_export = last_modified > exported_at
         else:
             needs_export = not prev_exported
-        if not needs_export:
-            continue
+        if needs_export:
+            due.append((uuid, item, existing))
+
+    metrics.set("conversations_scanned", len(summaries))
+    metrics.set("conversations_due", len(due))
+    if not due:
+        metrics.set("notes_written", 0)
+        return 0
+
+    updates: dict[str, dict] = {}
+    written = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(due)))) as pool:
+        # Fetch only the steps added since the last export and append them
+        futures = {
+            pool.submit(sync_conversation, uuid, item, existing, *owners[uuid]): uuid
+            for uuid, item, existing in due
+        }
+        for future in as_completed(futures):
+            uuid = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                log.error(f"Sync failed [{uuid[:8]}]: {e}")
+                entry = None
+            if not entry:
+                metrics.inc("sync_failures_total")
+            else:
+                updates[uuid] = entry
+                previous = known.get(uuid, {})
+                if (entry["note_hash"], entry["export_path"]) != \
+                        (previous.get("note_hash"), previous.get("export_path")):
+                    written += 1
+                    log.info(f"Exported: {Path(entry['export_path']).name}  [{uuid[:8]}]")
+
+    if updates:
+        with conv_index.open_index() as index:
+            index.upsert_many(updates)
+
+    metrics.set("notes_written", written)
+    metrics.inc("notes_written_total", written)
+    if written:
+        metrics.set("last_export_timestamp_seconds", time.time())
+    return written
 
-        # Fetch full conversation steps
-        steps = fetch_full_trajectory(ls_port, csrf_token, uuid)
 
-        note_path = export_conversation(uuid, item, steps, index)
-        if note_path:
-            log.info(f"Exported: {Path(note_path).name}  [{uuid[:8]}]")
-            exported += 1
+# ---------------------------------------------------------------------------
+# Re-render from the step archive
+# ---------------------------------------------------------------------------
+
+def rerender_conversation(uuid: str, conv: dict) -> tuple[str, dict | None, bool, str]:
+    """Rebuild one note from its archived steps.  Runs in a worker process.
+    Returns (uuid, updated index entry or None, note written, error message)."""
+    try:
+        archived = step_archive.load(uuid)
+    except Exception as e:
+        return uuid, None, False, f"{type(e).__name__}: {e}"
+    if not archived or not archived[1]:
+        return uuid, None, False, "empty archive"
+    item, steps = archived
+
+    conversation_md, tail_chars, files_changed, commands_run = render_conversation(steps)
+    exported = export_conversation(
+        uuid, item, conversation_md, files_changed, commands_run, conv.get("note_hash")
+    )
+    if not exported:
+        return uuid, None, False, "note write failed"
+    note_path, note_hash, written = exported
+    return uuid, {
+        **conv,
+        "uuid": uuid,
+        "title": item.get("summary") or item.get("title") or conv.get("title") or "Untitled Conversation",
+        "exported": True,
+        "export_path": note_path,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "note_hash": note_hash,
+        "synced_steps": len(steps),
+        "tail_chars": tail_chars,
+        "conversation_chars": len(conversation_md),
+        "files_changed": files_changed,
+        "commands_run": commands_run,
+        "search_text": conversation_md,
+    }, written, ""
 
-    if exported:
-        save_index(index)
 
-    return exported
+def rerender_all(workers: int) -> int:
+    """Rebuild every archived conversation's note in parallel, without the
+    language server.  Returns count of notes written."""
+    ids = step_archive.archived_ids()
+    if not ids:
+        log.warning(f"No archived conversations in {step_archive.ARCHIVE_DIR}")
+        return 0
+    with conv_index.open_index() as index:
+        known = index.get_many(ids)
+
+    log.info(f"Re-rendering {len(ids)} archived conversation(s) on {min(workers, len(ids))} process(es)")
+    updates: dict[str, dict] = {}
+    written = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(ids)))) as pool:
+        futures = [pool.submit(rerender_conversation, uuid, known.get(uuid, {})) for uuid in ids]
+        for future in as_completed(futures):
+            uuid, entry, note_written, error = future.result()
+            if not entry:
+                log.error(f"Re-render failed [{uuid[:8]}]: {error}")
+                continue
+            updates[uuid] = entry
+            written += note_written
+
+    with conv_index.open_index() as index:
+        index.upsert_many(updates)
+    log.info(f"Re-render complete: {written} note(s) written, {len(updates) - written} unchanged.")
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+class PollScheduler:
+    """Delay before the next poll: min_interval right after a poll that found
+    changes, doubling with every quiet poll up to max_interval."""
+
+    def __init__(self, interval: float, min_interval: float, max_interval: float):
+        self.base = interval
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.delay = min(max(interval, min_interval), self.max_interval)
+
+    def record(self, changed: int) -> float:
+        if changed:
+            self.delay = self.min_interval
+        else:
+            self.delay = min(self.delay * 2, self.max_interval)
+        return self.delay
+
+    def reset(self) -> float:
+        """After an error: back to the configured interval."""
+        self.delay = min(max(self.base, self.min_interval), self.max_interval)
+        return self.delay
+
+
+class _StorageEvents(FileSystemEventHandler):
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def on_any_event(self, fs_event) -> None:
+        if not fs_event.is_directory:
+            self.event.set()
+
+
+class StorageWatcher:
+    """Wakes the poll loop early when the language server writes to its
+    Cascade storage directory.  Without watchdog the directory is scanned
+    for a newer mtime every STORAGE_SCAN_INTERVAL seconds — local stat calls
+    only, no LS requests.  If the directory doesn't exist, wait() is a plain
+    sleep."""
+
+    def __init__(self, path: Path = CASCADE_DIR):
+        self.path = path
+        self.changed = threading.Event()
+        self.observer = None
+        self.mode = "none"
+        self._signature = None
+
+    def start(self) -> str:
+        if not self.path.is_dir():
+            return self.mode
+        if Observer is not None:
+            try:
+                self.observer = Observer()
+                self.observer.schedule(_StorageEvents(self.changed), str(self.path), recursive=True)
+                self.observer.daemon = True
+                self.observer.start()
+                self.mode = "watchdog"
+                return self.mode
+            except Exception as e:
+                log.warning(f"watchdog unavailable for {self.path}: {e}")
+                self.observer = None
+        self._signature = self._scan()
+        self.mode = "scan"
+        return self.mode
+
+    def stop(self) -> None:
+        if self.observer:
+            self.observer.stop()
+            self.observer.join(timeout=5)
+
+    def _scan(self) -> tuple[int, int]:
+        """(file count, newest mtime in ns) of the storage directory."""
+        count = newest = 0
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            count += 1
+                            newest = max(newest, entry.stat().st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return count, newest
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds.  Returns True if woken by a change."""
+        deadline = time.monotonic() + timeout
+        woke = False
+        if self.mode == "scan":
+            while (remaining := deadline - time.monotonic()) > 0:
+                time.sleep(min(STORAGE_SCAN_INTERVAL, remaining))
+                signature = self._scan()
+                if signature != self._signature:
+                    self._signature = signature
+                    woke = True
+                    break
+        else:
+            woke = self.changed.wait(timeout)
+        if woke:
+            # Writes come in bursts while a response streams; let them settle
+            time.sleep(STORAGE_SETTLE)
+            self.changed.clear()
+            if self.mode == "scan":
+                self._signature = self._scan()
+        return woke
 
 
 # ---------------------------------------------------------------------------
 # Main loop
 # ---------------------------------------------------------------------------
 
+def write_metrics(path: Path | None) -> None:
+    """Refresh the index gauges and write the metrics file (if any)."""
+    try:
+        with conv_index.open_index() as index:
+            total, pending = index.counts()
+            metrics.set("index_conversations", total)
+            metrics.set("index_pending", pending)
+            metrics.set("search_conversations", index.search_count())
+            db = index.path
+        metrics.set("index_size_bytes", sum(
+            p.stat().st_size for p in (db, db.with_name(db.name + "-wal")) if p.exists()
+        ))
+        if path:
+            metrics.write(path)
+    except Exception as e:
+        log.warning(f"Could not update metrics: {e}")
+
+
 def main() -> None:
+    global TRANSPORT
     parser = argparse.ArgumentParser(description="Windsurf → Obsidian watcher")
     parser.add_argument("--once", action="store_true", help="Single pass, then exit")
-    parser.add_argument("--interval", type=int, default=POLL_INTERVAL, help="Poll interval in seconds")
+    parser.add_argument("--interval", type=int, default=POLL_INTERVAL,
+                        help="Initial poll interval (and the one used after an error), seconds")
+    parser.add_argument("--min-interval", type=int, default=MIN_INTERVAL,
+                        help="Poll interval while conversations are changing, seconds")
+    parser.add_argument("--max-interval", type=int, default=MAX_INTERVAL,
+                        help="Longest interval after repeated quiet polls, seconds")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                        help="Conversations fetched in parallel per poll (processes for --rerender)")
+    parser.add_argument("--rerender", action="store_true",
+                        help="Rebuild all notes from the local step archive, then exit")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=TRANSPORT,
+                        help="LS call encoding; proto falls back to JSON if unsupported (default: %(default)s)")
+    parser.add_argument("--metrics-file", default=str(METRICS_FILE),
+                        help="Prometheus text file rewritten after every poll ('' to disable; default: %(default)s)")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="Also serve metrics at http://127.0.0.1:PORT/metrics")
     args = parser.parse_args()
+    TRANSPORT = args.transport
+
+    if args.rerender:
+        rerender_all(max(1, args.workers))
+        return
 
     log.info("=== Windsurf Obsidian watcher started ===")
     log.info(f"Vault: {VAULT_CHATS_DIR}")
-    log.info(f"Interval: {args.interval}s  |  Mode: {'once' if args.once else 'loop'}")
-
-    ls_info = None
-    ls_cache_ts = 0.0
+    log.info(
+        f"Interval: {args.interval}s (adaptive {args.min_interval}-{args.max_interval}s)  |  "
+        f"Mode: {'once' if args.once else 'loop'}  |  Transport: {TRANSPORT}"
+    )
+    get_session(max(1, args.workers))
+
+    metrics_file = Path(args.metrics_file) if args.metrics_file else None
+    # Counters start at 0 so rate() and absent() alerts work from the first scrape
+    for name in ("notes_written_total", "sync_failures_total", "ls_discovery_failures_total",
+                 "ls_poll_failures_total"):
+        metrics.inc(name, 0)
+    for result in ("ok", "error", "no_ls"):
+        metrics.inc("polls_total", 0, result=result)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+        log.info(f"Metrics: http://127.0.0.1:{args.metrics_port}/metrics")
+
+    scheduler = PollScheduler(args.interval, args.min_interval, args.max_interval)
+    storage = StorageWatcher()
+    if not args.once:
+        mode = storage.start()
+        if mode == "none":
+            log.info(f"No Cascade storage at {storage.path}; polling on the timer only")
+        else:
+            log.info(f"Watching {storage.path} for changes ({mode})")
 
-    def get_ls(force: bool = False):
-        nonlocal ls_info, ls_cache_ts
-        if force or not ls_info or (time.time() - ls_cache_ts > 300):
-            ls_info = get_ls_info()
-            ls_cache_ts = time.time()
-        return ls_info
+    # Instances are discovered at startup, again after any of them fails a
+    # poll, and every REDISCOVER_INTERVAL to pick up new Windsurf windows.
+    # Each instance's saved (pid, port, token) is tried first; after a
+    # failure the saved entries are known bad, so every port is probed.
+    instances: list[ls_discovery.LSInfo] = []
+    discovered_at: float | None = None
+    use_cache = True
 
     while True:
-        info = get_ls()
-        if not info:
+        if not instances or discovered_at is None or time.monotonic() - discovered_at >= REDISCOVER_INTERVAL:
+            started = time.perf_counter()
+            found = get_ls_instances(use_cache=use_cache)
+            elapsed = time.perf_counter() - started
+            metrics.set("last_ls_discovery_duration_seconds", elapsed)
+            metrics.observe("ls_discovery_duration_seconds", elapsed)
+            if not found:
+                metrics.inc("ls_discovery_failures_total")
+            if found and [(i.pid, i.port) for i in found] != [(i.pid, i.port) for i in instances]:
+                log.info("Language server(s): " + ", ".join(f"pid {i.pid} port {i.port}" for i in found))
+            instances, discovered_at, use_cache = found, time.monotonic(), True
+        metrics.set("ls_instances", len(instances))
+
+        started = time.perf_counter()
+        if not instances:
             log.warning("Windsurf language server not found — is Windsurf running?")
+            metrics.inc("polls_total", result="no_ls")
+            delay = scheduler.reset()
         else:
-            port, csrf = info
             try:
-                count = poll_once(port, csrf)
+                count, failed = poll_instances(instances, args.workers)
+            except Exception as e:
+                # e.g. the index stayed locked past its busy timeout
+                log.error(f"Poll error: {e}")
+                count, failed = 0, []
+                all_failed = True
+            else:
+                all_failed = len(failed) == len(instances)
+            if failed:
+                # Drop them and rediscover next cycle; the others were polled
+                instances = [i for i in instances if i not in failed]
+                discovered_at = None
+                use_cache = False
+            if all_failed:
+                metrics.inc("polls_total", result="error")
+                delay = scheduler.reset()
+            else:
+                metrics.inc("polls_total", result="ok")
+                metrics.set("last_success_timestamp_seconds", time.time())
                 if count:
                     log.info(f"Poll complete: {count} note(s) written.")
                 else:
                     log.debug("Poll complete: nothing new.")
-            except Exception as e:
-                log.error(f"Poll error: {e}")
-                ls_info = None  # force rediscovery next time
+                delay = scheduler.record(count)
+
+        elapsed = time.perf_counter() - started
+        metrics.set("last_poll_duration_seconds", elapsed)
+        metrics.observe("poll_duration_seconds", elapsed)
+        metrics.set("last_poll_timestamp_seconds", time.time())
+        metrics.set("next_poll_seconds", 0 if args.once else delay)
+        write_metrics(metrics_file)
 
         if args.once:
             break
 
-        time.sleep(args.interval)
+        log.debug(f"Next poll in {delay:.0f}s")
+        try:
+            if storage.wait(delay):
+                log.debug("Cascade storage changed — polling early")
+        except KeyboardInterrupt:
+            storage.stop()
+            raise
 
 
 if __name__ == "__main__":
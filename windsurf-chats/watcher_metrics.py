@@ -0,0 +1,136 @@
+"""
+watcher_metrics.py
+
+Health and performance counters for watcher.py in the Prometheus text
+exposition format, so a stalled export or a slow poll can be alerted on.
+
+The watcher writes them to watcher_metrics.prom after every poll cycle
+(point node_exporter's textfile collector at it, or just read it), and
+with --metrics-port serves the same text at http://127.0.0.1:<port>/metrics.
+
+Useful alerts:
+  time() - windsurf_watcher_last_success_timestamp_seconds > 900   no LS answered
+  time() - windsurf_watcher_last_poll_timestamp_seconds > 1800     watcher not running
+  windsurf_watcher_last_poll_duration_seconds > 30                 slow polls
+  rate(windsurf_watcher_sync_failures_total[1h]) > 0               conversations not exporting
+
+Usage from other scripts:
+  from watcher_metrics import Metrics
+  metrics = Metrics()
+  metrics.inc("polls_total", result="ok")
+  metrics.observe("poll_duration_seconds", 0.42)
+  metrics.write(path)            # or metrics.serve(port)
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from note_writer import write_atomic
+
+PREFIX = "windsurf_watcher_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name (without PREFIX): (type, help)
+METRICS = {
+    "start_time_seconds":                 ("gauge",   "Unix time the watcher started."),
+    "last_poll_timestamp_seconds":        ("gauge",   "Unix time the last poll cycle finished."),
+    "last_success_timestamp_seconds":     ("gauge",   "Unix time of the last poll in which a language server answered."),
+    "last_export_timestamp_seconds":      ("gauge",   "Unix time a note was last written."),
+    "last_poll_duration_seconds":         ("gauge",   "Wall time of the last poll cycle."),
+    "poll_duration_seconds":              ("summary", "Wall time of poll cycles."),
+    "polls_total":                        ("counter", "Poll cycles by result (ok, error, no_ls)."),
+    "conversations_scanned":              ("gauge",   "Conversations listed by the language server(s) in the last poll."),
+    "conversations_due":                  ("gauge",   "Conversations new or modified since export in the last poll."),
+    "notes_written":                      ("gauge",   "Notes written in the last poll."),
+    "notes_written_total":                ("counter", "Notes written since start."),
+    "sync_failures_total":                ("counter", "Conversations whose fetch or export failed."),
+    "ls_instances":                       ("gauge",   "Language server instances being polled."),
+    "last_ls_discovery_duration_seconds": ("gauge",   "Wall time of the last language server discovery."),
+    "ls_discovery_duration_seconds":      ("summary", "Wall time of language server discoveries."),
+    "ls_discovery_failures_total":        ("counter", "Discoveries that found no language server."),
+    "ls_poll_failures_total":             ("counter", "Language server instances that failed a poll."),
+    "index_conversations":                ("gauge",   "Conversations in index.db."),
+    "index_pending":                      ("gauge",   "Conversations in index.db not yet exported."),
+    "index_size_bytes":                   ("gauge",   "Size of index.db including its WAL."),
+    "search_conversations":               ("gauge",   "Conversations in the full-text search index."),
+    "next_poll_seconds":                  ("gauge",   "Delay before the next scheduled poll."),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+class Metrics:
+    """Thread-safe gauges, counters and summaries keyed by METRICS names."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, str], float] = {}
+        self.set("start_time_seconds", time.time())
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._values[(name, _labels(labels))] = value
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        """Add one observation to a summary (its _sum and _count)."""
+        with self._lock:
+            self._values[(name + "_sum", "")] = self._values.get((name + "_sum", ""), 0) + value
+            self._values[(name + "_count", "")] = self._values.get((name + "_count", ""), 0) + 1
+
+    def render(self) -> str:
+        with self._lock:
+            values = dict(self._values)
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            series = [k for k in values if k[0] in (name, name + "_sum", name + "_count")]
+            if not series:
+                continue
+            lines.append(f"# HELP {PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            for key in sorted(series):
+                lines.append(f"{PREFIX}{key[0]}{key[1]} {values[key]:.17g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Replace path with the current metrics (atomically, so a scraper
+        never reads half a file)."""
+        write_atomic(Path(path), self.render())
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve GET /metrics on a background thread; returns the server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server